@@ -1,4 +1,6 @@
 ### app.py
+# 開発用（Flask の開発サーバー・1プロセス）。本番は wsgi.py + gunicorn.conf.py:
+#   gunicorn -c gunicorn.conf.py wsgi:app
 from apps import create_app
 
 app = create_app()
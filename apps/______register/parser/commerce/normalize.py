@@ -1,6 +1,8 @@
 # apps/commerce/services/commerce/normalize.py
 import re
 
+from apps.shared.limits import MAX_LINE_LENGTH
+
 _Z2H = str.maketrans(
     "０１２３４５６７８９：，．－―ー／　",
     "0123456789:,.---/ "
@@ -14,6 +16,7 @@ def normalize_line(s: str) -> str:
     if not s:
         return ""
 
+    s = s[:MAX_LINE_LENGTH]       # 極端に長い行は切る
     s = s.translate(_Z2H)         # 全角→半角
     s = _BOX.sub("|", s)          # 罫線→ '|'
     s = _WS.sub(" ", s).strip()   # 余分な空白を詰める
@@ -5,12 +5,13 @@ import json
 import re
 from typing import Any, Dict, List, Optional
 
+from apps.shared.limits import MAX_LINE_LENGTH
 from apps.shared.wareki import z2h, normalize_number, wareki_to_iso
 from .patterns import (
     RE_CORPORATE_NUMBER, RE_COMPANY_NAME, RE_HEAD_OFFICE,
     RE_PURPOSE_HEAD, RE_PURPOSE_LINE, RE_PUBLIC_NOTICE,
     RE_CAPITAL, RE_AUTHORIZED_SHARES, RE_TRANSFER_RESTRICTION,
-    RE_OFFICER_LINE, RE_RECEIPT, RE_RECEIPT_DATE, RE_RECEIPT_NUMBER
+    RE_OFFICER_LINE, RE_RECEIPT, RE_RECEIPT_DATE, RE_RECEIPT_NUMBER,
 )
 
 # --- 任意: Enum があれば使う。無くても動くようにフォールバック ---
@@ -62,6 +63,7 @@ def _preclean(s: str) -> str:
     """
     if not s:
         return ""
+    s = s[:MAX_LINE_LENGTH]
     s = s.translate(_BOX_CHARS)
     # 連続全角スペースを半角1つに潰す
     s = s.replace(_FULLWIDTH_SPACE, " ")
@@ -1,30 +1,37 @@
 # apps/__init__.py
 import os
-from pathlib import Path
-import configparser
 from flask import Flask
 import settings
 from db import db
 from apps.template_filters import register_template_filters
-from apps.entrusted_book.views import entrusted_book_bp
-from apps.client.views import client_bp
-from apps.documents.amount.views import amount_bp
-from apps.documents.required.views import required_bp
-from apps.documents.delivery.views import delivery_bp
-from apps.documents.origin.views import origin_bp
-from apps.register import register_bp
-from apps.property_description.views import property_bp
+from apps.common.schema_check import register_schema_check
+from apps.common.query_stats import init_query_stats
+from apps.common.metrics import init_metrics
+from apps.common.warmup import register_warmup, warm_up
+from apps.common.config_service import register_config_check
+from apps.common.fragment_cache import register_fragment_cache_cli
+from apps.common.office_config import office_config, tax_rates
 from flask_wtf import CSRFProtect
 from flask_wtf.csrf import CSRFError, generate_csrf
 from flask import redirect, url_for, flash
-
-
-def _load_ini_dict(path: Path) -> dict:
-    """ini を {SECTION: {key: value}} の dict にして返す（存在しなければ空 dict）"""
-    cfg = configparser.ConfigParser()
-    if path.exists():
-        cfg.read(path, encoding="utf-8")
-    return {sec: dict(cfg[sec]) for sec in cfg.sections()}
+from werkzeug.utils import import_string
+
+# Blueprint は "モジュール:属性" で持ち、create_app の中で import する
+# （apps を import しただけでは各画面のモジュール・解析器を読まない。起動時間の内訳は scripts/import_profile.py）
+BLUEPRINTS = (
+    "apps.entrusted_book.views:entrusted_book_bp",
+    "apps.client.views:client_bp",
+    "apps.documents.amount.views:amount_bp",
+    "apps.documents.required.views:required_bp",
+    "apps.documents.delivery.views:delivery_bp",
+    "apps.documents.origin.views:origin_bp",
+    "apps.register:register_bp",
+    # register_bp:
+    # register_bp の中で register_commerce_bp を登録
+    # register_commerce_bp の中で register_commerce_pdf_bp を登録
+    "apps.search.views:search_bp",
+    "apps.reports.views:reports_bp",
+)
 
 
 def create_app():
@@ -34,6 +41,11 @@ def create_app():
     app.config["SECRET_KEY"] = settings.SECRET_KEY
     app.config["SQLALCHEMY_DATABASE_URI"] = settings.SQLALCHEMY_DATABASE_URI
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = settings.SQLALCHEMY_TRACK_MODIFICATIONS
+    app.config["WARMUP"] = settings.WARMUP
+    # 接続プール・タイムアウト（環境変数 DB_POOL_SIZE など）と読み取り専用レプリカ（DB_REPLICA_HOST）
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = settings.SQLALCHEMY_ENGINE_OPTIONS
+    app.config["SQLALCHEMY_BINDS"] = settings.SQLALCHEMY_BINDS
+    app.config["DB_REPLICA_STICKY_SECONDS"] = settings.DB_REPLICA_STICKY_SECONDS
 
     # --- アップロードフォルダ設定 ---
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -60,26 +72,26 @@ def create_app():
         flash("不正なリクエスト（CSRF）です。もう一度操作してください。", "danger")
         return redirect(url_for("entrusted_book.index")), 303
 
+    # --- メトリクス（/metrics。prometheus_client があるときだけ。プール設定を触るので db より先） ---
+    init_metrics(app)
+
     # --- 拡張の初期化 ---
     db.init_app(app)
 
+    # --- SQL 計測（リクエストごとのクエリ数・DB 時間、N+1 の警告） ---
+    init_query_stats(app)
+
     # --- Jinja フィルター登録（和暦など） ---
     register_template_filters(app)
 
-    # --- グローバル設定の読み込み ---
-    # project_root/config/ の ini を読み込む
-    project_root = Path(__file__).resolve().parent.parent
-    office_ini = _load_ini_dict(project_root / "config" / "office.ini")
-    tax_ini = _load_ini_dict(project_root / "config" / "tax.ini")
-
-    # Python側からも使えるよう app.config に格納
-    app.config["OFFICE"] = office_ini.get("OFFICE", {})
-    app.config["BANK"] = office_ini.get("BANK", {})  # OFFICE と同じ ini に入れている想定（なければ空）
-    # TAX_RATE セクションを float/int にキャストして dict 化
-    app.config["TAX_RATE"] = {
-        k: (float(v) if "." in v else int(v))
-        for k, v in tax_ini.get("TAX_RATE", {}).items()
-    }
+    # --- CLI: flask schema-check（モデルと実 DB の差分。migrations/README.md） ---
+    register_schema_check(app)
+
+    # --- CLI: flask config-check（config.ini / config/*.ini の読み込み状態） ---
+    register_config_check(app)
+
+    # --- CLI: flask fragment-cache clear（詳細画面の HTML キャッシュ） ---
+    register_fragment_cache_cli(app)
 
     @app.context_processor
     def inject_globals():
@@ -91,24 +103,23 @@ def create_app():
 
         注意:
         - ここで返した値はテンプレート専用。Python コードからは参照しないこと。
-        - Python 側で参照したい場合は current_app.config["TAX_RATE"] 等を利用すること。
+        - Python 側で参照したい場合は apps.common.office_config の office_config() / tax_rates() を利用すること。
+          （ini を書き換えると再起動なしで反映される）
         """
+        office = office_config()
         return {
-            "office": app.config["OFFICE"],
-            "bank": app.config["BANK"],
-            "tax": app.config["TAX_RATE"],
+            "office": office.office,
+            "bank": office.bank,
+            "tax": tax_rates(),
             "app_name": "司法書士ネットシステム",
         }
 
     # --- Blueprint 登録 ---
-    app.register_blueprint(entrusted_book_bp)
-    app.register_blueprint(client_bp)
-    app.register_blueprint(amount_bp)
-    app.register_blueprint(required_bp)
-    app.register_blueprint(delivery_bp)
-    app.register_blueprint(origin_bp)
-    app.register_blueprint(register_bp)
-        # register_bp:
-        # register_bp の中で register_commerce_bp を登録
-        # register_commerce_bp の中で register_commerce_pdf_bp を登録
+    for path in BLUEPRINTS:
+        app.register_blueprint(import_string(path))
+
+    # --- ウォームアップ（任意。WARMUP=1 で起動時に実行、flask warmup で手動実行） ---
+    register_warmup(app)
+    if app.config["WARMUP"]:
+        warm_up(app)
     return app
@@ -2,10 +2,14 @@
 from __future__ import annotations
 from datetime import datetime, timezone
 from sqlalchemy import (
-    CheckConstraint, Index, UniqueConstraint, ForeignKey, func
+    CheckConstraint, Computed, Index, UniqueConstraint, ForeignKey, func, text
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import validates
+from apps.common.fulltext import text_expr, tsv_expr, search_indexes
 from db import db
 from apps.client.constants import ClientType, EntityType
+from apps.shared.kana import kana_key
 
 
 def _utcnow() -> datetime:
@@ -59,6 +63,11 @@ class ClientBookProfile(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("client_id", "entrusted_book_id", name="uq_client_book_profile"),
+        # 受託簿側からの参照・削除の連鎖（client_id 側は一意制約の先頭列で足りる）
+        Index("ix_client_book_profile_entrusted_book_id", "entrusted_book_id"),
+        # 住所変更が必要な案件だけ（部分インデックス）
+        Index("ix_client_book_profile_address_change", "entrusted_book_id",
+              postgresql_where=text("needs_address_change")),
     )
 
     client = db.relationship("Client", backref="book_profiles")
@@ -84,6 +93,8 @@ class Client(db.Model):
     # 基本
     name = db.Column(db.String(255), nullable=False)
     name_kana = db.Column(db.String(255))
+    # フリガナの照合キー（apps/shared/kana.py。name_kana の代入時に自動で更新）
+    name_kana_key = db.Column(db.String(255))
     equity_numerator   = db.Column(db.Integer)  # >=0 or NULL
     equity_denominator = db.Column(db.Integer)  # >0  or NULL
 
@@ -105,6 +116,10 @@ class Client(db.Model):
     updated_at = db.Column(db.DateTime, nullable=False,
                            default=_utcnow, onupdate=_utcnow, server_default=func.now())
 
+    # 検索用の生成列（apps/common/fulltext.py・検索は apps/search）
+    search_text = db.Column(db.Text, Computed(text_expr("name", "name_kana", "address"), persisted=True))
+    search_tsv  = db.Column(TSVECTOR, Computed(tsv_expr("name", "name_kana", "address"), persisted=True))
+
     # 受託簿
     entrusted_book_id = db.Column(
         db.Integer, db.ForeignKey("entrusted_book.id"),
@@ -177,6 +192,11 @@ class Client(db.Model):
             return num  # 桁数違いはそのまま返す
         return f"{digits[0:4]}-{digits[4:6]}-{digits[6:12]}" if hyphen else digits
 
+    @validates("name_kana")
+    def _sync_name_kana_key(self, key: str, value: str | None) -> str | None:
+        self.name_kana_key = kana_key(value)
+        return value
+
     # ユーティリティ
     def ensure_corporate_profile(self) -> CorporateProfile:
         """法人で profile が無ければ空で作る（ビュー/フォームの簡素化用）"""
@@ -204,6 +224,17 @@ class Client(db.Model):
             name="ck_client_equity_numerator_nonneg",
         ),
         Index("ix_client_book_updated", "entrusted_book_id", "updated_at"),
+        # 一覧のキーセットページング用（並び替え列 + id）
+        Index("ix_client_updated_id", "updated_at", "id"),
+        Index("ix_client_created_id", "created_at", "id"),
+        Index("ix_client_name_id", "name", "id"),
+        # 意思確認が済んでいないクライアント（部分インデックス）
+        Index("ix_client_intention_unconfirmed", "entrusted_book_id",
+              postgresql_where=text("intention_confirmed_at IS NULL")),
+        # フリガナの前方一致・完全一致（LIKE 'キー%' を使えるよう text_pattern_ops）
+        Index("ix_client_name_kana_key", "name_kana_key",
+              postgresql_ops={"name_kana_key": "text_pattern_ops"}),
+        *search_indexes("client"),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,77 @@
+# apps/client/services.py
+"""
+フリガナ照合キー（Client.name_kana_key）を使った検索と重複チェック。
+キーは apps/shared/kana.py の kana_key。ix_client_name_kana_key（text_pattern_ops）で
+前方一致・完全一致ともインデックスで引ける。
+"""
+from __future__ import annotations
+from typing import List, Optional
+
+from sqlalchemy import select
+
+from apps.client.models import Client
+from apps.shared.kana import kana_key
+from db import db
+
+PREFIX_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def _escape_like(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_by_kana_prefix(q: Optional[str], *, limit: int = PREFIX_LIMIT,
+                          entrusted_book_id: Optional[int] = None) -> List[Client]:
+    """フリガナの前方一致（ひらがな・半角ｶﾅ・長音/空白の有無を問わない）。キー順。"""
+    key = kana_key(q)
+    if not key:
+        return []
+    stmt = (
+        select(Client)
+        .where(Client.name_kana_key.like(f"{_escape_like(key)}%", escape="\\"))
+        .order_by(Client.name_kana_key, Client.id)
+        .limit(max(1, min(limit, MAX_LIMIT)))
+    )
+    if entrusted_book_id is not None:
+        stmt = stmt.where(Client.entrusted_book_id == entrusted_book_id)
+    return list(db.session.scalars(stmt))
+
+
+def find_duplicates(name_kana: Optional[str], *, entrusted_book_id: Optional[int] = None,
+                    exclude_id: Optional[int] = None) -> List[Client]:
+    """照合キーが完全一致するクライアント（同一人物の二重登録の候補）。"""
+    key = kana_key(name_kana)
+    if not key:
+        return []
+    stmt = select(Client).where(Client.name_kana_key == key).order_by(Client.id)
+    if entrusted_book_id is not None:
+        stmt = stmt.where(Client.entrusted_book_id == entrusted_book_id)
+    if exclude_id is not None:
+        stmt = stmt.where(Client.id != exclude_id)
+    return list(db.session.scalars(stmt))
+
+
+def rebuild_kana_keys(batch_size: int = 500) -> int:
+    """name_kana_key を作り直す（列追加直後・キーの規則を変えたとき）。更新件数を返す。"""
+    updated = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(Client.id, Client.name_kana, Client.name_kana_key)
+            .where(Client.id > last_id)
+            .order_by(Client.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        changes = [
+            {"id": r.id, "name_kana_key": kana_key(r.name_kana)}
+            for r in rows if kana_key(r.name_kana) != r.name_kana_key
+        ]
+        if changes:
+            db.session.bulk_update_mappings(Client, changes)
+            db.session.commit()
+            updated += len(changes)
+        last_id = rows[-1].id
+    return updated
@@ -1,19 +1,18 @@
 ### apps/client/views.py
 from datetime import datetime, time
 from apps.common.forms import CSRFOnlyForm
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from apps.common.pagination import paginate_keyset
+import click
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+from sqlalchemy.orm import lazyload
 from db import db
-from sqlalchemy import select, literal, union_all, and_
-from apps.documents.amount.models import AmountDocument
-from apps.documents.required.models import RequiredDocument
-from apps.documents.delivery.models import DeliveryDocument
-from apps.documents.origin.models import OriginDocument
-from apps.documents.constants import DocumentType
+from apps.documents.document_index import documents_for_client, rebuild_document_index
 from apps.client.models import Client, CorporateProfile
 from apps.client.forms import CorporateProfileForm,AddressChangeForm
 from apps.client.constants import EntityType
 from apps.entrusted_book.models import EntrustedBook
 from apps.client.forms import ClientForm
+from apps.client import services as client_services
 
 # --------------------------
 # ブループリント
@@ -46,18 +45,53 @@ def _dt_to_date(dt):
 
 
 def _set_entrusted_book_choices(form: ClientForm):
-    books = EntrustedBook.query.order_by(EntrustedBook.name.asc()).all()
+    # 選択肢には名前だけ使うので clients（既定 selectin）は読まない
+    books = (EntrustedBook.query.options(lazyload(EntrustedBook.clients))
+             .order_by(EntrustedBook.name.asc()).all())
     # 名前がNoneの時は #ID で補完
     form.entrusted_book_id.choices = [(b.id, b.name or f"Book #{b.id}") for b in books]
 
 
+def _flash_kana_duplicates(client: Client) -> None:
+    """同じ受託簿にフリガナの照合キーが同じクライアントがいれば警告（保存は止めない）。"""
+    dups = client_services.find_duplicates(
+        client.name_kana, entrusted_book_id=client.entrusted_book_id, exclude_id=client.id
+    )
+    if dups:
+        names = "、".join(f"#{c.id} {c.name}" for c in dups[:5])
+        flash(f"同じフリガナのクライアントが既に登録されています: {names}", "warning")
+
+
 # --------------------------
 # Index（一覧）
 # --------------------------
 @client_bp.route("/")
 def index():
-    clients = Client.query.order_by(Client.updated_at.desc()).all()
-    return render_template("client/index.html", clients=clients)
+    page = paginate_keyset(
+        Client.query,
+        sortable={"updated_at": Client.updated_at, "created_at": Client.created_at, "name": Client.name},
+        default_sort="updated_at",
+        id_column=Client.id,
+    )
+    return render_template("client/index.html", clients=page.items, page=page)
+
+
+# --------------------------
+# フリガナ前方一致（JSON）
+# --------------------------
+@client_bp.route("/kana")
+def kana_lookup():
+    """?q=やまだ&entrusted_book_id=N → [{id, name, name_kana, entrusted_book_id, url}, ...]"""
+    clients = client_services.search_by_kana_prefix(
+        request.args.get("q"),
+        limit=request.args.get("limit", client_services.PREFIX_LIMIT, type=int),
+        entrusted_book_id=request.args.get("entrusted_book_id", type=int),
+    )
+    return jsonify([
+        {"id": c.id, "name": c.name, "name_kana": c.name_kana,
+         "entrusted_book_id": c.entrusted_book_id, "url": url_for("client.edit", client_id=c.id)}
+        for c in clients
+    ])
 
 
 # --------------------------
@@ -66,60 +100,8 @@ def index():
 @client_bp.route("/<int:client_id>/documents")
 def documents_index(client_id: int):
     client = Client.query.get_or_404(client_id)
-
-    a = (
-        select(
-            AmountDocument.id.label("id"),
-            AmountDocument.entrusted_book_name.label("title"),
-            AmountDocument.created_at.label("created_at"),
-            literal(DocumentType.AMOUNT.value).label("document_type"),
-        )
-        .where(and_(AmountDocument.client_id == client_id))
-    )
-
-    r = (
-        select(
-            RequiredDocument.id.label("id"),
-            RequiredDocument.entrusted_book_name.label("title"),
-            RequiredDocument.created_at.label("created_at"),
-            literal(DocumentType.REQUIRED.value).label("document_type"),
-        )
-        .where(and_(RequiredDocument.client_id == client_id))
-    )
-
-    d = (
-        select(
-            DeliveryDocument.id.label("id"),
-            DeliveryDocument.entrusted_book_name.label("title"),
-            DeliveryDocument.created_at.label("created_at"),
-            literal(DocumentType.DELIVERY.value).label("document_type"),
-        )
-        .where(and_(DeliveryDocument.client_id == client_id))
-    )
-
-    o = (
-        select(
-            OriginDocument.id.label("id"),
-            OriginDocument.real_estate_description.label("title"),
-            OriginDocument.created_at.label("created_at"),
-            literal(DocumentType.ORIGIN.value).label("document_type"),
-        )
-        .where(and_(OriginDocument.client_id == client_id))
-    )
-
-    union_q = union_all(a, r, d, o).subquery()
-
-    q = (
-        db.session.query(
-            union_q.c.id,
-            union_q.c.title,
-            union_q.c.created_at,
-            union_q.c.document_type,
-        )
-        .order_by(union_q.c.created_at.desc(), union_q.c.id.desc())
-    )
-
-    documents = q.all()
+    # 4テーブルの UNION ALL ではなく統合インデックス（apps/documents/document_index.py）から読む
+    documents = documents_for_client(client_id)
 
     return render_template(
         "client/documents_index.html",
@@ -163,6 +145,7 @@ def create():
         db.session.add(client)
         db.session.commit()
         flash("Client was created.", "success")
+        _flash_kana_duplicates(client)
         return redirect(url_for("entrusted_book.detail", book_id=client.entrusted_book_id))
 
     return render_template("client/form.html", form=form, title="New Client")
@@ -200,6 +183,7 @@ def edit(client_id):
 
         db.session.commit()
         flash("Client was updated.", "success")
+        _flash_kana_duplicates(client)
         return redirect(url_for("entrusted_book.detail", book_id=client.entrusted_book_id))
 
     return render_template("client/form.html", form=form, is_edit=True, title="Edit Client")
@@ -241,3 +225,25 @@ def delete(client_id):
     db.session.commit()
     flash(f"Client #{client_id} deleted.", "success")
     return redirect(url_for("entrusted_book.detail", book_id=client.entrusted_book_id))
+
+
+# --------------------------
+# CLI: flask client rebuild-kana-keys
+# --------------------------
+@client_bp.cli.command("rebuild-kana-keys")
+@click.option("--batch-size", default=500, show_default=True, help="commit 単位の件数")
+def rebuild_kana_keys(batch_size: int) -> None:
+    """name_kana_key（フリガナの照合キー）を name_kana から作り直す。"""
+    count = client_services.rebuild_kana_keys(batch_size=batch_size)
+    click.echo(f"kana keys updated: {count}")
+
+
+# --------------------------
+# CLI: flask client rebuild-document-index
+# --------------------------
+@client_bp.cli.command("rebuild-document-index")
+@click.option("--batch-size", default=500, show_default=True, help="1回に読む書類の件数")
+def rebuild_document_index_command(batch_size: int) -> None:
+    """document_index（書類の統合一覧）を4つの書類テーブルから作り直す。"""
+    count = rebuild_document_index(batch_size=batch_size)
+    click.echo(f"document index: {count}")
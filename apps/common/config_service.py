@@ -0,0 +1,185 @@
+# apps/common/config_service.py
+"""
+ini ファイルの読み込みを一か所にまとめる設定サービス。
+
+各 config_loader は「ini → 不変の値（frozen dataclass / tuple / MappingProxyType）」を作る関数を
+register_config() で登録し、get() で受け取る。
+- 解析（自然順ソート・CSV の分解・パディング）は読み込み時に1回だけ。呼び出しのたびには行わない
+- 返す値は読み取り専用なので、コピーせずにそのまま全リクエストで共有する
+- ファイルの mtime が変わっていたら読み直す（確認は CONFIG_RELOAD_INTERVAL 秒に1回まで）
+- 読み直しは「新しい値を最後まで作ってから参照を差し替える」ので、途中の状態は見えない。
+  壊れた ini を保存してしまったときは、ログに出して直前の値を使い続ける
+- 読み直して値が変わったときに呼ぶ関数を on_config_change() で登録できる
+  （税率が変わったら保存済みの集計列を直す、など。初回の読み込みでは呼ばない）
+
+flask config-check で登録済みのファイルと読み込み状態を確認できる。
+"""
+from __future__ import annotations
+import configparser
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+
+import click
+from flask import Flask
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class _Snapshot(Generic[T]):
+    mtime_ns: Optional[int]   # ファイルが無いときは None
+    value: T
+
+
+class ConfigFile(Generic[T]):
+    """ini 1ファイル分。最後に読んだ mtime と組み立て済みの値を持つ。"""
+
+    def __init__(self, path: str, build: Callable[[configparser.ConfigParser], T], *,
+                 case_sensitive: bool = False, required: bool = False) -> None:
+        self.path = path
+        self.build = build
+        self.case_sensitive = case_sensitive
+        self.required = required
+        self._snapshot: Optional[_Snapshot[T]] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[T, T], None]] = []
+
+    def _mtime_ns(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            if self.required:
+                raise FileNotFoundError(f"config not found: {self.path}") from None
+            return None
+
+    def _parse(self) -> T:
+        parser = configparser.ConfigParser()
+        if self.case_sensitive:
+            parser.optionxform = str  # キーの大文字・小文字を保持
+        parser.read(self.path, encoding="utf-8")
+        return self.build(parser)
+
+    def get(self) -> T:
+        snap = self._snapshot
+        if snap is not None and time.monotonic() < self._next_check:
+            return snap.value
+        changed = None
+        with self._lock:
+            snap = self._snapshot
+            mtime = self._mtime_ns()
+            if snap is None or snap.mtime_ns != mtime:
+                previous = snap
+                try:
+                    snap = _Snapshot(mtime, self._parse())
+                except Exception:
+                    if snap is None:
+                        raise
+                    logger.exception("config reload failed, keeping previous values: %s", self.path)
+                    snap = _Snapshot(mtime, snap.value)  # 同じ壊れたファイルを毎回読み直さない
+                else:
+                    if previous is not None:
+                        logger.info("config reloaded: %s", self.path)
+                        if previous.value != snap.value:
+                            changed = (previous.value, snap.value)
+                self._snapshot = snap  # 参照の差し替えだけなので、読み手は古い値か新しい値のどちらかを見る
+            self._next_check = time.monotonic() + settings.CONFIG_RELOAD_INTERVAL
+        if changed is not None:
+            self._notify(*changed)  # ロックの外で（listener が get() を呼んでもよい）
+        return snap.value
+
+    def on_change(self, callback: Callable[[T, T], None]) -> None:
+        """読み直しで値が変わったときに callback(旧, 新) を呼ぶ。"""
+        self._listeners.append(callback)
+
+    def _notify(self, old: T, new: T) -> None:
+        for callback in self._listeners:
+            try:
+                callback(old, new)
+            except Exception:  # 設定の読み込み（＝画面）は止めない
+                logger.exception("config change listener failed: %s", self.path)
+
+    def invalidate(self) -> None:
+        """次の get() で mtime を確認させる（間隔を待たない）。"""
+        self._next_check = 0.0
+
+    @property
+    def loaded_mtime_ns(self) -> Optional[int]:
+        snap = self._snapshot
+        return snap.mtime_ns if snap else None
+
+
+_REGISTRY: Dict[str, ConfigFile] = {}
+
+
+def register_config(name: str, path: str, build: Callable[[configparser.ConfigParser], T], *,
+                    case_sensitive: bool = False, required: bool = False) -> ConfigFile[T]:
+    """設定ファイルを登録する（モジュールの import 時に1回）。name は flask config-check の表示用。"""
+    cfg = ConfigFile(path, build, case_sensitive=case_sensitive, required=required)
+    _REGISTRY[name] = cfg
+    return cfg
+
+
+def registered_configs() -> Dict[str, ConfigFile]:
+    return dict(_REGISTRY)
+
+
+def on_config_change(name: str, callback: Callable[[T, T], None]) -> None:
+    """登録済みの設定 name が読み直しで変わったら callback(旧, 新) を呼ぶ。"""
+    _REGISTRY[name].on_change(callback)
+
+
+def config_version(*names: str) -> str:
+    """
+    登録済み設定の版（読み込んだ ini の mtime を並べた文字列）。ini を書き換えると変わる。
+    設定の値を含む生成物（PDF など）のキャッシュキーに使う。
+    """
+    parts = []
+    for name in names:
+        cfg = _REGISTRY[name]
+        cfg.get()  # 必要なら読み直してから版を見る
+        parts.append(format(cfg.loaded_mtime_ns or 0, "x"))
+    return "-".join(parts)
+
+
+# =========================
+# 組み立て用の小物
+# =========================
+def ini_text(value: Optional[str]) -> str:
+    """ini に書いた '\\n' を実際の改行にする。"""
+    return (value or "").replace("\\n", "\n")
+
+
+# =========================
+# CLI
+# =========================
+def register_config_check(app: Flask) -> None:
+    @app.cli.command("config-check")
+    def config_check_command() -> None:
+        """登録済みの ini を読み込み、パスと状態を表示する（読めないものがあれば終了コード 1）。"""
+        # 各 config_loader は import 時に登録するので、ここで一通り読み込む
+        from apps.common.warmup import CONFIG_LOADERS
+        from werkzeug.utils import import_string
+        for path in CONFIG_LOADERS:
+            import_string(path)
+
+        failed = False
+        for name, cfg in sorted(_REGISTRY.items()):
+            cfg.invalidate()
+            try:
+                cfg.get()
+                status = "ok" if cfg.loaded_mtime_ns is not None else "missing (defaults)"
+            except Exception as exc:
+                failed = True
+                status = f"ERROR: {exc}"
+            click.echo(f"{name:<20} {status:<20} {cfg.path}")
+        if failed:
+            raise SystemExit(1)
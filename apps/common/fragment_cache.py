@@ -0,0 +1,287 @@
+# apps/common/fragment_cache.py
+"""
+描画済み HTML の断片キャッシュ（書類の詳細画面の本文など）。
+
+    html = fragment_cache.render(
+        "amount", doc.id, version=(doc.updated_at, doc.client.updated_at, office_config_version()),
+        variant="estimate", render=lambda: render_template("amount/_document.html", ...),
+    )
+
+- エントリは (名前, id) ごとに1つで、中身は {"version": ..., "fragments": {variant: html}}。
+  version（行の updated_at・設定の版など）が一致したときだけ使うので、古い値を返すことはない
+  （プロセスごとの LRU で他のワーカーが消し損ねていても、次に読んだときに作り直す）
+- 書類の更新・削除時は SQLAlchemy の after_update / after_delete で消す（register_invalidation）。
+  version の確認があるので、これは古いエントリを早く手放すためのもの
+- 置き場所は settings.FRAGMENT_CACHE_BACKEND で選ぶ
+      memory     … プロセス内の LRU（既定。FRAGMENT_CACHE_MAX_ENTRIES 件）
+      filesystem … FRAGMENT_CACHE_DIR の JSON ファイル（ワーカー間・再起動後も共有）
+      redis      … FRAGMENT_CACHE_REDIS_URL（redis パッケージ・任意依存。get/set/delete/scan_iter が
+                   あれば同じ形のクライアントを RedisBackend(client) に渡してもよい）
+      none       … 使わない
+- テンプレートを変えてデプロイしたときは flask fragment-cache clear（memory は再起動で消える）
+"""
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import click
+from flask import Flask
+from markupsafe import Markup
+from sqlalchemy import event
+
+import settings
+from apps.common.metrics import cache_result
+
+logger = logging.getLogger(__name__)
+
+Entry = Dict[str, Any]   # {"version": str, "fragments": {variant: html}}
+
+
+# =========================
+# バックエンド
+# =========================
+class Backend:
+    """エントリ（JSON にできる dict）の置き場所。"""
+
+    def get(self, key: str) -> Optional[Entry]:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: Entry) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> int:
+        """全部消して件数を返す。"""
+        raise NotImplementedError
+
+
+class NullBackend(Backend):
+    def get(self, key: str) -> Optional[Entry]:
+        return None
+
+    def set(self, key: str, entry: Entry) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def clear(self) -> int:
+        return 0
+
+
+class MemoryBackend(Backend):
+    """プロセス内の LRU。"""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Entry) -> None:
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> int:
+        with self._lock:
+            n = len(self._data)
+            self._data.clear()
+            return n
+
+
+class FileSystemBackend(Backend):
+    """1エントリ1ファイル（JSON）。書き込みは一時ファイルからの置き換え。"""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key: str) -> Optional[Entry]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:  # 壊れたファイルは無かったことにする
+            return None
+
+    def set(self, key: str, entry: Entry) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            logger.exception("fragment cache write failed: %s", key)
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> int:
+        n = 0
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.unlink(os.path.join(self.directory, name))
+                    n += 1
+        return n
+
+
+class RedisBackend(Backend):
+    """Redis（互換）。client は redis.Redis と同じ get / set / delete / scan_iter を持つもの。"""
+
+    def __init__(self, client: Any, *, prefix: str = "fragment:", ttl: Optional[int] = None) -> None:
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisBackend":
+        import redis  # 任意依存
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key: str) -> Optional[Entry]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw else None
+
+    def set(self, key: str, entry: Entry) -> None:
+        self.client.set(self.prefix + key, json.dumps(entry, ensure_ascii=False), ex=self.ttl)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> int:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+        return len(keys)
+
+
+def _backend_from_settings() -> Backend:
+    kind = settings.FRAGMENT_CACHE_BACKEND
+    if kind == "memory":
+        return MemoryBackend(settings.FRAGMENT_CACHE_MAX_ENTRIES)
+    if kind == "filesystem":
+        return FileSystemBackend(settings.FRAGMENT_CACHE_DIR)
+    if kind == "redis":
+        return RedisBackend.from_url(settings.FRAGMENT_CACHE_REDIS_URL, ttl=settings.FRAGMENT_CACHE_TTL or None)
+    if kind not in ("none", ""):
+        logger.warning("unknown FRAGMENT_CACHE_BACKEND=%r, cache disabled", kind)
+    return NullBackend()
+
+
+_backend: Optional[Backend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> Backend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _backend_from_settings()
+    return _backend
+
+
+def set_backend(backend: Optional[Backend]) -> None:
+    """バックエンドを差し替える（None なら次に使うとき settings から作り直す）。"""
+    global _backend
+    _backend = backend
+
+
+# =========================
+# 読み書き
+# =========================
+def _key(name: str, ident: Any) -> str:
+    return f"{name}:{ident}"
+
+
+def _version(parts: Iterable[Any]) -> str:
+    return "|".join("" if p is None else (p.isoformat() if hasattr(p, "isoformat") else str(p)) for p in parts)
+
+
+def render(name: str, ident: Any, *, version: Iterable[Any], render: Callable[[], str],
+           variant: str = "default") -> Markup:
+    """version が一致するキャッシュがあればそれを、無ければ render() して保存したものを返す。"""
+    backend = get_backend()
+    key, ver = _key(name, ident), _version(version)
+    try:
+        entry = backend.get(key)
+    except Exception:  # キャッシュが使えなくても画面は出す
+        logger.exception("fragment cache get failed: %s", key)
+        entry = None
+
+    if entry and entry.get("version") == ver and variant in entry.get("fragments", {}):
+        cache_result(f"fragment:{name}", True)
+        return Markup(entry["fragments"][variant])
+
+    cache_result(f"fragment:{name}", False)
+    html = str(render())
+    fragments = dict(entry["fragments"]) if entry and entry.get("version") == ver else {}
+    fragments[variant] = html
+    try:
+        backend.set(key, {"version": ver, "fragments": fragments})
+    except Exception:
+        logger.exception("fragment cache set failed: %s", key)
+    return Markup(html)
+
+
+def invalidate(name: str, ident: Any) -> None:
+    try:
+        get_backend().delete(_key(name, ident))
+    except Exception:
+        logger.exception("fragment cache delete failed: %s:%s", name, ident)
+
+
+def register_invalidation(model: Any, name: str, *, ident: Callable[[Any], Any] = lambda obj: obj.id) -> None:
+    """model の行が UPDATE / DELETE されたら (name, ident(obj)) のキャッシュを消す。"""
+    def _invalidate(mapper: Any, connection: Any, target: Any) -> None:
+        value = ident(target)
+        if value is not None:
+            invalidate(name, value)
+
+    event.listen(model, "after_update", _invalidate)
+    event.listen(model, "after_delete", _invalidate)
+
+
+# =========================
+# CLI
+# =========================
+def register_fragment_cache_cli(app: Flask) -> None:
+    @app.cli.group("fragment-cache")
+    def fragment_cache_group() -> None:
+        """描画済み HTML のキャッシュ（FRAGMENT_CACHE_BACKEND）。"""
+
+    @fragment_cache_group.command("clear")
+    def clear_command() -> None:
+        """全部消す（テンプレートを変えてデプロイしたあとなど）。"""
+        click.echo(f"{settings.FRAGMENT_CACHE_BACKEND}: {get_backend().clear()} entries removed")
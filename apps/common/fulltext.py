@@ -0,0 +1,38 @@
+# apps/common/fulltext.py
+"""
+全文検索用の生成列（search_text / search_tsv）とインデックスの定義ヘルパ。
+
+各モデルで
+    search_text = db.Column(db.Text,   Computed(text_expr("name", "note"), persisted=True))
+    search_tsv  = db.Column(TSVECTOR,  Computed(tsv_expr("name", "note"), persisted=True))
+    __table_args__ = (*search_indexes("entrusted_book"),)
+のように使う。
+
+- search_text: 検索対象の列を連結した文字列 → pg_trgm の GIN（部分一致 ILIKE / あいまい一致 <%）
+- search_tsv : 'simple' 辞書の tsvector → GIN（語単位の一致とランキング）
+- 生成列は書き込み時に Postgres が計算するので、アプリ側での更新漏れがない
+- pg_trgm 拡張が必要（flask search init で作成）
+"""
+from __future__ import annotations
+from typing import Tuple
+
+from sqlalchemy import Index
+
+
+def text_expr(*columns: str) -> str:
+    """列を空白区切りで連結する SQL 式。JSONB などは '列::text' のように渡す。"""
+    return " || ' ' || ".join(f"coalesce({c}, '')" for c in columns)
+
+
+def tsv_expr(*columns: str) -> str:
+    """text_expr を 'simple' 辞書で tsvector にする SQL 式（regconfig を明示して IMMUTABLE に）。"""
+    return f"to_tsvector('simple'::regconfig, {text_expr(*columns)})"
+
+
+def search_indexes(table: str) -> Tuple[Index, Index]:
+    """search_text の trigram GIN と search_tsv の GIN。"""
+    return (
+        Index(f"ix_{table}_search_trgm", "search_text",
+              postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"}),
+        Index(f"ix_{table}_search_tsv", "search_tsv", postgresql_using="gin"),
+    )
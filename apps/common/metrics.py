@@ -0,0 +1,205 @@
+# apps/common/metrics.py
+"""
+Prometheus 形式のメトリクス（GET /metrics）。
+
+- prometheus_client が無ければ計測はすべて何もしない（/metrics は 404 のまま）
+- gunicorn など複数ワーカーのときは環境変数 PROMETHEUS_MULTIPROC_DIR を設定すると、
+  各プロセスの値をファイル経由で合算して返す（ワーカー終了時の後始末は gunicorn.conf.py の child_exit）
+- 計測はカウンタ加算とヒストグラムのバケット更新だけなので本番で常時オンにしてよい
+
+出しているもの:
+    http_request_duration_seconds{blueprint, endpoint, method}   リクエスト処理時間
+    http_requests_total{blueprint, endpoint, method, status}     件数
+    http_requests_in_progress                                    処理中リクエスト数
+    db_pool_checkout_wait_seconds                                接続プールから借りるまでの待ち時間
+    db_pool_size / db_pool_checked_out                           プールの大きさ / 貸出中の接続数
+    pdf_extract_duration_seconds{backend, result}                PDF テキスト抽出（PyPDF2 / pdfminer / pdfplumber）
+    pdf_render_duration_seconds{document_type, result}           書類の PDF 化（キャッシュに無かったものだけ）
+    registry_parse_duration_seconds{parser}                      登記簿テキストの解析
+    cache_requests_total{cache, result}                          キャッシュの hit / miss（ヒット率は PromQL で）
+"""
+from __future__ import annotations
+import os
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from flask import Flask, Response, g, request
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:  # 任意依存
+    prometheus_client = None
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _Noop:
+    """prometheus_client が無いときの代わり（labels() も observe() も何もしない）。"""
+
+    def labels(self, *args: Any, **kwargs: Any) -> "_Noop":
+        return self
+
+    def observe(self, *args: Any) -> None: ...
+    def inc(self, *args: Any) -> None: ...
+    def dec(self, *args: Any) -> None: ...
+    def set(self, *args: Any) -> None: ...
+
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram("http_request_duration_seconds", "Request latency",
+                                ["blueprint", "endpoint", "method"], buckets=LATENCY_BUCKETS)
+    REQUEST_COUNT = Counter("http_requests_total", "Requests",
+                            ["blueprint", "endpoint", "method", "status"])
+    IN_PROGRESS = Gauge("http_requests_in_progress", "Requests in progress", multiprocess_mode="livesum")
+    POOL_WAIT = Histogram("db_pool_checkout_wait_seconds", "Time waiting for a pooled DB connection",
+                          buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0))
+    POOL_SIZE = Gauge("db_pool_size", "Configured pool size (summed over workers)", multiprocess_mode="livesum")
+    POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections checked out", multiprocess_mode="livesum")
+    PDF_EXTRACT = Histogram("pdf_extract_duration_seconds", "PDF text extraction time",
+                            ["backend", "result"], buckets=SLOW_BUCKETS)
+    PDF_RENDER = Histogram("pdf_render_duration_seconds", "Document HTML to PDF render time",
+                           ["document_type", "result"], buckets=SLOW_BUCKETS)
+    REGISTRY_PARSE = Histogram("registry_parse_duration_seconds", "Registry text parse time",
+                               ["parser"], buckets=SLOW_BUCKETS)
+    CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups", ["cache", "result"])
+else:
+    REQUEST_LATENCY = REQUEST_COUNT = IN_PROGRESS = _Noop()
+    POOL_WAIT = POOL_SIZE = POOL_CHECKED_OUT = _Noop()
+    PDF_EXTRACT = PDF_RENDER = REGISTRY_PARSE = CACHE_REQUESTS = _Noop()
+
+
+# =========================
+# 計測ヘルパ（各サービスから呼ぶ）
+# =========================
+@contextmanager
+def time_histogram(histogram: Any, **labels: str) -> Iterator[None]:
+    """with の中の処理時間を histogram.labels(**labels) に記録する。"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+def cache_result(cache: str, hit: bool, count: int = 1) -> None:
+    """キャッシュの hit / miss を数える（count でまとめて加算）。"""
+    if count:
+        CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc(count)
+
+
+# =========================
+# 接続プール
+# =========================
+# プロセス内の生きているプール → 大きさ。db_pool_size はこの合計を set する（inc / dec で積み上げない）。
+# engine.dispose() で作り直したプールは recreate() で前のプールと入れ替わる
+_POOL_SIZES: "weakref.WeakKeyDictionary[QueuePool, int]" = weakref.WeakKeyDictionary()
+_report_pools = True
+
+
+def _publish_pool_size() -> None:
+    POOL_SIZE.set(sum(_POOL_SIZES.values()) if _report_pools else 0)
+
+
+def set_pool_reporting(enabled: bool) -> None:
+    """
+    このプロセスのプールを db_pool_size / db_pool_checked_out に数えるか。
+    gunicorn の preload ではマスターもプールを持つが、リクエストは受けないので数えない
+    （gunicorn.conf.py の when_ready で False、post_fork で True に戻してからプールを作り直す）。
+    """
+    global _report_pools
+    _report_pools = enabled
+    _publish_pool_size()
+    if not enabled:
+        POOL_CHECKED_OUT.set(0)
+
+
+class TimedQueuePool(QueuePool):
+    """プールから接続を借りるまでの待ち時間を測る QueuePool。"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        _POOL_SIZES[self] = self.size()
+        _publish_pool_size()
+
+    def recreate(self) -> QueuePool:
+        _POOL_SIZES.pop(self, None)  # 新しいプールは __init__ で自分を足す
+        return super().recreate()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - start)
+
+
+@event.listens_for(TimedQueuePool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    if _report_pools:
+        POOL_CHECKED_OUT.inc()
+
+
+@event.listens_for(TimedQueuePool, "checkin")
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    if _report_pools:
+        POOL_CHECKED_OUT.dec()
+
+
+# =========================
+# Flask への組み込み
+# =========================
+def _render_latest() -> Response:
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        from prometheus_client import CollectorRegistry, multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return Response(prometheus_client.generate_latest(registry),
+                    mimetype=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app: Flask) -> None:
+    """
+    /metrics とリクエスト計測を登録する（db.init_app より前に呼ぶ: プールのクラスを差し替えるため）。
+    prometheus_client が無い、または METRICS_ENABLED=False なら何もしない。
+    """
+    if prometheus_client is None or not app.config.get("METRICS_ENABLED", True):
+        return
+
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}), "poolclass": TimedQueuePool,
+    }
+    app.config["SQLALCHEMY_BINDS"] = {
+        key: ({**bind, "poolclass": TimedQueuePool} if isinstance(bind, dict) else bind)
+        for key, bind in app.config.get("SQLALCHEMY_BINDS", {}).items()
+    }
+
+    @app.before_request
+    def _metrics_start() -> None:
+        g._metrics_start = time.perf_counter()
+        IN_PROGRESS.inc()
+
+    @app.after_request
+    def _metrics_observe(response):
+        start = g.get("_metrics_start")
+        if start is not None and request.endpoint != "metrics":
+            labels = {"blueprint": request.blueprint or "", "endpoint": request.endpoint or "unmatched",
+                      "method": request.method}
+            REQUEST_LATENCY.labels(**labels).observe(time.perf_counter() - start)
+            REQUEST_COUNT.labels(status=str(response.status_code), **labels).inc()
+        return response
+
+    @app.teardown_request
+    def _metrics_done(exc) -> None:
+        if g.pop("_metrics_start", None) is not None:
+            IN_PROGRESS.dec()
+
+    app.add_url_rule("/metrics", "metrics", _render_latest)
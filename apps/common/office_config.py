@@ -0,0 +1,59 @@
+# apps/common/office_config.py
+"""
+事務所・口座（config/office.ini）と税率（config/tax.ini）。
+
+config_service 経由で読むので、ini を書き換えれば再起動なしで反映される。
+Python 側は office_config() / tax_rates()、テンプレートは context_processor の office / bank / tax を使う。
+"""
+from __future__ import annotations
+import configparser
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Union
+
+from apps.common.config_service import config_version, register_config
+
+CONFIG_DIR = Path(__file__).resolve().parents[2] / "config"   # project_root/config/
+
+_EMPTY: Mapping[str, str] = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class OfficeConfig:
+    office: Mapping[str, str]
+    bank: Mapping[str, str]   # OFFICE と同じ ini に入れている想定（なければ空）
+
+
+def _section(parser: configparser.ConfigParser, name: str) -> Mapping[str, str]:
+    return MappingProxyType(dict(parser[name])) if parser.has_section(name) else _EMPTY
+
+
+def _build_office(parser: configparser.ConfigParser) -> OfficeConfig:
+    return OfficeConfig(office=_section(parser, "OFFICE"), bank=_section(parser, "BANK"))
+
+
+def _build_tax(parser: configparser.ConfigParser) -> Mapping[str, Union[int, float]]:
+    """TAX_RATE セクションを float/int にキャストする（'0.10' → 0.1、'10000' → 10000）。"""
+    return MappingProxyType({
+        k: (float(v) if "." in v else int(v))
+        for k, v in _section(parser, "TAX_RATE").items()
+    })
+
+
+_office = register_config("office", str(CONFIG_DIR / "office.ini"), _build_office)
+_tax = register_config("tax", str(CONFIG_DIR / "tax.ini"), _build_tax)
+
+
+def office_config() -> OfficeConfig:
+    return _office.get()
+
+
+def tax_rates() -> Mapping[str, Union[int, float]]:
+    """{consumption_tax, withholding_exemption, withholding_tax}"""
+    return _tax.get()
+
+
+def office_config_version() -> str:
+    """office.ini / tax.ini の版（どちらかを書き換えると変わる）。"""
+    return config_version("office", "tax")
@@ -0,0 +1,229 @@
+# apps/common/pagination.py
+"""
+一覧ページ共通のキーセット（シーク）ページング。
+
+- OFFSET を使わず「(並び替え列, id) が前ページの末尾より後ろ」で次ページを取るので、
+  何ページ目でも、行数が増えても同じ速さ（(列, id) の複合インデックス前提）
+- 並び替え列はビューごとのホワイトリスト（sortable）から選ぶ。NULL を持つ列は対象にしない
+- カーソルは (値, id) を JSON → urlsafe base64 にした不透明な文字列
+
+クエリ文字列:
+    ?sort=<列名>&dir=asc|desc&per_page=N&after=<カーソル> / before=<カーソル>
+
+使い方（ビュー）:
+    page = paginate_keyset(
+        Client.query,
+        sortable={"updated_at": Client.updated_at, "name": Client.name},
+        default_sort="updated_at",
+        id_column=Client.id,
+    )
+    return render_template("client/index.html", clients=page.items, page=page)
+
+テンプレート側は macros.html の pager / sort_link を使う。
+"""
+from __future__ import annotations
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional
+
+from flask import request, url_for
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 200
+DIRECTIONS = ("asc", "desc")
+
+
+# =========================
+# カーソル
+# =========================
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(value: Any, row_id: int) -> str:
+    raw = json.dumps([_dump_value(value), row_id], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _python_type(column: Any) -> Optional[type]:
+    try:
+        return column.type.python_type
+    except (AttributeError, NotImplementedError):
+        return None
+
+
+def _matches(value: Any, expected: Optional[type]) -> bool:
+    """カーソルの値が並び替え列の型か（bool は int、datetime は date として扱わない）。"""
+    if value is None or isinstance(value, (bool, list, dict)):
+        return False
+    if expected is None:
+        return True
+    if expected is date:
+        return type(value) is date
+    if expected is datetime:
+        return type(value) is datetime
+    if expected in (float, Decimal):
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def decode_cursor(cursor: Optional[str], column: Any = None) -> Optional[tuple]:
+    """
+    壊れたカーソルは None（先頭ページ扱い）。
+    column（並び替え列）を渡すと、値がその列の型でなければ None（クライアントが作った
+    [[1, 2], 3] や {"x": 1} を日付・数値の列に当ててエラーにしない）。
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        decoded = json.loads(raw)
+        if not isinstance(decoded, list) or len(decoded) != 2:
+            return None
+        value, row_id = _load_value(decoded[0]), decoded[1]
+    except (ValueError, TypeError):
+        return None
+    if type(row_id) is not int or not _matches(value, _python_type(column) if column is not None else None):
+        return None
+    return value, row_id
+
+
+# =========================
+# ページ
+# =========================
+@dataclass
+class KeysetPage:
+    items: List[Any]
+    sort: str
+    direction: str
+    per_page: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    args: Dict[str, Any] = field(default_factory=dict)  # ページング以外のクエリ（client_id など）
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+    def _url(self, **params: Any) -> str:
+        merged = {**(request.view_args or {}), **self.args,
+                  "sort": self.sort, "dir": self.direction, "per_page": self.per_page}
+        merged.update(params)
+        return url_for(request.endpoint, **{k: v for k, v in merged.items() if v is not None})
+
+    @property
+    def next_url(self) -> Optional[str]:
+        return self._url(after=self.next_cursor) if self.has_next else None
+
+    @property
+    def prev_url(self) -> Optional[str]:
+        return self._url(before=self.prev_cursor) if self.has_prev else None
+
+    @property
+    def first_url(self) -> str:
+        return self._url()
+
+    def sort_url(self, name: str) -> str:
+        """列見出しのリンク。同じ列なら昇順/降順を反転、別の列なら降順から。"""
+        if name == self.sort:
+            direction = "asc" if self.direction == "desc" else "desc"
+        else:
+            direction = "desc"
+        return self._url(sort=name, dir=direction)
+
+    def sort_state(self, name: str) -> Optional[str]:
+        """その列で並んでいれば 'asc' / 'desc'、そうでなければ None（見出しの矢印用）。"""
+        return self.direction if name == self.sort else None
+
+
+# =========================
+# 本体
+# =========================
+def paginate_keyset(
+        query: Query,
+        *,
+        sortable: Mapping[str, Any],
+        default_sort: str,
+        id_column: Any,
+        default_dir: str = "desc",
+        default_per_page: int = DEFAULT_PER_PAGE,
+        max_per_page: int = MAX_PER_PAGE,
+        args: Optional[Mapping[str, Any]] = None,
+) -> KeysetPage:
+    """
+    query を (sort 列, id) のキーセットで1ページ分だけ取得する。
+    query には order_by を付けずに渡す（ここで付ける）。
+    sortable の列は NOT NULL であること（NULL は行値比較で落ちる）。
+    """
+    args = request.args if args is None else args
+
+    sort = args.get("sort") if args.get("sort") in sortable else default_sort
+    direction = args.get("dir") if args.get("dir") in DIRECTIONS else default_dir
+    try:
+        per_page = int(args.get("per_page") or default_per_page)
+    except (TypeError, ValueError):
+        per_page = default_per_page
+    per_page = max(1, min(per_page, max_per_page))
+
+    column = sortable[sort]
+    key = tuple_(column, id_column)
+    after = decode_cursor(args.get("after"), column)
+    before = decode_cursor(args.get("before"), column) if after is None else None
+
+    # before（前ページ）は並びを逆にして取り、最後に反転する
+    backwards = before is not None
+    ascending = (direction == "asc") != backwards
+    if after is not None:
+        query = query.filter(key > after if direction == "asc" else key < after)
+    elif backwards:
+        query = query.filter(key < before if direction == "asc" else key > before)
+
+    order = (column.asc(), id_column.asc()) if ascending else (column.desc(), id_column.desc())
+    rows = query.order_by(*order).limit(per_page + 1).all()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    def cursor_of(row: Any) -> str:
+        return encode_cursor(getattr(row, column.key), getattr(row, id_column.key))
+
+    # 次ページ: 前向きなら「まだある」とき、後ろ向きなら常に（来たページがある）
+    next_cursor = cursor_of(rows[-1]) if rows and (has_more if not backwards else True) else None
+    # 前ページ: 後ろ向きなら「まだある」とき、前向きなら after 指定があったとき
+    prev_cursor = cursor_of(rows[0]) if rows and (has_more if backwards else after is not None) else None
+
+    passthrough = {k: v for k, v in args.items()
+                   if k not in ("sort", "dir", "per_page", "after", "before")}
+    return KeysetPage(
+        items=rows,
+        sort=sort,
+        direction=direction,
+        per_page=per_page,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        args=passthrough,
+    )
@@ -0,0 +1,146 @@
+# apps/common/query_stats.py
+"""
+SQL の計測（リクエストごとのクエリ数・DB 時間）と N+1 の検出。
+
+- Engine の before/after_cursor_execute で全クエリ（プライマリ・レプリカとも）を拾う
+- リクエストの終わりにログへ1行（件数・DB 時間）。同じ形の SQL（fingerprint）が
+  N1_THRESHOLD 回以上出ていたら「N+1 の疑い」として WARNING で SQL を出す
+- レスポンスに Server-Timing: db;dur=..（ブラウザの開発者ツールで見える）
+- テスト用に count_queries() / assert_max_queries()
+
+    with assert_max_queries(5):
+        client.get("/clients/")
+"""
+from __future__ import annotations
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Tuple
+
+from flask import Flask, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+N1_THRESHOLD = 5        # 同じ fingerprint がこの回数以上でN+1の疑い
+SLOW_REQUEST_QUERIES = 50
+
+_START_KEY = "query_stats_start"
+# テスト用の集計器（count_queries の入れ子に対応するためタプルで積む）
+_collectors: ContextVar[Tuple["QueryStats", ...]] = ContextVar("query_stats_collectors", default=())
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int = N1_THRESHOLD) -> List[Tuple[str, int]]:
+        """threshold 回以上出た SQL（多い順）。"""
+        return [(sql, n) for sql, n in self.fingerprints.most_common() if n >= threshold]
+
+
+# =========================
+# fingerprint
+# =========================
+_WS_RE = re.compile(r"\s+")
+_NUM_RE = re.compile(r"\b\d+\b")
+_STR_RE = re.compile(r"'(?:[^']|'')*'")
+_IN_RE = re.compile(r"\bIN \((?:[^()]*)\)", re.IGNORECASE)
+
+
+def fingerprint(statement: str) -> str:
+    """値の違いを無視した SQL の形（空白を詰め、リテラルと IN (...) の中身を ? に）。"""
+    s = _WS_RE.sub(" ", statement).strip()
+    s = _STR_RE.sub("?", s)
+    s = _NUM_RE.sub("?", s)
+    return _IN_RE.sub("IN (?)", s)
+
+
+# =========================
+# Engine のフック
+# =========================
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    if has_request_context() and "query_stats" in g:
+        g.query_stats.record(statement, elapsed_ms)
+    for stats in _collectors.get():
+        stats.record(statement, elapsed_ms)
+
+
+def _install_engine_hooks() -> None:
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# =========================
+# リクエスト単位の集計
+# =========================
+def init_query_stats(app: Flask) -> None:
+    """app にリクエストごとの SQL 計測を付ける（QUERY_STATS_ENABLED=False で無効）。"""
+    if not app.config.get("QUERY_STATS_ENABLED", True):
+        return
+    _install_engine_hooks()
+    threshold = app.config.get("QUERY_STATS_N1_THRESHOLD", N1_THRESHOLD)
+
+    @app.before_request
+    def _start_query_stats() -> None:
+        g.query_stats = QueryStats()
+
+    @app.after_request
+    def _report_query_stats(response):
+        stats = g.pop("query_stats", None)
+        if stats is None:
+            return response
+        response.headers.add("Server-Timing", f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"')
+
+        level = logging.WARNING if stats.count >= SLOW_REQUEST_QUERIES else logging.DEBUG
+        logger.log(level, "%s %s: %d queries, %.1f ms",
+                   request.method, request.path, stats.count, stats.total_ms)
+        for sql, n in stats.repeated(threshold):
+            logger.warning("probable N+1 at %s (%s): %d x %s", request.endpoint, request.path, n, sql[:300])
+        return response
+
+
+# =========================
+# テスト用
+# =========================
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """with の中で実行された SQL を数える。"""
+    _install_engine_hooks()
+    stats = QueryStats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryStats]:
+    """with の中の SQL が max_queries 件を超えたら AssertionError（出た SQL を添えて）。"""
+    with count_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        detail = "\n".join(f"  {n} x {sql[:200]}" for sql, n in stats.fingerprints.most_common())
+        raise AssertionError(f"expected <= {max_queries} queries, got {stats.count}:\n{detail}")
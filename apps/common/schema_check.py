@@ -0,0 +1,68 @@
+# apps/common/schema_check.py
+"""
+モデル定義（db.metadata）と実 DB のスキーマ差分チェック（flask schema-check）。
+
+Alembic の autogenerate と同じ比較で、足りない・余分なテーブル / 列 / インデックスなどを列挙する。
+インデックスをモデルに足したのにリビジョンを書き忘れた、手で消した、といった漏れを
+デプロイ前や CI で拾うためのもの（差分があれば終了コード 1）。
+"""
+from __future__ import annotations
+from typing import Any, List
+
+import click
+from flask import Flask
+
+from db import db
+
+# Alembic 自身の管理テーブルは比較しない
+_IGNORED_TABLES = {"alembic_version"}
+
+
+def _include_name(name: Any, type_: str, parent_names: Any) -> bool:
+    return not (type_ == "table" and name in _IGNORED_TABLES)
+
+
+def _describe(diff: Any) -> str:
+    """compare_metadata の1件を1行に。"""
+    if isinstance(diff, list):  # 列の変更（modify_nullable など）は list で来る
+        return "; ".join(_describe(d) for d in diff)
+    op, *args = diff
+    if op in ("add_table", "remove_table"):
+        return f"{op}: {args[0].name}"
+    if op in ("add_index", "remove_index"):
+        idx = args[0]
+        return f"{op}: {idx.name} on {idx.table.name}({', '.join(str(c) for c in idx.expressions)})"
+    if op in ("add_column", "remove_column"):
+        _schema, table, column = args
+        return f"{op}: {table}.{column.name}"
+    if op.startswith("modify_"):
+        _schema, table, column, *_rest = args
+        return f"{op}: {table}.{column}"
+    return f"{op}: {args!r}"
+
+
+def diff_schema() -> List[str]:
+    """モデルと接続先 DB の差分（人が読む形）。差分なしなら空リスト。"""
+    from alembic.autogenerate import compare_metadata
+    from alembic.migration import MigrationContext
+
+    with db.engine.connect() as conn:
+        ctx = MigrationContext.configure(conn, opts={
+            "compare_type": True,
+            "include_name": _include_name,
+        })
+        return [_describe(d) for d in compare_metadata(ctx, db.metadata)]
+
+
+def register_schema_check(app: Flask) -> None:
+    @app.cli.command("schema-check")
+    def schema_check() -> None:
+        """モデルと実 DB のスキーマ差分を表示する（差分があれば終了コード 1）。"""
+        diffs = diff_schema()
+        if not diffs:
+            click.echo("schema: ok")
+            return
+        for line in diffs:
+            click.echo(line)
+        click.echo(f"schema: {len(diffs)} difference(s). alembic のリビジョンを確認してください。", err=True)
+        raise SystemExit(1)
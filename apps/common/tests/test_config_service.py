@@ -0,0 +1,84 @@
+# apps/common/tests/test_config_service.py
+"""
+設定サービス（apps/common/config_service.py）の確認。ini は一時ディレクトリに書く。
+"""
+import os
+
+import pytest
+
+import settings
+from apps.common.config_service import ConfigFile
+
+
+@pytest.fixture(autouse=True)
+def no_interval(monkeypatch):
+    monkeypatch.setattr(settings, "CONFIG_RELOAD_INTERVAL", 0)
+
+
+def _write(path, text, mtime_ns):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _build(parser):
+    return tuple(parser["A"].items()) if parser.has_section("A") else ()
+
+
+def test_parses_once_and_shares_value(tmp_path):
+    ini = tmp_path / "a.ini"
+    _write(ini, "[A]\nx = 1\n", 1_000_000_000)
+    calls = []
+    cfg = ConfigFile(str(ini), lambda p: calls.append(1) or _build(p))
+    first = cfg.get()
+    assert cfg.get() is first
+    assert first == (("x", "1"),)
+    assert len(calls) == 1
+
+
+def test_reloads_when_mtime_changes(tmp_path):
+    ini = tmp_path / "a.ini"
+    _write(ini, "[A]\nx = 1\n", 1_000_000_000)
+    cfg = ConfigFile(str(ini), _build)
+    old = cfg.get()
+    _write(ini, "[A]\nx = 2\n", 2_000_000_000)
+    assert cfg.get() == (("x", "2"),)
+    assert old == (("x", "1"),)   # 以前の値はそのまま（差し替えで更新）
+
+
+def test_keeps_previous_value_when_reload_fails(tmp_path):
+    ini = tmp_path / "a.ini"
+    _write(ini, "[A]\nx = 1\n", 1_000_000_000)
+    cfg = ConfigFile(str(ini), _build)
+    old = cfg.get()
+    _write(ini, "x = no section header\n", 2_000_000_000)
+    assert cfg.get() is old
+
+
+def test_missing_file(tmp_path):
+    assert ConfigFile(str(tmp_path / "none.ini"), _build).get() == ()
+    with pytest.raises(FileNotFoundError):
+        ConfigFile(str(tmp_path / "none.ini"), _build, required=True).get()
+
+
+def test_change_listener_runs_only_when_value_changes(tmp_path):
+    ini = tmp_path / "a.ini"
+    _write(ini, "[A]\nx = 1\n", 1_000_000_000)
+    cfg = ConfigFile(str(ini), _build)
+    calls = []
+    cfg.on_change(lambda old, new: calls.append((old, new)))
+    cfg.get()                                          # 初回の読み込みでは呼ばない
+    _write(ini, "[A]\nx = 1\n", 2_000_000_000)         # mtime だけ変わった
+    cfg.get()
+    _write(ini, "[A]\nx = 2\n", 3_000_000_000)
+    cfg.get()
+    assert calls == [((("x", "1"),), (("x", "2"),))]
+
+
+def test_failing_listener_does_not_break_get(tmp_path):
+    ini = tmp_path / "a.ini"
+    _write(ini, "[A]\nx = 1\n", 1_000_000_000)
+    cfg = ConfigFile(str(ini), _build)
+    cfg.on_change(lambda old, new: 1 / 0)
+    cfg.get()
+    _write(ini, "[A]\nx = 2\n", 2_000_000_000)
+    assert cfg.get() == (("x", "2"),)
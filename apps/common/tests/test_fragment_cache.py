@@ -0,0 +1,95 @@
+# apps/common/tests/test_fragment_cache.py
+"""
+描画済み HTML のキャッシュ（apps/common/fragment_cache.py）の確認。
+Redis は get / set / delete / scan_iter だけを持つ dict の代わりで試す。
+"""
+import fnmatch
+
+import pytest
+
+from apps.common import fragment_cache
+from apps.common.fragment_cache import FileSystemBackend, MemoryBackend, RedisBackend
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode("utf-8")
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match="*"):
+        return [k for k in self.data if fnmatch.fnmatch(k, match)]
+
+
+@pytest.fixture(params=["memory", "filesystem", "redis"])
+def backend(request, tmp_path, monkeypatch):
+    backend = {
+        "memory": lambda: MemoryBackend(),
+        "filesystem": lambda: FileSystemBackend(str(tmp_path)),
+        "redis": lambda: RedisBackend(FakeRedis()),
+    }[request.param]()
+    monkeypatch.setattr(fragment_cache, "_backend", backend)
+    return backend
+
+
+def _renderer(calls, html="<p>本文</p>"):
+    return lambda: calls.append(1) or html
+
+
+def test_same_version_is_rendered_once(backend):
+    calls = []
+    first = fragment_cache.render("amount", 1, version=("v1",), render=_renderer(calls))
+    second = fragment_cache.render("amount", 1, version=("v1",), render=_renderer(calls))
+    assert first == second == "<p>本文</p>"
+    assert hasattr(second, "__html__")  # テンプレートでエスケープされない
+    assert len(calls) == 1
+
+
+def test_new_version_renders_again(backend):
+    calls = []
+    fragment_cache.render("amount", 1, version=("v1",), render=_renderer(calls, "old"))
+    assert fragment_cache.render("amount", 1, version=("v2",), render=_renderer(calls, "new")) == "new"
+    assert fragment_cache.render("amount", 1, version=("v2",), render=_renderer(calls)) == "new"
+    assert len(calls) == 2
+
+
+def test_variants_share_an_entry_and_invalidate_together(backend):
+    calls = []
+    fragment_cache.render("amount", 1, version=("v1",), variant="estimate", render=_renderer(calls, "見積"))
+    fragment_cache.render("amount", 1, version=("v1",), variant="invoice", render=_renderer(calls, "請求"))
+    fragment_cache.render("amount", 2, version=("v1",), render=_renderer(calls))
+    assert fragment_cache.render("amount", 1, version=("v1",), variant="estimate", render=_renderer(calls)) == "見積"
+    assert len(calls) == 3
+
+    fragment_cache.invalidate("amount", 1)
+    fragment_cache.render("amount", 1, version=("v1",), variant="invoice", render=_renderer(calls))
+    fragment_cache.render("amount", 2, version=("v1",), render=_renderer(calls))
+    assert len(calls) == 4
+    assert backend.clear() == 2
+
+
+def test_memory_backend_evicts_least_recently_used():
+    lru = MemoryBackend(max_entries=2)
+    lru.set("a", {"version": "1", "fragments": {}})
+    lru.set("b", {"version": "1", "fragments": {}})
+    lru.get("a")
+    lru.set("c", {"version": "1", "fragments": {}})
+    assert lru.get("b") is None
+    assert lru.get("a") is not None and lru.get("c") is not None
+
+
+def test_backend_errors_fall_back_to_rendering(monkeypatch):
+    class Broken(MemoryBackend):
+        def get(self, key):
+            raise ConnectionError("down")
+
+    monkeypatch.setattr(fragment_cache, "_backend", Broken())
+    assert fragment_cache.render("amount", 1, version=("v1",), render=lambda: "ok") == "ok"
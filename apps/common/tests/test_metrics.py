@@ -0,0 +1,65 @@
+# apps/common/tests/test_metrics.py
+"""
+接続プールのメトリクス（apps/common/metrics.py の TimedQueuePool）の確認。
+prometheus_client が無くても動くよう、ゲージは set() の値を覚えるだけのものに差し替える。
+"""
+import sqlite3
+
+import pytest
+
+from apps.common import metrics
+
+
+class RecordingGauge:
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+
+@pytest.fixture()
+def gauges(monkeypatch):
+    size, checked_out = RecordingGauge(), RecordingGauge()
+    monkeypatch.setattr(metrics, "POOL_SIZE", size)
+    monkeypatch.setattr(metrics, "POOL_CHECKED_OUT", checked_out)
+    monkeypatch.setattr(metrics, "_POOL_SIZES", metrics.weakref.WeakKeyDictionary())
+    yield size, checked_out
+    metrics.set_pool_reporting(True)
+
+
+def _pool():
+    return metrics.TimedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=5)
+
+
+def test_recreated_pool_replaces_the_old_one(gauges):
+    size, _ = gauges
+    pool = _pool()
+    assert size.value == 5
+    new = pool.recreate()   # engine.dispose(close=False) と同じ
+    assert size.value == 5
+    assert new.size() == 5
+
+
+def test_disabled_process_reports_nothing(gauges):
+    size, checked_out = gauges
+    master_pool = _pool()
+    metrics.set_pool_reporting(False)       # gunicorn のマスター（when_ready）
+    assert size.value == 0
+    conn = master_pool.connect()
+    assert checked_out.value == 0
+    conn.close()
+
+    metrics.set_pool_reporting(True)        # ワーカー（post_fork）でプールを作り直す
+    worker_pool = master_pool.recreate()
+    assert size.value == 5
+    conn = worker_pool.connect()
+    assert checked_out.value == 1
+    conn.close()
+    assert checked_out.value == 0
@@ -0,0 +1,54 @@
+# apps/common/tests/test_pagination.py
+"""
+キーセットページングのカーソル（apps/common/pagination.py の encode_cursor / decode_cursor）の確認。
+"""
+import base64
+import json
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import Column, Date, DateTime, Integer, String
+
+from apps.common.pagination import decode_cursor, encode_cursor
+
+CREATED_AT = Column("created_at", DateTime)
+ISSUED_ON = Column("issued_on", Date)
+TOTAL = Column("grand_total", Integer)
+NAME = Column("name", String(255))
+
+
+def _raw(obj):
+    return base64.urlsafe_b64encode(json.dumps(obj).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("value, column", [
+    (datetime(2026, 4, 1, 9, 30), CREATED_AT),
+    (date(2026, 4, 1), ISSUED_ON),
+    (104790, TOTAL),
+    ("甲野売買", NAME),
+])
+def test_round_trip(value, column):
+    assert decode_cursor(encode_cursor(value, 7), column) == (value, 7)
+
+
+@pytest.mark.parametrize("obj, column", [
+    ([[1, 2], 3], CREATED_AT),              # 配列
+    ([{"x": 1}, 3], CREATED_AT),            # dt / d の無いオブジェクト
+    ([{"d": "2026-04-01"}, 3], CREATED_AT),  # 日時の列に日付
+    ([{"dt": "2026-04-01T00:00:00"}, 3], ISSUED_ON),
+    (["100", 3], TOTAL),                    # 数値の列に文字列
+    ([True, 3], TOTAL),
+    ([None, 3], NAME),
+    ([1, 3], NAME),
+    (["a", "3"], NAME),                     # id が数値でない
+    ({"a": 1, "b": 2}, NAME),
+    ([1, 2, 3], TOTAL),
+    ([{"dt": 5}, 3], CREATED_AT),
+])
+def test_rejects_values_that_do_not_fit_the_sort_column(obj, column):
+    assert decode_cursor(_raw(obj), column) is None
+
+
+def test_broken_cursor_is_ignored():
+    assert decode_cursor("not base64 !!", NAME) is None
+    assert decode_cursor(None) is None
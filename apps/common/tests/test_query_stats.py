@@ -0,0 +1,41 @@
+# apps/common/tests/test_query_stats.py
+"""
+SQL 計測（apps/common/query_stats.py）の確認。DB は SQLite のメモリ上で代用する。
+"""
+import pytest
+from sqlalchemy import create_engine, text
+
+from apps.common.query_stats import assert_max_queries, count_queries, fingerprint
+
+
+@pytest.fixture()
+def conn():
+    engine = create_engine("sqlite://")
+    with engine.connect() as c:
+        c.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)"))
+        yield c
+
+
+def test_fingerprint_ignores_literals_and_in_lists():
+    a = fingerprint("SELECT *  FROM t\n WHERE id = 1 AND name = 'a' AND x IN (1, 2, 3)")
+    b = fingerprint("SELECT * FROM t WHERE id = 42 AND name = 'b''c' AND x IN (7)")
+    assert a == b == "SELECT * FROM t WHERE id = ? AND name = ? AND x IN (?)"
+
+
+def test_count_queries_groups_repeated_statements(conn):
+    with count_queries() as stats:
+        for i in range(6):
+            conn.execute(text("SELECT name FROM t WHERE id = :id"), {"id": i})
+        conn.execute(text("SELECT count(*) FROM t"))
+    assert stats.count == 7
+    assert stats.repeated(5) == [("SELECT name FROM t WHERE id = ?", 6)]
+
+
+def test_assert_max_queries(conn):
+    with assert_max_queries(2):
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+    with pytest.raises(AssertionError, match="expected <= 1 queries, got 2"):
+        with assert_max_queries(1):
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
@@ -0,0 +1,43 @@
+# apps/common/tests/test_schema_check.py
+"""
+create_app() 後の db.metadata（flask schema-check・alembic autogenerate の比較元）の確認。
+他のテストがモデルを import 済みだと見逃すので、別プロセスで create_app() する。
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+VERSIONS = os.path.join(ROOT, "migrations", "versions")
+
+# 0001（db.create_all() で作った既存 DB の取り込み）で前提にしているテーブル
+BASELINE_TABLES = {
+    "entrusted_book", "client", "client_book_profile", "corporate_profile",
+    "amount_document", "required_document", "delivery_document", "origin_document",
+}
+
+
+def _migrated_tables():
+    tables = set(BASELINE_TABLES)
+    for name in os.listdir(VERSIONS):
+        if name.endswith(".py"):
+            with open(os.path.join(VERSIONS, name), encoding="utf-8") as f:
+                tables.update(re.findall(r'op\.create_table\(\s*"(\w+)"', f.read()))
+    return tables
+
+
+def _metadata_tables_after_create_app():
+    code = ("import json; from apps import create_app; from db import db; "
+            "create_app(); print(json.dumps(sorted(db.metadata.tables)))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return set(json.loads(out.strip().splitlines()[-1]))
+
+
+def test_create_app_registers_every_migrated_table():
+    migrated = _migrated_tables()
+    assert {"parsed_registry", "officer_term", "document_index", "amount_document_item"} <= migrated
+    missing = migrated - _metadata_tables_after_create_app()
+    assert not missing, f"create_app() で読み込まれないモデル: {sorted(missing)}"
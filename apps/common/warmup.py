@@ -0,0 +1,86 @@
+# apps/common/warmup.py
+"""
+起動時のウォームアップ（任意）。
+
+最初のリクエストで払っていた「初回だけ重い」処理を先に済ませる:
+- 登記簿の解析器など、正規表現を多く持つモジュールの import（モジュール末尾で re.compile 済みになる）
+- 各 config.ini の読み込み（config_service に登録された loader を一度呼ぶ）
+- PDF ライブラリ（PyPDF2 / pdfminer / pdfplumber）の import
+
+settings.WARMUP（環境変数 WARMUP=1）で create_app の最後に実行する。gunicorn の preload_app と併用すると
+マスターで1回だけ行い、ワーカーは fork 後に copy-on-write で共有する。
+flask warmup で各項目の所要時間を確認できる。
+"""
+from __future__ import annotations
+import importlib
+import logging
+import time
+from typing import Dict
+
+import click
+from flask import Flask
+from werkzeug.utils import import_string
+
+logger = logging.getLogger(__name__)
+
+# 解析器・サービス（import だけで正規表現のコンパイルまで終わる）
+MODULES = (
+    "apps.register.commerce.pdf.services.store",
+    "apps.register.commerce.pdf.services.profile_sync",
+    "apps.register.commerce.pdf.services.debug_utils",
+    "apps.shared.jp_amount",
+    "apps.shared.wareki",
+    "apps.shared.kana",
+)
+
+# config.ini の loader（引数なしで呼べるもの。apps/common/config_service.py に登録される）
+CONFIG_LOADERS = (
+    "apps.common.office_config:office_config",
+    "apps.common.office_config:tax_rates",
+    "apps.documents.amount.config_loader:load_config",
+    "apps.documents.delivery.config_loader:load_paragraphs",
+    "apps.documents.required.config_loader:load_paragraphs",
+    "apps.documents.origin.config_loader:load_templates",
+    "apps.register.commerce.config_loader:load_term_years",
+)
+
+# PDF の抽出ライブラリ（入っていないものは飛ばす）
+PDF_BACKENDS = ("PyPDF2", "pdfminer.high_level", "pdfplumber")
+
+
+def warm_up(app: Flask) -> Dict[str, float]:
+    """ウォームアップを実行し、項目ごとの所要時間（秒）を返す。失敗した項目はログに出して続ける。"""
+    timings: Dict[str, float] = {}
+
+    def run(name: str, fn) -> None:
+        start = time.perf_counter()
+        try:
+            fn()
+        except ImportError:
+            logger.info("warm-up skipped (not installed): %s", name)
+            return
+        except Exception:
+            logger.exception("warm-up failed: %s", name)
+            return
+        timings[name] = time.perf_counter() - start
+
+    with app.app_context():
+        for name in MODULES:
+            run(name, lambda n=name: importlib.import_module(n))
+        for path in CONFIG_LOADERS:
+            run(path, lambda p=path: import_string(p)())
+        for name in PDF_BACKENDS:
+            run(name, lambda n=name: importlib.import_module(n))
+
+    logger.info("warm-up done: %d items, %.3f s", len(timings), sum(timings.values()))
+    return timings
+
+
+def register_warmup(app: Flask) -> None:
+    @app.cli.command("warmup")
+    def warmup_command() -> None:
+        """ウォームアップを実行して項目ごとの所要時間を表示する。"""
+        timings = warm_up(app)
+        for name, sec in sorted(timings.items(), key=lambda kv: -kv[1]):
+            click.echo(f"{sec * 1000:9.1f} ms  {name}")
+        click.echo(f"{sum(timings.values()) * 1000:9.1f} ms  total")
@@ -0,0 +1,133 @@
+# apps/documents/amount/batch_calculator.py
+"""
+複数の AmountDocument の金額をまとめて計算する（NumPy）。
+
+AmountDocumentCalculator（1件ずつ・Python のリスト）と同じ計算を N 件分の配列で1回に行う。
+一覧の合計欄や月次の集計で使う。結果は AmountDocumentCalculator.calculate_totals と一致する
+（金額は int64、税額は float64 で掛けてから 0 方向へ切り捨て = Python の int() と同じ）。
+
+    rates = TaxRates.current()
+    totals = calculate_documents(documents, rates, round_unit=100)
+    totals.grand_total        # shape (N,) の配列
+    totals.row(0)             # {"subtotal": ..., "grand_total": ...}（calculate_totals と同じ形）
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from apps.documents.amount.calculator import TaxRates
+
+AmountRows = Union[np.ndarray, Sequence[Sequence[Optional[int]]]]
+
+FIELDS = ("subtotal", "reward", "expense", "tax", "withholding", "grand_total")
+
+
+@dataclass(frozen=True)
+class BatchTotals:
+    """N 件分の集計（各項目 shape (N,) の int64 配列）。"""
+    subtotal: np.ndarray
+    reward: np.ndarray
+    expense: np.ndarray
+    tax: np.ndarray
+    withholding: np.ndarray
+    grand_total: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.grand_total)
+
+    def row(self, i: int) -> Dict[str, int]:
+        """i 件目を calculate_totals と同じ dict で返す。"""
+        return {name: int(getattr(self, name)[i]) for name in FIELDS}
+
+    def rows(self) -> list[Dict[str, int]]:
+        return [self.row(i) for i in range(len(self))]
+
+    def sum(self) -> Dict[str, int]:
+        """全件の合計（項目ごと）。"""
+        return {name: int(getattr(self, name).sum()) for name in FIELDS}
+
+
+# =========================
+# 入力の整形
+# =========================
+def pad_amounts(rows: AmountRows) -> np.ndarray:
+    """
+    書類ごとの金額リスト（長さはばらばら・None 可）を 0 埋めした (N, M) の int64 配列にする。
+    すでに 2 次元配列ならそのまま（int64 に揃えるだけ）。
+    """
+    if isinstance(rows, np.ndarray):
+        arr = rows.astype(np.int64, copy=False)
+        return arr[:, np.newaxis] if arr.ndim == 1 else arr   # 1 次元は「1件1金額」とみなす
+    rows = list(rows)
+    width = max((len(r or ()) for r in rows), default=0)
+    out = np.zeros((len(rows), width), dtype=np.int64)
+    for i, r in enumerate(rows):
+        if r:
+            out[i, :len(r)] = [x or 0 for x in r]
+    return out
+
+
+# =========================
+# 計算
+# =========================
+def calculate_batch(
+        reward_amounts: AmountRows,
+        expense_amounts: AmountRows,
+        apply_consumption_tax: Union[np.ndarray, Sequence[bool]],
+        apply_withholding: Union[np.ndarray, Sequence[bool]],
+        rates: TaxRates,
+        *,
+        round_unit: Optional[int] = None,
+) -> BatchTotals:
+    """
+    N 件分の報酬・実費（(N, M) の配列または長さばらばらのリスト）と、書類ごとの課税フラグから
+    小計・消費税・源泉徴収・合計を一括で計算する。round_unit（例: 100）で合計を切り捨てる。
+    """
+    rewards = pad_amounts(reward_amounts)
+    expenses = pad_amounts(expense_amounts)
+    n = len(rewards)
+    if len(expenses) != n:
+        raise ValueError(f"reward_amounts と expense_amounts の件数が違います: {n} != {len(expenses)}")
+    consumption = np.asarray(apply_consumption_tax, dtype=bool).reshape(n)
+    withholding_on = np.asarray(apply_withholding, dtype=bool).reshape(n)
+
+    reward = rewards.sum(axis=1, dtype=np.int64)
+    expense = expenses.sum(axis=1, dtype=np.int64)
+    subtotal = reward + expense
+
+    # int(x * rate) と同じく float64 で掛けて 0 方向へ切り捨て
+    tax = np.where(
+        consumption,
+        np.trunc(reward * rates.consumption_tax).astype(np.int64),
+        0,
+    )
+    taxable = np.maximum(0, reward - rates.withholding_exemption)
+    withholding = np.where(
+        withholding_on,
+        np.trunc(taxable * rates.withholding_tax).astype(np.int64),
+        0,
+    )
+
+    grand_total = subtotal + tax - withholding
+    if round_unit and round_unit > 1:
+        grand_total = (grand_total // round_unit) * round_unit  # 切り捨て（Python の // と同じ床関数）
+
+    return BatchTotals(
+        subtotal=subtotal, reward=reward, expense=expense,
+        tax=tax, withholding=withholding, grand_total=grand_total,
+    )
+
+
+def calculate_documents(documents: Iterable, rates: TaxRates, *, round_unit: Optional[int] = None) -> BatchTotals:
+    """AmountDocument の並び（一覧の1ページ分など）をまとめて計算する。"""
+    documents = list(documents)
+    return calculate_batch(
+        [d.reward_amounts or [] for d in documents],
+        [d.expense_amounts or [] for d in documents],
+        [bool(d.apply_consumption_tax) for d in documents],
+        [bool(d.apply_withholding) for d in documents],
+        rates,
+        round_unit=round_unit,
+    )
@@ -1,5 +1,29 @@
 # apps/amount/calculator.py
-from typing import List, Dict, Final, Union, Iterable
+from dataclasses import dataclass
+from typing import List, Dict, Final, Mapping, Optional, Union, Iterable
+
+from apps.common.office_config import tax_rates
+
+
+@dataclass(frozen=True)
+class TaxRates:
+    """計算に使う税率。複数書類をまとめて計算するとき（batch_calculator）は明示的に渡す。"""
+    consumption_tax: float        # 消費税率
+    withholding_exemption: int    # 源泉徴収の控除額
+    withholding_tax: float        # 源泉徴収税率
+
+    @classmethod
+    def from_mapping(cls, tax: Mapping[str, Union[int, float]]) -> "TaxRates":
+        return cls(
+            consumption_tax=tax["consumption_tax"],
+            withholding_exemption=tax["withholding_exemption"],
+            withholding_tax=tax["withholding_tax"],
+        )
+
+    @classmethod
+    def current(cls) -> "TaxRates":
+        """config/tax.ini の現在の値（書き換えると再起動なしで反映）。"""
+        return cls.from_mapping(tax_rates())
 
 
 class AmountDocumentCalculator:
@@ -9,13 +33,13 @@ class AmountDocumentCalculator:
             expense_amounts: list[int],  # 経費
             apply_consumption_tax: bool,
             apply_withholding: bool,
+            rates: Optional[TaxRates] = None,  # 省略時は config/tax.ini
     ) -> None:
-        from flask import current_app
-        tax = current_app.config["TAX_RATE"]
+        rates = rates or TaxRates.current()
 
-        self.consumption_tax_rate: float = tax["consumption_tax"]
-        self.withholding_exemption_amount: int = tax["withholding_exemption"]
-        self.withholding_tax_rate: float = tax["withholding_tax"]
+        self.consumption_tax_rate: float = rates.consumption_tax
+        self.withholding_exemption_amount: int = rates.withholding_exemption
+        self.withholding_tax_rate: float = rates.withholding_tax
 
         # None を 0 に変換したいならここで吸収
         self.reward_amounts = [x or 0 for x in reward_amounts]
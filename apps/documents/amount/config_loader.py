@@ -2,10 +2,11 @@
 import configparser
 import re
 import os
-from functools import lru_cache
-from configparser import ConfigParser
-from typing import Dict, List, Tuple, Union, TYPE_CHECKING
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple, Union, TYPE_CHECKING
 from apps.client.models import ClientType
+from apps.common.config_service import register_config, ini_text
 from apps.documents.amount.constants import MIN_ENTRIES
 
 if TYPE_CHECKING:
@@ -14,15 +15,35 @@ if TYPE_CHECKING:
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.ini")
 
 
-# ===== 基本ユーティリティ =====
-@lru_cache(maxsize=1) # 同じ引数で呼ばれた関数の結果をキャッシュする
-def _get_config_parser() -> configparser.ConfigParser:
-    """config.ini を読み込んだ ConfigParser を（プロセス内で）一度だけ返す。"""
-    parser = configparser.ConfigParser()
-    parser.read(CONFIG_FILE, encoding="utf-8")
-    return parser
+@dataclass(frozen=True)
+class DefaultEntries:
+    """見積の既定行（3配列とも MIN_ENTRIES 行にパディング済み）。"""
+    item_types: Tuple[str, ...]
+    reward_amounts: Tuple[int, ...]
+    expense_amounts: Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class AmountConfig:
+    default_entries: Mapping[ClientType, DefaultEntries]
+    note_defaults: Mapping[str, str]   # {ESTIMATE / INVOICE / RECEIPT: 備考の初期値}
+
+
+_SECTION_MAP = {
+    ClientType.RIGHT_HOLDER: "DEFAULT_ENTRIES_RIGHT_HOLDER",
+    ClientType.OBLIGATION_HOLDER: "DEFAULT_ENTRIES_OBLIGATION_HOLDER",
+    ClientType.APPLICANT: "DEFAULT_ENTRIES_APPLICANT",
+}
+
+# クライアント種別 → NOTE_DEFAULTS のキー
+_NOTE_KEY_MAP = {
+    ClientType.RIGHT_HOLDER: "ESTIMATE",
+    ClientType.OBLIGATION_HOLDER: "INVOICE",
+    ClientType.APPLICANT: "RECEIPT",
+}
 
 
+# ===== 基本ユーティリティ =====
 def _safe_int(value: Union[str, int, None]) -> int:
     """安全に int へ変換。失敗時は 0。"""
     try:
@@ -43,49 +64,65 @@ def natural_key(key: str) -> Tuple[str, int]:
     return key, 0
 
 
+# ===== 読み込み（ini が変わったときだけ実行される） =====
+def _build_default_entries(values) -> DefaultEntries:
+    """
+    '名称,報酬,実費' の CSV 形式の文字列リストから 3 配列を生成。
+    不足フィールドは "" / 0 とし、MIN_ENTRIES 行まで "" / 0 で埋める。
+    """
+    item_types = []
+    reward_amounts = []
+    expense_amounts = []
+
+    for raw in values:
+        parts = [p.strip() for p in (raw or "").split(",")]
+        item_types.append(parts[0] if len(parts) > 0 else "")
+        reward_amounts.append(_safe_int(parts[1]) if len(parts) > 1 else 0)
+        expense_amounts.append(_safe_int(parts[2]) if len(parts) > 2 else 0)
+
+    pad = max(0, MIN_ENTRIES - len(item_types))
+    return DefaultEntries(
+        item_types=tuple(item_types) + ("",) * pad,
+        reward_amounts=tuple(reward_amounts) + (0,) * pad,
+        expense_amounts=tuple(expense_amounts) + (0,) * pad,
+    )
+
+
+def _build(parser: configparser.ConfigParser) -> AmountConfig:
+    entries: Dict[ClientType, DefaultEntries] = {}
+    for client_type, section_name in _SECTION_MAP.items():
+        values = []
+        if parser.has_section(section_name):
+            # キー(entry1, entry2, …)を自然順に並べ替えて値を取り出す
+            sec = parser[section_name]
+            values = [sec[k] for k in sorted(sec, key=natural_key)]
+        entries[client_type] = _build_default_entries(values)
+
+    notes = {}
+    if parser.has_section("NOTE_DEFAULTS"):
+        # \n を実際の改行に変換
+        notes = {k.upper(): ini_text(v) for k, v in parser["NOTE_DEFAULTS"].items()}
+
+    return AmountConfig(default_entries=MappingProxyType(entries), note_defaults=MappingProxyType(notes))
+
+
+_config = register_config("amount", CONFIG_FILE, _build)
+_EMPTY_ENTRIES = _build_default_entries([])
+
+
 # ===== 公開 API =====
-def load_config() -> Dict[str, Union[Dict[str, str], Dict[str, float]]]:
-    """主要な設定値を辞書形式で返す。"""
-    parser = _get_config_parser()
-    return {
-        "OFFICE": dict(parser["OFFICE"]) if parser.has_section("OFFICE") else {},
-        "BANK": dict(parser["BANK"]) if parser.has_section("BANK") else {},
-        "TAX_RATE": {
-            "consumption_tax": float(parser.get("TAX_RATE", "consumption_tax", fallback="0")),
-            "withholding_exemption": int(parser.get("TAX_RATE", "withholding_exemption", fallback="0")),
-            "withholding_tax": float(parser.get("TAX_RATE", "withholding_tax", fallback="0")),
-        },
-    }
-
-
-def get_default_entries_for_client_type(client_type: ClientType) -> Dict[str, List[Union[str, int]]]:
+def load_config() -> AmountConfig:
+    """解析済みの設定（読み取り専用・共有）を返す。"""
+    return _config.get()
+
+
+def get_default_entries_for_client_type(client_type: ClientType) -> DefaultEntries:
     """
     クライアント種別（権利者・義務者・申請人）に応じた
-    [item_types, reward_amounts, expense_amounts] のデフォルト行を返す。
-    MIN_ENTRIES に満たない分は "" / 0 で埋める。
+    item_types / reward_amounts / expense_amounts のデフォルト行を返す。
+    MIN_ENTRIES に満たない分は "" / 0 で埋めてある。
     """
-    section_map = {
-        ClientType.RIGHT_HOLDER: "DEFAULT_ENTRIES_RIGHT_HOLDER",
-        ClientType.OBLIGATION_HOLDER: "DEFAULT_ENTRIES_OBLIGATION_HOLDER",
-        ClientType.APPLICANT: "DEFAULT_ENTRIES_APPLICANT",
-    }
-    section_name = section_map.get(client_type)
-
-    parser: ConfigParser = _get_config_parser()
-    entries: Dict[str, List[Union[str, int]]]
-
-    if section_name and parser.has_section(section_name):
-        # キー(entry1, entry2, …)を自然順に並べ替えて値を取り出す
-        values = [parser[section_name][k] for k in sorted(parser[section_name], key=natural_key)]
-        entries = _build_default_entries(values)
-    else:
-        entries = {"item_types": [], "reward_amounts": [], "expense_amounts": []}
-
-    # パディング
-    for key in ("item_types", "reward_amounts", "expense_amounts"):
-        while len(entries[key]) < MIN_ENTRIES:
-            entries[key].append("" if key == "item_types" else 0)
-    return entries
+    return load_config().default_entries.get(client_type, _EMPTY_ENTRIES)
 
 
 def get_note_default_for_client_type(client_type: ClientType) -> str:
@@ -95,54 +132,16 @@ def get_note_default_for_client_type(client_type: ClientType) -> str:
     - ClientType.OBLIGATION_HOLDER → INVOICE
     - ClientType.APPLICANT → RECEIPT
     """
-    section_map = {
-        ClientType.RIGHT_HOLDER: "ESTIMATE",
-        ClientType.OBLIGATION_HOLDER: "INVOICE",
-        ClientType.APPLICANT: "RECEIPT",
-    }
-
-    parser = _get_config_parser()
-    if not parser.has_section("NOTE_DEFAULTS"):
-        return ""
-
-    key = section_map.get(client_type)
+    key = _NOTE_KEY_MAP.get(client_type)
     if not key:
         return ""
+    return load_config().note_defaults.get(key, "")
 
-    # \n を実際の改行に変換
-    return parser["NOTE_DEFAULTS"].get(key, "").replace("\\n", "\n")
 
 def get_note_default_by_document_type(doc_type: "AmountDocumentType") -> str:
     """
     AmountDocumentType（例: ESTIMATE / INVOICE / RECEIPT）に対応する備考の初期値を返す。
     未定義なら空文字。
     """
-    parser = _get_config_parser()
-    if not parser.has_section("NOTE_DEFAULTS"):
-        return ""
-    # Enum.name をそのまま使い、\n を実改行に
-    raw = parser["NOTE_DEFAULTS"].get(getattr(doc_type, "name", ""), "")
-    return raw.replace("\\n", "\n")
-
-
-# ===== 内部処理 =====
-def _build_default_entries(values: List[str]) -> Dict[str, List[Union[str, int]]]:
-    """
-    '名称,報酬,実費' の CSV 形式の文字列リストから 3 配列を生成。
-    不足フィールドは "" / 0 とする。
-    """
-    item_types: List[str] = []
-    reward_amounts: List[int] = []
-    expense_amounts: List[int] = []
-
-    for raw in values:
-        parts = [p.strip() for p in (raw or "").split(",")]
-        item_types.append(parts[0] if len(parts) > 0 else "")
-        reward_amounts.append(_safe_int(parts[1]) if len(parts) > 1 else 0)
-        expense_amounts.append(_safe_int(parts[2]) if len(parts) > 2 else 0)
-
-    return {
-        "item_types": item_types,
-        "reward_amounts": reward_amounts,
-        "expense_amounts": expense_amounts,
-    }
\ No newline at end of file
+    # Enum.name をそのまま使う
+    return load_config().note_defaults.get(getattr(doc_type, "name", ""), "")
@@ -1,10 +1,53 @@
 ### apps/document/amount/models.py
 from datetime import datetime
 from db import db
-from sqlalchemy import text
-from sqlalchemy.dialects.postgresql import JSONB
-from typing import Dict
-# from apps.amount.calculator import AmountDocumentCalculator
+from sqlalchemy import Computed, Index, text, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from apps.common.fulltext import text_expr, tsv_expr, search_indexes
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session
+from typing import Dict, Iterator, List, Optional, Tuple
+from apps.documents.amount.calculator import AmountDocumentCalculator, TaxRates
+
+# 保存する集計列 → calculate_totals のキー
+TOTAL_COLUMNS = {
+    "reward_total": "reward",
+    "expense_total": "expense",
+    "tax_total": "tax",
+    "withholding_total": "withholding",
+    "grand_total": "grand_total",
+}
+TOTALS_ROUND_UNIT = 100  # 合計は100円未満切り捨て（詳細画面と同じ）
+# これらが変わったら集計列を計算し直す（明細の追加・削除は items の変更として見える）
+TOTALS_INPUTS = ("items", "apply_consumption_tax", "apply_withholding")
+
+
+class AmountDocumentItem(db.Model):
+    """
+    見積・請求の明細1行。空行（項目なし・金額0）は保存しない。
+    position はフォーム上の行番号（0始まり）。詳細画面は行番号で「手続の代理」「その他費用」の欄を分けるので、
+    空行を詰めずに元の番号のまま持つ。
+    """
+    __tablename__ = "amount_document_item"
+
+    id = db.Column(db.Integer, primary_key=True)
+    amount_document_id = db.Column(db.Integer, db.ForeignKey("amount_document.id", ondelete="CASCADE"),
+                                   nullable=False)
+    position = db.Column(db.Integer, nullable=False)
+    item_type = db.Column(db.String(255), nullable=False, default="", server_default=text("''"))
+    reward_amount = db.Column(db.Integer, nullable=False, default=0, server_default=text("0"))
+    expense_amount = db.Column(db.Integer, nullable=False, default=0, server_default=text("0"))
+
+    document = db.relationship("AmountDocument", back_populates="items")
+
+    __table_args__ = (
+        db.UniqueConstraint("amount_document_id", "position", name="uq_amount_document_item_position"),
+        # 項目名での集計・検索（「抵当権抹消登記申請代理を請求した案件」など）
+        Index("ix_amount_document_item_item_type", "item_type", "amount_document_id"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<AmountDocumentItem document_id={self.amount_document_id} position={self.position}>"
 
 
 class AmountDocument(db.Model):
@@ -17,21 +60,54 @@ class AmountDocument(db.Model):
     apply_withholding     = db.Column(db.Boolean, nullable=False,
                                       default=False, server_default=text("false"))
     advance_payment = db.Column(db.Integer, nullable=True)
-    item_types      = db.Column(JSONB, nullable=False,
-                                default=list, server_default=text("'[]'::jsonb"))
-    reward_amounts  = db.Column(JSONB, nullable=False,
-                                default=list, server_default=text("'[]'::jsonb"))
-    expense_amounts = db.Column(JSONB, nullable=False,
-                                default=list, server_default=text("'[]'::jsonb"))
     note = db.Column(db.Text, nullable=True)
     estimate_date = db.Column(db.Date, nullable=True)
     invoice_date = db.Column(db.Date, nullable=True)
     receipt_date = db.Column(db.Date, nullable=True)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # 行の版（詳細画面の HTML キャッシュのキー。apps/common/fragment_cache.py）
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow,
+                           onupdate=datetime.utcnow, server_default=func.now())
+
+    # 金額の集計（書き込み時に計算して保存。一覧の並び替え・絞り込み・合計は明細を読まずにこれを使う）
+    # 税率（config/tax.ini）を変えたら flask amount recalc-totals --tax-only
+    reward_total      = db.Column(db.Integer, nullable=False, default=0, server_default=text("0"))
+    expense_total     = db.Column(db.Integer, nullable=False, default=0, server_default=text("0"))
+    tax_total         = db.Column(db.Integer, nullable=False, default=0, server_default=text("0"))
+    withholding_total = db.Column(db.Integer, nullable=False, default=0, server_default=text("0"))
+    grand_total       = db.Column(db.Integer, nullable=False, default=0, server_default=text("0"))
 
     client_id = db.Column(db.Integer, db.ForeignKey("client.id"), nullable=False)
     client = db.relationship("Client", back_populates="amount_documents")
 
+    # 明細（空行以外。項目・報酬・実費の配列は item_types / reward_amounts / expense_amounts で読む）
+    items = db.relationship(
+        "AmountDocumentItem", back_populates="document", order_by="AmountDocumentItem.position",
+        cascade="all, delete-orphan", passive_deletes=True,
+    )
+
+    # 検索用の生成列（apps/common/fulltext.py・検索は apps/search）
+    search_text = db.Column(db.Text, Computed(text_expr("entrusted_book_name"), persisted=True))
+    search_tsv  = db.Column(TSVECTOR, Computed(tsv_expr("entrusted_book_name"), persisted=True))
+
+    # 一覧のキーセットページング用（(created_at, id) で並べて続きから読む）
+    # •	全件一覧 → ix_amount_document_created_id
+    # •	client_id で絞った一覧 → ix_amount_document_client_created_id
+    __table_args__ = (
+        Index("ix_amount_document_created_id", "created_at", "id"),
+        Index("ix_amount_document_client_created_id", "client_id", "created_at", "id"),
+        # 合計金額での並び替え（キーセットページング）
+        Index("ix_amount_document_grand_total_id", "grand_total", "id"),
+        # 部分インデックス（絞り込みの定番だけを小さく持つ）
+        # •	未請求（請求日なし） → ix_amount_document_uninvoiced
+        # •	請求済み・未入金   → ix_amount_document_unreceived（請求日順）
+        Index("ix_amount_document_uninvoiced", "client_id", "created_at",
+              postgresql_where=text("invoice_date IS NULL")),
+        Index("ix_amount_document_unreceived", "invoice_date",
+              postgresql_where=text("invoice_date IS NOT NULL AND receipt_date IS NULL")),
+        *search_indexes("amount_document"),
+    )
+
     def set_items_normalized(
             self,
             item_types_list: list[str],
@@ -39,9 +115,11 @@ class AmountDocument(db.Model):
             expense_list: list[int],
     ) -> None:
         """
-        項目・報酬・実費の3配列を同じ長さに正規化して保存する。
-        - 未入力は "" / 0 で埋める
-        - None は 0/"" に変換
+        項目・報酬・実費の3配列を行ごとの明細（AmountDocumentItem）にして保存する。
+        - None は ""/0 に変換、長さの違う配列は ""/0 で揃える
+        - 空行（項目なし・金額0）は保存しない
+        - 同じ行番号の既存明細は作り直さずに更新する（INSERT / DELETE は増えた・消えた行だけ。
+          新しい行の INSERT は flush 時にまとめて1文で送られる）
         """
         item_types = [s if s is not None else "" for s in (item_types_list or [])]
         rewards = [int(x or 0) for x in (reward_list or [])]
@@ -52,22 +130,72 @@ class AmountDocument(db.Model):
         rewards.extend([0] * (max_len - len(rewards)))
         expenses.extend([0] * (max_len - len(expenses)))
 
-        self.item_types = item_types
-        self.reward_amounts = rewards
-        self.expense_amounts = expenses
+        existing = {item.position: item for item in self.items}
+        items: List[AmountDocumentItem] = []
+        for position, (item_type, reward, expense) in enumerate(zip(item_types, rewards, expenses)):
+            if not item_type and not reward and not expense:
+                continue
+            item = existing.get(position) or AmountDocumentItem(position=position)
+            item.item_type = item_type
+            item.reward_amount = reward
+            item.expense_amount = expense
+            items.append(item)
+        self.items = items  # 消えた行は delete-orphan で DELETE
+        self.recalculate_totals()
+
+    # ---- 明細を3配列として読む（空行は ""/0。長さは最後の明細の行番号 + 1） ----
+    def _columns(self) -> Tuple[List[str], List[int], List[int]]:
+        size = max((item.position for item in self.items), default=-1) + 1
+        item_types, rewards, expenses = [""] * size, [0] * size, [0] * size
+        for item in self.items:
+            item_types[item.position] = item.item_type
+            rewards[item.position] = item.reward_amount
+            expenses[item.position] = item.expense_amount
+        return item_types, rewards, expenses
+
+    @property
+    def item_types(self) -> List[str]:
+        return self._columns()[0]
+
+    @property
+    def reward_amounts(self) -> List[int]:
+        return self._columns()[1]
+
+    @property
+    def expense_amounts(self) -> List[int]:
+        return self._columns()[2]
+
+    def compute_totals(self, rates: Optional[TaxRates] = None) -> Dict[str, int]:
+        """明細と課税フラグから集計を計算する（保存はしない）。"""
+        apply_tax = True if self.apply_consumption_tax is None else self.apply_consumption_tax  # 列の既定値
+        return AmountDocumentCalculator(
+            reward_amounts=[item.reward_amount for item in self.items],
+            expense_amounts=[item.expense_amount for item in self.items],
+            apply_consumption_tax=bool(apply_tax),
+            apply_withholding=bool(self.apply_withholding),
+            rates=rates,
+        ).calculate_totals(round_unit=TOTALS_ROUND_UNIT)
+
+    def recalculate_totals(self, rates: Optional[TaxRates] = None) -> bool:
+        """集計列を計算し直す。値が変わったら True。"""
+        totals = self.compute_totals(rates)
+        changed = False
+        for column, key in TOTAL_COLUMNS.items():
+            if getattr(self, column) != totals[key]:
+                setattr(self, column, totals[key])
+                changed = True
+        return changed
 
     def get_items(self) -> Dict[str, list]:
+        item_types, rewards, expenses = self._columns()
         return {
-            "item_types": self.item_types or [],
-            "reward_amounts": self.reward_amounts or [],
-            "expense_amounts": self.expense_amounts or [],
+            "item_types": item_types,
+            "reward_amounts": rewards,
+            "expense_amounts": expenses,
         }
 
-    def iter_items(self):
-        a = self.item_types or []
-        b = self.reward_amounts or []
-        c = self.expense_amounts or []
-        return zip(a, b, c)
+    def iter_items(self) -> Iterator[Tuple[str, int, int]]:
+        return zip(*self._columns())
 
     @staticmethod
     def format_number(value: int) -> str:
@@ -76,3 +204,25 @@ class AmountDocument(db.Model):
 
     def __repr__(self):
         return f"<AmountDocument id={self.id} client_id={self.client_id} created_at={self.created_at}>"
+
+
+@event.listens_for(Session, "before_flush")
+def _refresh_totals(session, flush_context, instances) -> None:
+    """
+    課税フラグだけを変えた更新や、明細を直接書き換えた場合も含め、flush 前に集計列を揃える。
+    明細だけが変わった書類も updated_at を進める（集計が変わらないと書類の行は UPDATE されないため）。
+    """
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, AmountDocumentItem):
+            if obj.document is not None:
+                obj.document.recalculate_totals()
+                if obj.document not in session.new:
+                    obj.document.updated_at = datetime.utcnow()
+            continue
+        if not isinstance(obj, AmountDocument):
+            continue
+        state = sa_inspect(obj)
+        if obj in session.new or any(state.attrs[name].history.has_changes() for name in TOTALS_INPUTS):
+            obj.recalculate_totals()
+        if obj not in session.new and state.attrs.items.history.has_changes():
+            obj.updated_at = datetime.utcnow()
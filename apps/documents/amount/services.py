@@ -0,0 +1,147 @@
+# apps/documents/amount/services.py
+"""
+AmountDocument の集計列（reward_total / expense_total / tax_total / withholding_total / grand_total）の作り直し。
+
+書き込み時は models.py（set_items_normalized と before_flush）で揃えるので、ここを使うのは
+- 列を追加した直後（migrations 0005 の後）… recalculate_totals()（明細の合計は SQL で取る）
+- 税率（config/tax.ini）を変えたとき      … refresh_tax_totals()（保存済みの報酬・実費の合計から SQL 1文で）
+  tax.ini を書き換えたら flask amount recalc-totals --tax-only で流す（表全体の UPDATE なので
+  リクエストの中では流さない。稼働中に読み直したワーカーは _warn_on_tax_change でログに出すだけ）
+"""
+from __future__ import annotations
+import logging
+from typing import Any, Mapping, Optional
+
+from sqlalchemy import Integer, Numeric, case, cast, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+
+from apps.common.config_service import on_config_change
+
+from apps.documents.amount.calculator import AmountDocumentCalculator, TaxRates
+from apps.documents.amount.models import AmountDocument, AmountDocumentItem, TOTAL_COLUMNS, TOTALS_ROUND_UNIT
+from db import db
+
+logger = logging.getLogger(__name__)
+
+
+def recalculate_totals(batch_size: int = 500, rates: Optional[TaxRates] = None) -> int:
+    """明細から集計列を計算し直す。更新件数を返す。"""
+    rates = rates or TaxRates.current()
+    item = AmountDocumentItem
+    reward_sum = (select(func.coalesce(func.sum(item.reward_amount), 0))
+                  .where(item.amount_document_id == AmountDocument.id)
+                  .scalar_subquery())
+    expense_sum = (select(func.coalesce(func.sum(item.expense_amount), 0))
+                   .where(item.amount_document_id == AmountDocument.id)
+                   .scalar_subquery())
+    updated = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(
+                AmountDocument.id,
+                reward_sum.label("reward_sum"),
+                expense_sum.label("expense_sum"),
+                AmountDocument.apply_consumption_tax,
+                AmountDocument.apply_withholding,
+                *[getattr(AmountDocument, c) for c in TOTAL_COLUMNS],
+            )
+            .where(AmountDocument.id > last_id)
+            .order_by(AmountDocument.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        changes = []
+        for r in rows:
+            totals = AmountDocumentCalculator(
+                [r.reward_sum], [r.expense_sum],
+                bool(r.apply_consumption_tax), bool(r.apply_withholding), rates=rates,
+            ).calculate_totals(round_unit=TOTALS_ROUND_UNIT)
+            values = {column: totals[key] for column, key in TOTAL_COLUMNS.items()}
+            if any(getattr(r, column) != v for column, v in values.items()):
+                changes.append({"id": r.id, **values})
+        if changes:
+            db.session.bulk_update_mappings(AmountDocument, changes)
+            db.session.commit()
+            updated += len(changes)
+        last_id = rows[-1].id
+    return updated
+
+
+def _tax_totals_update(rates: TaxRates):
+    """
+    税率から tax_total / withholding_total / grand_total を直す UPDATE（変わる行だけ）。
+    int(x * rate) と同じ結果になるよう double precision で掛けて trunc する。
+    """
+    m = AmountDocument
+    reward = cast(m.reward_total, DOUBLE_PRECISION)
+    taxable = cast(func.greatest(0, m.reward_total - rates.withholding_exemption), DOUBLE_PRECISION)
+    tax = case(
+        (m.apply_consumption_tax, cast(func.trunc(reward * literal(rates.consumption_tax, DOUBLE_PRECISION)), Integer)),
+        else_=0,
+    )
+    withholding = case(
+        (m.apply_withholding, cast(func.trunc(taxable * literal(rates.withholding_tax, DOUBLE_PRECISION)), Integer)),
+        else_=0,
+    )
+    # 100円未満切り捨て（Python の // と同じく床関数）
+    unit = TOTALS_ROUND_UNIT
+    grand = cast(func.floor(cast(m.reward_total + m.expense_total + tax - withholding, Numeric) / unit), Integer) * unit
+
+    return (
+        update(m)
+        .where(or_(m.tax_total != tax, m.withholding_total != withholding, m.grand_total != grand))
+        .values(tax_total=tax, withholding_total=withholding, grand_total=grand)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def refresh_tax_totals(rates: Optional[TaxRates] = None) -> int:
+    """税率だけが変わったときの更新（UPDATE 1文。明細は読まない）。更新件数を返す。"""
+    rates = rates or TaxRates.current()
+    result = db.session.execute(_tax_totals_update(rates))
+    db.session.commit()
+    return result.rowcount or 0
+
+
+def _warn_on_tax_change(old: Mapping[str, Any], new: Mapping[str, Any]) -> None:
+    """
+    tax.ini を読み直して税率が変わったことをログに出す（config_service の on_config_change から）。
+    集計列の更新は表全体の UPDATE なので、最初に tax_rates() を呼んだリクエストの中では流さない。
+    """
+    logger.warning("tax rates changed (%s -> %s); stored amount totals are stale until "
+                   "flask amount recalc-totals --tax-only", dict(old), dict(new))
+
+
+on_config_change("tax", _warn_on_tax_change)
+
+
+# =========================
+# 明細（amount_document_item）の集計
+# =========================
+def documents_with_item_type(item_type: str, *, limit: int = 100) -> list[AmountDocument]:
+    """その項目を含む書類（新しい順）。ix_amount_document_item_item_type で引く。"""
+    doc_ids = select(AmountDocumentItem.amount_document_id).where(AmountDocumentItem.item_type == item_type)
+    return list(db.session.scalars(
+        select(AmountDocument)
+        .where(AmountDocument.id.in_(doc_ids))
+        .order_by(AmountDocument.created_at.desc(), AmountDocument.id.desc())
+        .limit(limit)
+    ))
+
+
+def item_type_summary() -> list:
+    """項目ごとの件数・報酬合計・実費合計（件数の多い順）。"""
+    item = AmountDocumentItem
+    return db.session.execute(
+        select(
+            item.item_type,
+            func.count(func.distinct(item.amount_document_id)).label("documents"),
+            func.sum(item.reward_amount).label("reward"),
+            func.sum(item.expense_amount).label("expense"),
+        )
+        .where(item.item_type != "")
+        .group_by(item.item_type)
+        .order_by(func.count(func.distinct(item.amount_document_id)).desc(), item.item_type)
+    ).all()
@@ -57,9 +57,30 @@ document.querySelectorAll('button[data-doc-label]').forEach(button => {
             const existingImg = document.getElementById('stamp-image');
             if (existingImg) existingImg.remove();
         }
+
+        updatePdfLink();
     });
 });
 
+// PDF リンクを表示中の書類種別・押印に合わせる
+const pdfKinds = {'見積': 'estimate', '請求': 'invoice', '領収': 'receipt'};
+let pdfKind = 'estimate';
+
+function updatePdfLink() {
+    const link = document.getElementById('pdf-link');
+    const active = document.querySelector('button[data-doc-label].active');
+    if (!link) return;
+    if (active) {
+        const label = active.getAttribute('data-doc-label');
+        Object.keys(pdfKinds).forEach(k => {
+            if (label.includes(k)) pdfKind = pdfKinds[k];
+        });
+    }
+    const params = new URLSearchParams({kind: pdfKind});
+    if (document.getElementById('stamp-image')) params.set('stamp', '1');
+    link.href = `${link.dataset.href}?${params}`;
+}
+
 // 初期ロード時に「見積書」ボタンをアクティブに
 document.addEventListener('DOMContentLoaded', () => {
     document.title = `見積書（${clientName}殿）`;
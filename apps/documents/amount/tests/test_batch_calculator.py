@@ -0,0 +1,53 @@
+# apps/documents/amount/tests/test_batch_calculator.py
+"""
+一括計算（batch_calculator）が 1件ずつの AmountDocumentCalculator と同じ結果になることの確認。
+"""
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from apps.documents.amount.batch_calculator import calculate_batch, pad_amounts
+from apps.documents.amount.calculator import AmountDocumentCalculator, TaxRates
+
+RATES = TaxRates(consumption_tax=0.10, withholding_exemption=10000, withholding_tax=0.1021)
+
+
+def _random_docs(n, seed=0):
+    rnd = random.Random(seed)
+    docs = []
+    for _ in range(n):
+        m = rnd.randint(0, 20)
+        docs.append((
+            [rnd.choice([None, 0, rnd.randint(1, 500_000)]) for _ in range(m)],
+            [rnd.choice([None, 0, rnd.randint(1, 100_000)]) for _ in range(rnd.randint(0, m))],
+            rnd.random() < 0.7,
+            rnd.random() < 0.5,
+        ))
+    return docs
+
+
+@pytest.mark.parametrize("round_unit", [None, 100, 10])
+def test_matches_scalar_calculator(round_unit):
+    docs = _random_docs(300)
+    batch = calculate_batch(
+        [d[0] for d in docs], [d[1] for d in docs],
+        [d[2] for d in docs], [d[3] for d in docs],
+        RATES, round_unit=round_unit,
+    )
+    for i, (rewards, expenses, tax, withholding) in enumerate(docs):
+        expected = AmountDocumentCalculator(rewards, expenses, tax, withholding, rates=RATES)
+        assert batch.row(i) == expected.calculate_totals(round_unit=round_unit)
+
+
+def test_accepts_padded_2d_array_and_empty_input():
+    rewards = np.array([[100_000, 50_000], [0, 0]])
+    expenses = np.array([[1_000, 0], [2_000, 0]])
+    batch = calculate_batch(rewards, expenses, [True, True], [True, False], RATES, round_unit=100)
+    assert batch.grand_total.tolist() == [
+        AmountDocumentCalculator([100_000, 50_000], [1_000], True, True, rates=RATES).calculate_totals(round_unit=100)["grand_total"],
+        2_000,
+    ]
+    assert len(calculate_batch([], [], [], [], RATES)) == 0
+    assert pad_amounts([[1, None], None, [3]]).tolist() == [[1, 0], [0, 0], [3, 0]]
@@ -7,12 +7,20 @@ from db import db
 from apps.documents.amount.calculator import AmountDocumentCalculator
 from apps.documents.amount.forms import AmountDocumentForm
 from apps.documents.amount.models import AmountDocument
+from apps.documents.amount import services as amount_services  # 税率変更時の集計列の更新もここで登録される
 # from sqlalchemy.orm import joinedload
 from apps.common.forms import CSRFOnlyForm
+from apps.common.pagination import paginate_keyset
+from apps.documents.constants import DocumentType
+from apps.documents.detail_cache import render_detail
+from apps.documents.pdf import PdfJob, send_pdf
+from sqlalchemy import func, select
 from sqlalchemy.exc import SQLAlchemyError
 from werkzeug.wrappers.response import Response as WerkzeugResponse
 from typing import Union
 
+import click
+
 amount_bp = Blueprint(
     "amount", __name__, # Blueprint 名
     url_prefix="/documents/amount",
@@ -27,7 +35,7 @@ def _get_document_or_404(document_id: int) -> AmountDocument:
     """
     return (
         AmountDocument.query
-        .options(joinedload(AmountDocument.client))
+        .options(joinedload(AmountDocument.client), selectinload(AmountDocument.items))
         .get_or_404(document_id))
 
 
@@ -45,7 +53,13 @@ def _commit_session_with_flash(success_message: str, error_message: str) -> bool
 # apps/amount/views.py
 from apps.client.models import Client
 from apps.entrusted_book.models import EntrustedBook
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
+
+# 明細の FieldList（AmountDocument の同名属性は明細から作る読み取り専用の配列）
+ITEM_FIELDS = ("item_types", "reward_amounts", "expense_amounts")
+
+# 詳細画面・PDF の書類種別（見積 / 請求 / 領収）
+DOC_LABELS = {"estimate": "見積", "invoice": "請求", "receipt": "領収"}
 
 
 # --------------------------
@@ -56,16 +70,15 @@ def index() -> str:
     # クエリ取得（任意）
     client_id = request.args.get("client_id", type=int)
     entrusted_book_id = request.args.get("entrusted_book_id", type=int)
+    min_total = request.args.get("min_total", type=int)  # 合計金額（grand_total）の範囲
+    max_total = request.args.get("max_total", type=int)
 
-    # 一覧クエリ（Client→EntrustedBook をまとめてロードしてN+1回避）
+    # 一覧クエリ（Client→EntrustedBook をまとめてロードしてN+1回避。ロードは1ページ分だけ）
     q = (AmountDocument.query
     .options(
         joinedload(AmountDocument.client)
         .joinedload(Client.entrusted_book)
-    )
-    .order_by(
-        AmountDocument.created_at.desc().nullslast(),
-        AmountDocument.id.desc()
+        .lazyload(EntrustedBook.clients)  # 受託簿の clients（既定 selectin）は一覧では不要
     ))
 
     # フィルタ：client_id があればそのクライアントに限定
@@ -77,7 +90,20 @@ def index() -> str:
         q = (q.join(AmountDocument.client)
              .filter(Client.entrusted_book_id == entrusted_book_id))
 
-    documents = q.all()
+    # フィルタ：合計金額（保存済みの grand_total。JSONB は読まない）
+    amount_filters = []
+    if min_total is not None:
+        amount_filters.append(AmountDocument.grand_total >= min_total)
+    if max_total is not None:
+        amount_filters.append(AmountDocument.grand_total <= max_total)
+    q = q.filter(*amount_filters)
+
+    page = paginate_keyset(
+        q,
+        sortable={"created_at": AmountDocument.created_at, "grand_total": AmountDocument.grand_total},
+        default_sort="created_at",
+        id_column=AmountDocument.id,
+    )
 
     # ヘッダ表示用の文脈（存在しなければ None のまま渡す）
     client = Client.query.get(client_id) if client_id else None
@@ -86,9 +112,21 @@ def index() -> str:
                       if entrusted_book_id
                       else (client.entrusted_book if client and client.entrusted_book_id else None))
 
+    # 合計欄（絞り込み条件に合う全件の grand_total を SQL で合計）
+    total_q = (select(func.coalesce(func.sum(AmountDocument.grand_total), 0))
+               .select_from(AmountDocument)
+               .where(*amount_filters))
+    if client_id:
+        total_q = total_q.where(AmountDocument.client_id == client_id)
+    if entrusted_book_id:
+        total_q = (total_q.join(AmountDocument.client)
+                   .where(Client.entrusted_book_id == entrusted_book_id))
+
     return render_template(
         "amount/index.html",
-        documents=documents,
+        documents=page.items,
+        grand_total=db.session.scalar(total_q),
+        page=page,
         client=client,
         entrusted_book=entrusted_book,
         form=AmountDocumentForm(),
@@ -98,27 +136,69 @@ def index() -> str:
 # --------------------------
 # Detail（詳細）
 # --------------------------
+def _render_detail(document: AmountDocument, kind: str = "estimate", stamp: bool = False) -> str:
+    """
+    詳細画面の HTML（kind: 見積 / 請求 / 領収、stamp: 押印あり）。PDF も同じものから作る。
+    書類と設定が変わらない間はキャッシュを返す（apps/documents/detail_cache.py）。
+    """
+    def render() -> str:
+        calc = AmountDocumentCalculator(
+            reward_amounts=document.reward_amounts or [],
+            expense_amounts=document.expense_amounts or [],
+            apply_consumption_tax=document.apply_consumption_tax,
+            apply_withholding=document.apply_withholding,
+        )
+        totals = calc.calculate_totals(round_unit=100)
+
+        return render_template(
+            "amount/detail.html",
+            doc_labels=DOC_LABELS,
+            kind=kind,
+            stamp=stamp,
+            document=document,
+            totals=totals,  # 詳細画面のみ集計あり
+            document_note=str.replace(str(document.note), "\\n", "\n"),
+        )
+
+    return render_detail(DocumentType.AMOUNT, document, render,
+                         variant=f"{kind}-stamp" if stamp else kind)
+
+
 @amount_bp.route("/<int:document_id>")
 def detail(document_id: int) -> str:
     document = _get_document_or_404(document_id)
+    return _render_detail(document)
 
-    calc = AmountDocumentCalculator(
-        reward_amounts=document.reward_amounts or [],
-        expense_amounts=document.expense_amounts or [],
-        apply_consumption_tax=document.apply_consumption_tax,
-        apply_withholding=document.apply_withholding,
-    )
-    totals = calc.calculate_totals(round_unit=100)
 
-    return render_template(
-        "amount/detail.html",
-        doc_labels={"estimate": "見積", "invoice": "請求", "receipt": "領収"},
-        document=document,
-        totals=totals,  # 詳細画面のみ集計あり
-        document_note=str.replace(str(document.note), "\\n", "\n"),
+# --------------------------
+# PDF（?kind=estimate|invoice|receipt&stamp=1）
+# --------------------------
+def pdf_job(document: AmountDocument, kind: str = "estimate", stamp: bool = False) -> PdfJob:
+    """PDF にする内容（詳細画面の HTML）。受託簿の ZIP 出力からも使う。"""
+    return PdfJob(
+        DocumentType.AMOUNT, document.id,
+        html=_render_detail(document, kind, stamp),
+        filename=f"{DOC_LABELS[kind]}書_{document.client.name}.pdf",
+        variant=f"{kind}-stamp" if stamp else kind,
     )
 
 
+def issued_kinds(document: AmountDocument) -> list[str]:
+    """日付の入っている書類種別（見積 / 請求 / 領収）。どれも無ければ見積だけ。"""
+    kinds = [kind for kind in DOC_LABELS if getattr(document, f"{kind}_date")]
+    return kinds or ["estimate"]
+
+
+@amount_bp.route("/<int:document_id>/pdf")
+def pdf(document_id: int):
+    document = _get_document_or_404(document_id)
+    kind = request.args.get("kind", "estimate")
+    kind = kind if kind in DOC_LABELS else "estimate"
+    stamp = request.args.get("stamp", type=int) == 1
+    return send_pdf(pdf_job(document, kind, stamp),
+                    fallback_url=url_for("amount.detail", document_id=document.id))
+
+
 # --------------------------
 # Create（新規）
 # --------------------------
@@ -150,7 +230,7 @@ def create():
         # デフォ行注入
         defaults = get_default_entries_for_client_type(client.client_type)
         for i, (it, rw, ex) in enumerate(
-                zip(defaults["item_types"], defaults["reward_amounts"], defaults["expense_amounts"])
+                zip(defaults.item_types, defaults.reward_amounts, defaults.expense_amounts)
         ):
             if i < len(form.item_types):
                 form.item_types[i].data = it
@@ -213,7 +293,10 @@ def edit(document_id: int) -> Union[str, WerkzeugResponse]:
 
     #### POST
     if form.validate_on_submit():
-        form.populate_obj(document)
+        # 明細（item_types / reward_amounts / expense_amounts）は set_items_normalized で保存する
+        for name, field in form._fields.items():
+            if name not in ITEM_FIELDS:
+                field.populate_obj(document, name)
         document.set_items_normalized(
             item_types_list=[f.data for f in form.item_types],
             reward_list=[f.data for f in form.reward_amounts],
@@ -274,3 +357,18 @@ def delete(document_id: int) -> WerkzeugResponse:
         db.session.rollback()
         flash("金額文書の削除に失敗しました。", "error")
         return redirect(cancel_url)
+
+
+# --------------------------
+# CLI: flask amount recalc-totals
+# --------------------------
+@amount_bp.cli.command("recalc-totals")
+@click.option("--batch-size", default=500, show_default=True, help="commit 単位の件数")
+@click.option("--tax-only", is_flag=True, help="税率を変えたときだけ（保存済みの報酬・実費の合計から再計算）")
+def recalc_totals_command(batch_size: int, tax_only: bool) -> None:
+    """集計列（reward_total ... grand_total）を作り直す。"""
+    if tax_only:
+        count = amount_services.refresh_tax_totals()
+    else:
+        count = amount_services.recalculate_totals(batch_size=batch_size)
+    click.echo(f"amount totals updated: {count}")
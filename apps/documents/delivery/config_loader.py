@@ -1,23 +1,30 @@
 ### apps/documents/delivery/config_loader.py
 import os, configparser, re
-from functools import lru_cache
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
 from apps.client.models import ClientType  # ★ これを使って分岐
+from apps.common.config_service import register_config, ini_text
 
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.ini")
 MIN_ROWS = 10  # 足りない分は空行で埋める
 
-@lru_cache(maxsize=1)
-def _p() -> configparser.ConfigParser:
-    c = configparser.ConfigParser()
-    c.read(CONFIG_FILE, encoding="utf-8")
-    return c
+# 1行 = {doc_name, copies}。保存済み書類の JSON 行と同じく .get() で読める読み取り専用 dict
+Row = Mapping[str, str]
+_EMPTY_ROW: Row = MappingProxyType({"doc_name": "", "copies": ""})
+
+
+@dataclass(frozen=True)
+class Paragraphs:
+    greeting: str
+    closing: str
+
+
+@dataclass(frozen=True)
+class DeliveryConfig:
+    paragraphs: Paragraphs
+    documents: Mapping[str, Tuple[Row, ...]]   # {セクション名: MIN_ROWS 行にパディング済みの行}
 
-def load_paragraphs() -> dict[str, str]:
-    s = _p()["PARAGRAPH"] if _p().has_section("PARAGRAPH") else {}
-    g = (s.get("GREETING", "")).replace("\\n", "\n")
-    c = (s.get("CLOSING",  "")).replace("\\n", "\n")
-    return {"greeting": g, "closing": c}
 
 # ---- 既定行の読み込み ----
 def _natural_key(k: str) -> Tuple[str, int]:
@@ -26,37 +33,36 @@ def _natural_key(k: str) -> Tuple[str, int]:
         return m.group(1), int(m.group(2))
     return k, 0
 
-def _parse_entry_line(raw: str) -> Dict[str, str]:
+def _parse_entry_line(raw: str) -> Row:
     """
     形式: '書類名,枚数'（枚数が空でもOK）
     """
     if raw is None:
-        return {"doc_name": "", "copies": ""}
+        return _EMPTY_ROW
 
     parts = [p.strip() for p in str(raw).split(",")]
     nonempty = [p for p in parts if p != ""]
 
     if not nonempty:
-        return {"doc_name": "", "copies": ""}
+        return _EMPTY_ROW
 
     # 1要素: 書類名のみ
     if len(nonempty) == 1:
-        return {"doc_name": nonempty[0], "copies": ""}
+        return MappingProxyType({"doc_name": nonempty[0], "copies": ""})
 
     # 2要素以上: 先頭=書類名, 最後=枚数 とみなす
-    return {"doc_name": nonempty[0], "copies": nonempty[-1]}
+    return MappingProxyType({"doc_name": nonempty[0], "copies": nonempty[-1]})
 
-def _load_entries(section_name: str) -> List[Dict[str, str]]:
-    rows: List[Dict[str, str]] = []
-    if _p().has_section(section_name):
-        sec = _p()[section_name]
+def _load_entries(parser: configparser.ConfigParser, section_name: str) -> Tuple[Row, ...]:
+    rows = []
+    if parser.has_section(section_name):
+        sec = parser[section_name]
         for key in sorted(sec.keys(), key=_natural_key):
             rows.append(_parse_entry_line(sec.get(key, "")))
 
     # 行数を MIN_ROWS に揃える
-    while len(rows) < MIN_ROWS:
-        rows.append({"doc_name": "", "copies": ""})
-    return rows
+    rows.extend([_EMPTY_ROW] * (MIN_ROWS - len(rows)))
+    return tuple(rows)
 
 _SECTION_MAP = {
     ClientType.RIGHT_HOLDER:      "DEFAULT_DOCUMENT_RIGHT_HOLDER",
@@ -65,12 +71,28 @@ _SECTION_MAP = {
     ClientType.APPLICANT:         "DEFAULT_DOCUMENT_RIGHT_HOLDER",
 }
 
-def get_default_documents(client_type: ClientType) -> List[Dict[str, str]]:
+def _build(parser: configparser.ConfigParser) -> DeliveryConfig:
+    s = parser["PARAGRAPH"] if parser.has_section("PARAGRAPH") else {}
+    paragraphs = Paragraphs(greeting=ini_text(s.get("GREETING", "")), closing=ini_text(s.get("CLOSING", "")))
+    documents: Dict[str, Tuple[Row, ...]] = {
+        sec: _load_entries(parser, sec) for sec in set(_SECTION_MAP.values())
+    }
+    return DeliveryConfig(paragraphs=paragraphs, documents=MappingProxyType(documents))
+
+_config = register_config("delivery", CONFIG_FILE, _build)
+_EMPTY_ROWS: Tuple[Row, ...] = (_EMPTY_ROW,) * MIN_ROWS
+
+
+# ---- 公開 API（戻り値は読み取り専用・全リクエストで共有） ----
+def load_paragraphs() -> Paragraphs:
+    return _config.get().paragraphs
+
+def get_default_documents(client_type: ClientType) -> Tuple[Row, ...]:
     sec = _SECTION_MAP.get(client_type)
     if not sec:
-        return [{"doc_name": "", "copies": ""} for _ in range(MIN_ROWS)]
-    return _load_entries(sec)
+        return _EMPTY_ROWS
+    return _config.get().documents[sec]
 
 # 既存のダミー行APIも残しておく（既存呼び出しがあっても壊れないように）
 def default_rows(n: int = 10) -> list[dict[str, str]]:
-    return [{"doc_name": "", "copies": ""} for _ in range(n)]
\ No newline at end of file
+    return [{"doc_name": "", "copies": ""} for _ in range(n)]
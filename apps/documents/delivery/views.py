@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Mapping, Sequence
 
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from sqlalchemy.exc import SQLAlchemyError
@@ -11,9 +12,13 @@ from wtforms import FieldList
 from db import db
 
 from apps.common.forms import CSRFOnlyForm
+from apps.common.pagination import paginate_keyset
 from apps.client.models import Client
 from apps.documents.delivery.config_loader import load_paragraphs, get_default_documents
 from apps.documents.delivery.models import DeliveryDocument
+from apps.documents.constants import DocumentType
+from apps.documents.detail_cache import render_detail
+from apps.documents.pdf import PdfJob, send_pdf
 from apps.documents.delivery.forms import DeliveryDocumentForm
 
 # --------------------------
@@ -43,7 +48,7 @@ def _commit_with_flash(ok_msg: str, ng_msg: str) -> bool:
         return False
 
 
-def _fill_documents(field_list: FieldList, rows: list[dict[str, str]]) -> None:
+def _fill_documents(field_list: FieldList, rows: Sequence[Mapping[str, str]]) -> None:
     """rows: [{doc_name, copies}] を FieldList<FormField> に流し込む。"""
     while len(field_list) < len(rows):
         field_list.append_entry()
@@ -71,16 +76,20 @@ def _collect_documents(field_list: FieldList) -> list[dict[str, str]]:
 @delivery_bp.route("/")
 def index() -> str:
     client_id = request.args.get("client_id", type=int)
-    q = (DeliveryDocument.query
-         .options(joinedload(DeliveryDocument.client))
-         .order_by(DeliveryDocument.created_at.desc(), DeliveryDocument.id.desc()))
+    q = DeliveryDocument.query.options(joinedload(DeliveryDocument.client))
     if client_id:
         q = q.filter(DeliveryDocument.client_id == client_id)
 
-    documents = q.all()
+    page = paginate_keyset(
+        q,
+        sortable={"created_at": DeliveryDocument.created_at},
+        default_sort="created_at",
+        id_column=DeliveryDocument.id,
+    )
     return render_template(
         "delivery/index.html",
-        documents=documents,
+        documents=page.items,
+        page=page,
         client_id=client_id,
     )
 
@@ -88,12 +97,37 @@ def index() -> str:
 # --------------------------
 # Detail（詳細）
 # --------------------------
+def _render_detail(doc: DeliveryDocument) -> str:
+    """詳細画面の HTML。PDF も同じものから作る（書類と設定が変わらない間はキャッシュ：apps/documents/detail_cache.py）。"""
+    return render_detail(DocumentType.DELIVERY, doc, lambda: render_template("delivery/detail.html", document=doc))
+
+
 @delivery_bp.route("/<int:document_id>")
 def detail(document_id: int) -> str:
     doc = (DeliveryDocument.query
            .options(joinedload(DeliveryDocument.client))
            .get_or_404(document_id))
-    return render_template("delivery/detail.html", document=doc)
+    return _render_detail(doc)
+
+
+# --------------------------
+# PDF
+# --------------------------
+def pdf_job(doc: DeliveryDocument) -> PdfJob:
+    """PDF にする内容（詳細画面の HTML）。受託簿の ZIP 出力からも使う。"""
+    return PdfJob(
+        DocumentType.DELIVERY, doc.id,
+        html=_render_detail(doc),
+        filename=f"納品書_{doc.client.name}.pdf",
+    )
+
+
+@delivery_bp.route("/<int:document_id>/pdf")
+def pdf(document_id: int):
+    doc = (DeliveryDocument.query
+           .options(joinedload(DeliveryDocument.client))
+           .get_or_404(document_id))
+    return send_pdf(pdf_job(doc), fallback_url=url_for("delivery.detail", document_id=doc.id))
 
 
 # --------------------------
@@ -117,9 +151,9 @@ def create():
 
     if request.method == "GET":
         # ---- 段落：config_loader から初期文面を流し込み ----
-        paras = load_paragraphs()  # {"greeting": "...", "closing": "..."}
-        form.greeting_paragraph.data = paras.get("greeting", "")
-        form.closing_paragraph.data = paras.get("closing", "")
+        paras = load_paragraphs()  # Paragraphs(greeting, closing)
+        form.greeting_paragraph.data = paras.greeting
+        form.closing_paragraph.data = paras.closing
 
         # 行：client_type に応じたセクションから
         defaults = get_default_documents(client.client_type)  # ★ここがポイント
@@ -0,0 +1,50 @@
+# apps/documents/detail_cache.py
+"""
+書類の詳細画面の HTML をキャッシュする（apps/common/fragment_cache.py）。
+
+詳細画面は作成後ほとんど変わらないのに、開くたびに集計・和暦変換・テンプレートの描画をしている。
+同じ HTML は PDF（apps/documents/pdf.py）と受託簿の ZIP 出力にも使う。
+
+- キー: (書類の種類, id)。variant は同じ書類の描き分け（金額書類の 見積 / 請求 / 領収・押印）
+- 版: 書類の updated_at・クライアントの updated_at・事務所 / 税率の設定（office_config_version）。
+  どれかが変われば作り直す
+- 書類の UPDATE / DELETE（after_update / after_delete）でそのエントリを消す。
+  金額書類は明細だけを変えても updated_at を進める（amount/models.py の before_flush）
+- 詳細画面はリクエストごとの値（flash・CSRF トークンなど）を描かないので、ページ全体をキャッシュする。
+  そうしたものを足すときは、その部分をキャッシュの外に出すこと
+"""
+from __future__ import annotations
+from typing import Any, Callable
+
+from markupsafe import Markup
+
+from apps.common import fragment_cache
+from apps.common.office_config import office_config_version
+from apps.documents.constants import DocumentType
+from apps.documents.amount.models import AmountDocument
+from apps.documents.required.models import RequiredDocument
+from apps.documents.delivery.models import DeliveryDocument
+from apps.documents.origin.models import OriginDocument
+
+# 書類の種類 → モデル
+MODELS = {
+    DocumentType.AMOUNT: AmountDocument,
+    DocumentType.REQUIRED: RequiredDocument,
+    DocumentType.DELIVERY: DeliveryDocument,
+    DocumentType.ORIGIN: OriginDocument,
+}
+
+
+def render_detail(document_type: DocumentType, document: Any, render: Callable[[], str],
+                  variant: str = "default") -> Markup:
+    """詳細画面の HTML。版が同じ間はキャッシュを返し、無ければ render() する。"""
+    return fragment_cache.render(
+        document_type.value, document.id,
+        version=(document.updated_at, document.client.updated_at, office_config_version()),
+        variant=variant,
+        render=render,
+    )
+
+
+for _document_type, _model in MODELS.items():
+    fragment_cache.register_invalidation(_model, _document_type.value)
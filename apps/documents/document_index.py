@@ -0,0 +1,150 @@
+# apps/documents/document_index.py
+"""
+全書類の統合インデックス（document_index）。
+
+見積・請求 / 必要書類 / 納品書 / 登記原因証明の4テーブルを1つにまとめた一覧用の表で、
+クライアントごとの書類一覧や全体の新着一覧を UNION ALL なしの1回のインデックス範囲読みで返す。
+
+- 書類の追加・更新・削除は Session の after_flush で同じトランザクション内に反映する
+  （ORM を通らない一括更新・直接の SQL はここを通らないので flask client rebuild-document-index で作り直す）
+- クライアント削除時は client_id の ON DELETE CASCADE で消える
+"""
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Index, delete, event, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from db import db
+from apps.documents.constants import DocumentType
+from apps.documents.amount.models import AmountDocument
+from apps.documents.required.models import RequiredDocument
+from apps.documents.delivery.models import DeliveryDocument
+from apps.documents.origin.models import OriginDocument
+
+TITLE_MAX_LENGTH = 255
+
+
+class DocumentIndex(db.Model):
+    __tablename__ = "document_index"
+
+    id = db.Column(db.Integer, primary_key=True)
+    document_type = db.Column(db.String(20), nullable=False)  # DocumentType.value
+    document_id = db.Column(db.Integer, nullable=False)        # 各書類テーブルの id
+    client_id = db.Column(db.Integer, db.ForeignKey("client.id", ondelete="CASCADE"), nullable=False)
+    title = db.Column(db.String(TITLE_MAX_LENGTH), nullable=False, default="")
+    created_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("document_type", "document_id", name="uq_document_index_document"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<DocumentIndex {self.document_type}#{self.document_id} client_id={self.client_id}>"
+
+
+# クライアントごとの一覧（新しい順） / 種類ごとの新着
+Index("ix_document_index_client_created",
+      DocumentIndex.client_id, DocumentIndex.created_at.desc(), DocumentIndex.id.desc())
+Index("ix_document_index_type_created", DocumentIndex.document_type, DocumentIndex.created_at)
+
+
+# =========================
+# 書類 → 索引行
+# =========================
+def _origin_title(doc: OriginDocument) -> str:
+    return next((p for p in (doc.real_estate_descriptions or []) if p), "")
+
+
+# モデル → (種類, 見出しの取り方)
+_SOURCES = {
+    AmountDocument:   (DocumentType.AMOUNT,   lambda d: d.entrusted_book_name),
+    RequiredDocument: (DocumentType.REQUIRED, lambda d: d.entrusted_book_name),
+    DeliveryDocument: (DocumentType.DELIVERY, lambda d: d.entrusted_book_name),
+    OriginDocument:   (DocumentType.ORIGIN,   _origin_title),
+}
+
+
+def _row_for(doc: Any) -> Dict[str, Any]:
+    doc_type, title_of = _SOURCES[type(doc)]
+    return {
+        "document_type": doc_type.value,
+        "document_id": doc.id,
+        "client_id": doc.client_id,
+        "title": (title_of(doc) or "")[:TITLE_MAX_LENGTH],
+        "created_at": doc.created_at or datetime.utcnow(),
+    }
+
+
+def _upsert_stmt(rows: List[Dict[str, Any]]):
+    stmt = pg_insert(DocumentIndex).values(rows)
+    return stmt.on_conflict_do_update(
+        constraint="uq_document_index_document",
+        set_={
+            "client_id": stmt.excluded.client_id,
+            "title": stmt.excluded.title,
+            "created_at": stmt.excluded.created_at,
+        },
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_document_index(session: Session, flush_context: Any) -> None:
+    """flush された書類の追加・更新・削除を document_index に反映する（同じトランザクション内）。"""
+    # after_flush の時点では new / dirty / deleted は flush 前の状態のまま見える
+    upserts = [_row_for(o) for o in session.new if type(o) in _SOURCES]
+    upserts += [_row_for(o) for o in session.dirty
+                if type(o) in _SOURCES and session.is_modified(o, include_collections=False)]
+    deletes = [(_SOURCES[type(o)][0].value, o.id) for o in session.deleted if type(o) in _SOURCES]
+    if not upserts and not deletes:
+        return
+
+    conn = session.connection()
+    if upserts:
+        conn.execute(_upsert_stmt(upserts))
+    if deletes:
+        conn.execute(
+            delete(DocumentIndex)
+            .where(tuple_(DocumentIndex.document_type, DocumentIndex.document_id).in_(deletes))
+        )
+
+
+# =========================
+# 読み出し
+# =========================
+def documents_for_client(client_id: int, *, document_type: Optional[str] = None) -> List[DocumentIndex]:
+    """クライアントの書類一覧（新しい順）。ix_document_index_client_created の範囲読み。"""
+    stmt = (
+        select(DocumentIndex)
+        .where(DocumentIndex.client_id == client_id)
+        .order_by(DocumentIndex.created_at.desc(), DocumentIndex.id.desc())
+    )
+    if document_type:
+        stmt = stmt.where(DocumentIndex.document_type == document_type)
+    return list(db.session.scalars(stmt))
+
+
+def recent_documents(*, document_type: Optional[str] = None, limit: int = 50) -> List[DocumentIndex]:
+    """全体の新着（種類で絞るときは ix_document_index_type_created）。"""
+    stmt = select(DocumentIndex).order_by(DocumentIndex.created_at.desc(), DocumentIndex.id.desc())
+    if document_type:
+        stmt = stmt.where(DocumentIndex.document_type == document_type)
+    return list(db.session.scalars(stmt.limit(limit)))
+
+
+# =========================
+# 作り直し
+# =========================
+def rebuild_document_index(batch_size: int = 500) -> int:
+    """4テーブルから document_index を作り直す（初回作成時・ORM を通らない更新の後）。件数を返す。"""
+    db.session.execute(delete(DocumentIndex))
+    total = 0
+    for model in _SOURCES:
+        for chunk in db.session.scalars(select(model).order_by(model.id)
+                                        .execution_options(yield_per=batch_size)).partitions():
+            db.session.execute(_upsert_stmt([_row_for(d) for d in chunk]))
+            total += len(chunk)
+    db.session.commit()
+    return total
@@ -1,53 +1,58 @@
 # apps/documents/origin/config_loader.py
 from __future__ import annotations
 import os, configparser
-from functools import lru_cache
-from typing import List, Dict, Optional
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional, Tuple
 from datetime import date
 from apps.shared.wareki import iso_str_to_wareki
+from apps.common.config_service import register_config
 
 from .constants import CauseType
 
 # このファイル（config.ini）は apps/documents/origin/ 配下に置く前提
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.ini")
+_PREFIX = "CAUSE_FACT_"
 
 
 # ----------------------------
 # 基本：config.ini ローダ
 # ----------------------------
-@lru_cache(maxsize=1)
-def _parser() -> configparser.ConfigParser:
-    cp = configparser.ConfigParser()
-    cp.optionxform = str  # 大文字・小文字保持
-    if not os.path.exists(CONFIG_FILE):
-        raise FileNotFoundError(f"origin config.ini not found: {CONFIG_FILE}")
-    cp.read(CONFIG_FILE, encoding="utf-8")
-    return cp
+def _build(cp: configparser.ConfigParser) -> Mapping[str, Tuple[str, ...]]:
+    """
+    {セクション名（SALE / GIFT / DIVISION）: CAUSE_FACT_1, 2... の行テンプレート}
+    番号順に並べた tuple を読み込み時に作っておく。
+    """
+    out: Dict[str, Tuple[str, ...]] = {}
+    for sec in cp.sections():
+        items = []
+        for k, v in cp.items(sec):
+            if k.startswith(_PREFIX):
+                try:
+                    idx = int(k.replace(_PREFIX, "").strip())
+                except ValueError:
+                    continue
+                items.append((idx, v))
+        items.sort(key=lambda x: x[0])
+        out[sec] = tuple(v for _, v in items)
+    return MappingProxyType(out)
+
+
+# optionxform=str（大文字・小文字保持）。ファイルが無ければ FileNotFoundError
+_config = register_config("origin", CONFIG_FILE, _build, case_sensitive=True, required=True)
+
+
+def load_templates() -> Mapping[str, Tuple[str, ...]]:
+    return _config.get()
 
 
 # ----------------------------
 # 1) テンプレ（行ごと）を取得
 # ----------------------------
-def get_cause_templates(cause_type: CauseType) -> List[str]:
+def get_cause_templates(cause_type: CauseType) -> Tuple[str, ...]:
     """
-    指定 cause_type のセクション（例: 'SALE'）から CAUSE_FACT_1, 2... を順に返す。
+    指定 cause_type のセクション（例: 'SALE'）の CAUSE_FACT_1, 2... を順に返す。
     """
-    cp = _parser()
-    sec = cause_type.name  # SALE / GIFT / DIVISION
-    if not cp.has_section(sec):
-        return []
-
-    items = []
-    for k, v in cp.items(sec):
-        if k.startswith("CAUSE_FACT_"):
-            try:
-                idx = int(k.replace("CAUSE_FACT_", "").strip())
-            except ValueError:
-                continue
-            items.append((idx, v))
-
-    items.sort(key=lambda x: x[0])
-    return [v for _, v in items]
+    return load_templates().get(cause_type.name, ())
 
 
 # ----------------------------
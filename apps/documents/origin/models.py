@@ -1,9 +1,15 @@
 # apps/documents/origin/models.py
 from datetime import datetime
 from db import db
+from sqlalchemy import Computed, Index, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from apps.common.fulltext import text_expr, tsv_expr, search_indexes
 from sqlalchemy.dialects.postgresql import JSONB
 from apps.documents.origin.constants import CauseType
 
+# 検索対象（不動産の表示は JSONB 配列なので text にキャストして連結）
+_SEARCH_COLUMNS = ("real_estate_descriptions::text", "right_holders", "obligation_holders")
+
 
 class OriginDocument(db.Model):
     __tablename__ = "origin_document"
@@ -25,11 +31,27 @@ class OriginDocument(db.Model):
 
     # 日付
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # 行の版（詳細画面の HTML キャッシュのキー。apps/common/fragment_cache.py）
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow,
+                           onupdate=datetime.utcnow, server_default=func.now())
 
     # リレーション
     client_id = db.Column(db.Integer, db.ForeignKey("client.id"), nullable=False)
     client    = db.relationship("Client", back_populates="origin_documents")
 
+    # 検索用の生成列（apps/common/fulltext.py・検索は apps/search）
+    search_text = db.Column(db.Text, Computed(text_expr(*_SEARCH_COLUMNS), persisted=True))
+    search_tsv  = db.Column(TSVECTOR, Computed(tsv_expr(*_SEARCH_COLUMNS), persisted=True))
+
+    # 一覧のキーセットページング用（(created_at, id) で並べて続きから読む）
+    # •	全件一覧 → ix_origin_document_created_id
+    # •	client_id で絞った一覧 → ix_origin_document_client_created_id
+    __table_args__ = (
+        Index("ix_origin_document_created_id", "created_at", "id"),
+        Index("ix_origin_document_client_created_id", "client_id", "created_at", "id"),
+        *search_indexes("origin_document"),
+    )
+
 
     @property
     def cause_type(self) -> CauseType:
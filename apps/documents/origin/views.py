@@ -5,12 +5,16 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import joinedload
 from db import db
+from apps.common.pagination import paginate_keyset
 from apps.entrusted_book.models import EntrustedBook
 from apps.client.models import Client
 from apps.shared.base import digits_to_zenkaku
 from apps.client.constants import ClientType
 from apps.documents.origin.constants import CauseType
 from apps.documents.origin.models import OriginDocument
+from apps.documents.constants import DocumentType
+from apps.documents.detail_cache import render_detail
+from apps.documents.pdf import PdfJob, send_pdf
 from apps.documents.origin.forms import OriginDocumentForm
 from apps.documents.origin.config_loader import render_cause_fact
 
@@ -103,18 +107,20 @@ def _unpack_descriptions(doc) -> tuple[str, str]:
 @origin_bp.route("/")
 def index() -> str:
     client_id = request.args.get("client_id", type=int)
-    q = (
-        OriginDocument.query
-        .options(joinedload(OriginDocument.client))
-        .order_by(OriginDocument.created_at.desc(), OriginDocument.id.desc())
-    )
+    q = OriginDocument.query.options(joinedload(OriginDocument.client))
     if client_id:
         q = q.filter(OriginDocument.client_id == client_id)
 
-    documents = q.all()
+    page = paginate_keyset(
+        q,
+        sortable={"created_at": OriginDocument.created_at},
+        default_sort="created_at",
+        id_column=OriginDocument.id,
+    )
     return render_template(
         "origin/index.html",
-        documents=documents,
+        documents=page.items,
+        page=page,
         client_id=client_id,
     )
 
@@ -122,6 +128,11 @@ def index() -> str:
 # --------------------------
 # Detail（詳細）
 # --------------------------
+def _render_detail(doc: OriginDocument) -> str:
+    """詳細画面の HTML。PDF も同じものから作る（書類と設定が変わらない間はキャッシュ：apps/documents/detail_cache.py）。"""
+    return render_detail(DocumentType.ORIGIN, doc, lambda: render_template("origin/detail.html", document=doc))
+
+
 @origin_bp.route("/<int:document_id>")
 def detail(document_id: int) -> str:
     doc = (
@@ -129,7 +140,29 @@ def detail(document_id: int) -> str:
         .options(joinedload(OriginDocument.client))
         .get_or_404(document_id)
     )
-    return render_template("origin/detail.html", document=doc)
+    return _render_detail(doc)
+
+
+# --------------------------
+# PDF
+# --------------------------
+def pdf_job(doc: OriginDocument) -> PdfJob:
+    """PDF にする内容（詳細画面の HTML）。受託簿の ZIP 出力からも使う。"""
+    return PdfJob(
+        DocumentType.ORIGIN, doc.id,
+        html=_render_detail(doc),
+        filename=f"登記原因証明情報_{doc.client.name}.pdf",
+    )
+
+
+@origin_bp.route("/<int:document_id>/pdf")
+def pdf(document_id: int):
+    doc = (
+        OriginDocument.query
+        .options(joinedload(OriginDocument.client))
+        .get_or_404(document_id)
+    )
+    return send_pdf(pdf_job(doc), fallback_url=url_for("origin.detail", document_id=doc.id))
 
 
 # --------------------------
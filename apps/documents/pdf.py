@@ -0,0 +1,330 @@
+# apps/documents/pdf.py
+"""
+書類の PDF 化（サーバー側。HTML → PDF は WeasyPrint・任意依存）。
+
+詳細画面と同じテンプレートを描画して PDF にする（印刷用 CSS（@media print）もそのまま効く）。
+- 変換はプロセスプール（settings.PDF_RENDER_WORKERS）で行う。WeasyPrint は CPU を使い GIL を離さないので、
+  リクエストのスレッドで回すと同じワーカーの他のリクエストまで止まる
+- 結果は PDF_CACHE_DIR に保存し、同じ内容なら変換しない。ファイル名（キャッシュキー）は
+      {種類}-{id}-{版}-{HTML の sha256}-{office.ini / tax.ini の版}.pdf
+  （版 = 見積/請求/領収・押印の有無など、同じ書類から作る別の PDF）
+- 書類を更新・削除すると after_flush でその書類のキャッシュを消す。クライアント名の変更などは
+  HTML のハッシュが変わるので新しく作り、同じ版の古いファイルはそのとき消す
+- PDF_RENDER_TIMEOUT を超えた変換は、プールのプロセスごと止めてプールを作り直す
+  （実行中の変換は Future.cancel() では止まらず、固まった変換がプールの枠を使い続けるため）
+- 変換できなければ 503 とエラーページ（templates/pdf_error.html）を返す
+
+    job = PdfJob(DocumentType.AMOUNT, doc.id, html, filename="請求書.pdf", variant="invoice")
+    return send_pdf(job, fallback_url=url_for("amount.detail", document_id=doc.id))
+
+まとめて作るときは render_pdfs(jobs)（キャッシュに無いものを一度にプールへ投げる）。
+"""
+from __future__ import annotations
+import glob
+import hashlib
+import io
+import logging
+import mimetypes
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+from flask import Flask, Response, current_app, has_request_context, make_response, render_template, request, send_file
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import settings
+from apps.common.metrics import PDF_RENDER, cache_result
+from apps.common.office_config import office_config_version
+from apps.documents.constants import DocumentType
+from apps.documents.amount.models import AmountDocument, AmountDocumentItem
+from apps.documents.required.models import RequiredDocument
+from apps.documents.delivery.models import DeliveryDocument
+from apps.documents.origin.models import OriginDocument
+
+logger = logging.getLogger(__name__)
+
+# モデル → 種類（キャッシュの削除用）
+_TYPES = {
+    AmountDocument: DocumentType.AMOUNT,
+    RequiredDocument: DocumentType.REQUIRED,
+    DeliveryDocument: DocumentType.DELIVERY,
+    OriginDocument: DocumentType.ORIGIN,
+}
+
+
+class PdfRenderError(RuntimeError):
+    """PDF にできなかった（WeasyPrint が無い・変換に失敗・時間切れ）。"""
+
+
+@dataclass(frozen=True)
+class PdfJob:
+    document_type: DocumentType
+    document_id: int
+    html: str
+    filename: str            # ダウンロード時のファイル名
+    variant: str = "default"
+
+    @property
+    def content_hash(self) -> str:
+        return hashlib.sha256(self.html.encode("utf-8")).hexdigest()[:20]
+
+
+# =========================
+# キャッシュ（ファイル）
+# =========================
+def _prefix(document_type: Union[DocumentType, str], document_id: int) -> str:
+    return f"{DocumentType(document_type).value}-{document_id}-"
+
+
+def _cache_path(job: PdfJob, version: str) -> str:
+    name = f"{_prefix(job.document_type, job.document_id)}{job.variant}-{job.content_hash}-{version}.pdf"
+    return os.path.join(settings.PDF_CACHE_DIR, name)
+
+
+def _read_cache(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _write_cache(job: PdfJob, path: str, data: bytes) -> None:
+    """一時ファイルに書いてから置き換える（書きかけのファイルは読まれない）。同じ版の古いファイルは消す。"""
+    os.makedirs(settings.PDF_CACHE_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=settings.PDF_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        logger.exception("pdf cache write failed: %s", path)
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        return
+    stale = os.path.join(settings.PDF_CACHE_DIR, f"{_prefix(job.document_type, job.document_id)}{job.variant}-*.pdf")
+    for old in glob.glob(stale):
+        if old != path:
+            _unlink(old)
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def invalidate(document_type: Union[DocumentType, str], document_id: int) -> None:
+    """その書類の PDF キャッシュ（全部の版）を消す。"""
+    for path in glob.glob(os.path.join(settings.PDF_CACHE_DIR, f"{_prefix(document_type, document_id)}*.pdf")):
+        _unlink(path)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_flush(session: Session, flush_context: Any) -> None:
+    """書類（明細を含む）の更新・削除で、その書類のキャッシュを消す。"""
+    targets = set()
+    for obj in (*session.dirty, *session.deleted):
+        doc_type = _TYPES.get(type(obj))
+        if doc_type is not None and obj.id is not None:
+            targets.add((doc_type, obj.id))
+        elif isinstance(obj, AmountDocumentItem) and obj.amount_document_id is not None:
+            targets.add((DocumentType.AMOUNT, obj.amount_document_id))
+    for doc_type, doc_id in targets:
+        invalidate(doc_type, doc_id)
+
+
+# =========================
+# 変換（プロセスプールの中で動く）
+# =========================
+def _init_worker() -> None:
+    try:
+        import weasyprint  # noqa: F401  最初の変換を待たせないよう先に読む
+    except Exception:  # 未インストール・Pango が無い（OSError）など。変換時にエラーとして返す
+        pass
+
+
+def _render_in_worker(html: str, base_url: str, static_dirs: Dict[str, str]) -> bytes:
+    """
+    HTML → PDF。/static/... などの静的ファイルは HTTP を使わずディスクから読む
+    （同期ワーカーの gunicorn に自分自身へのリクエストを投げると詰まるため）。
+    """
+    from weasyprint import HTML, default_url_fetcher
+
+    def fetch(url: str) -> Dict[str, Any]:
+        if url.startswith(base_url):
+            path = unquote(urlsplit(url).path)
+            for prefix, directory in static_dirs.items():
+                if path.startswith(prefix):
+                    root = os.path.realpath(directory)
+                    file_path = os.path.realpath(os.path.join(root, path[len(prefix):]))
+                    if not file_path.startswith(root + os.sep):
+                        break
+                    with open(file_path, "rb") as f:
+                        return {"string": f.read(), "mime_type": mimetypes.guess_type(file_path)[0],
+                                "redirected_url": url}
+            raise ValueError(f"not a static file: {url}")
+        return default_url_fetcher(url)
+
+    return HTML(string=html, base_url=base_url, url_fetcher=fetch).write_pdf()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> Optional[ProcessPoolExecutor]:
+    """プロセスごとのプール（gunicorn の fork 後はワーカーごとに作る）。PDF_RENDER_WORKERS=0 なら None。"""
+    global _pool, _pool_pid
+    if settings.PDF_RENDER_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            # spawn: DB 接続やスレッドを持ったプロセスを fork しない
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _reset_pool(pool: Optional[ProcessPoolExecutor], *, terminate: bool = False) -> None:
+    """
+    pool を捨てる（次の変換で _executor() が作り直す）。別のスレッドが作り直した後なら新しいプールには触らない。
+    terminate=True なら実行中の変換もプロセスごと止める（同じプールに投げていた他の変換は BrokenProcessPool になる）。
+    """
+    global _pool
+    if pool is None:
+        return
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    if terminate:
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _static_dirs(app: Flask) -> Dict[str, str]:
+    """静的ファイルの URL の前置き → ディレクトリ（アプリ本体と各ブループリント）。"""
+    dirs = {}
+    for rule in app.url_map.iter_rules():
+        if not rule.endpoint.endswith("static") or not rule.rule.endswith("<path:filename>"):
+            continue
+        if rule.endpoint == "static":
+            directory = app.static_folder
+        else:
+            bp = app.blueprints.get(rule.endpoint.rsplit(".", 1)[0])
+            directory = bp.static_folder if bp else None
+        if directory:
+            dirs[rule.rule[:-len("<path:filename>")]] = directory
+    return dirs
+
+
+def _submit(job: PdfJob, pool: Optional[ProcessPoolExecutor]) -> Future:
+    base_url = request.host_url if has_request_context() else "http://localhost/"
+    args = (job.html, base_url, _static_dirs(current_app))
+    if pool is not None:
+        return pool.submit(_render_in_worker, *args)
+    # プールなし: その場で変換して結果を Future に詰める
+    future: Future = Future()
+    try:
+        future.set_result(_render_in_worker(*args))
+    except BaseException as e:
+        future.set_exception(e)
+    return future
+
+
+def _result(job: PdfJob, pending: Future, start: float, pool: Optional[ProcessPoolExecutor]) -> bytes:
+    try:
+        data = pending.result(timeout=settings.PDF_RENDER_TIMEOUT)
+    except ImportError as e:
+        raise PdfRenderError("WeasyPrint がインストールされていないため PDF を作れません。") from e
+    except FutureTimeoutError as e:
+        _reset_pool(pool, terminate=True)
+        _observe(job, "timeout", start)
+        raise PdfRenderError(f"PDF の作成が {settings.PDF_RENDER_TIMEOUT} 秒で終わりませんでした。") from e
+    except BrokenProcessPool as e:
+        _reset_pool(pool)
+        _observe(job, "error", start)
+        raise PdfRenderError("PDF 変換プロセスが異常終了しました。") from e
+    except Exception as e:
+        logger.exception("pdf render failed: %s #%s", job.document_type.value, job.document_id)
+        _observe(job, "error", start)
+        raise PdfRenderError(f"PDF の作成に失敗しました: {e}") from e
+    _observe(job, "ok", start)
+    return data
+
+
+def _observe(job: PdfJob, result: str, start: float) -> None:
+    PDF_RENDER.labels(document_type=job.document_type.value, result=result).observe(time.perf_counter() - start)
+
+
+# =========================
+# 公開 API
+# =========================
+def render_pdf(job: PdfJob) -> bytes:
+    """1件。キャッシュにあればそれを返し、無ければプールで変換して保存する。"""
+    return next(render_pdfs([job]))[1]
+
+
+def render_pdfs(jobs: Iterable[PdfJob], *,
+                return_errors: bool = False) -> Iterator[Tuple[PdfJob, Union[bytes, PdfRenderError]]]:
+    """
+    複数件を入力の順に返す。キャッシュに無いものは先に全部プールへ投げるので、
+    変換は PDF_RENDER_WORKERS 件ずつ並行に進む（一度に渡す件数で使うメモリが決まる）。
+    return_errors=True なら、変換できなかったものは bytes の代わりに PdfRenderError を返して続ける。
+    """
+    version = office_config_version()
+    entries: List[Tuple[PdfJob, str, Optional[bytes]]] = []
+    for job in jobs:
+        path = _cache_path(job, version)
+        data = _read_cache(path)
+        cache_result("pdf", data is not None)
+        entries.append((job, path, data))
+
+    # キャッシュに無いものをまとめて投げてから、順に受け取る
+    start = time.perf_counter()
+    pool = _executor() if any(data is None for _, _, data in entries) else None
+    pending = {i: _submit(job, pool) for i, (job, _, data) in enumerate(entries) if data is None}
+    for i, (job, path, data) in enumerate(entries):
+        if data is None:
+            try:
+                data = _result(job, pending[i], start, pool)
+            except PdfRenderError as e:
+                if not return_errors:
+                    raise
+                yield job, e
+                continue
+            _write_cache(job, path, data)
+        yield job, data
+
+
+def send_pdf(job: PdfJob, *, fallback_url: str, as_attachment: bool = False) -> Response:
+    """PDF を返す（ETag 付き）。変換できなければ 503 とエラーページ（fallback_url は「書類に戻る」のリンク）。"""
+    try:
+        data = render_pdf(job)
+    except PdfRenderError as e:
+        return make_response(render_template("pdf_error.html", message=str(e), back_url=fallback_url), 503)
+    return send_file(
+        io.BytesIO(data),
+        mimetype="application/pdf",
+        as_attachment=as_attachment,
+        download_name=job.filename,
+        etag=f"{job.variant}-{job.content_hash}-{office_config_version()}",
+        conditional=True,
+        max_age=0,
+    )
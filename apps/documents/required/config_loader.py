@@ -3,19 +3,39 @@
 import os
 import re
 import configparser
-from functools import lru_cache
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
 from apps.client.constants import ClientType
+from apps.common.config_service import register_config, ini_text
 
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.ini")
 MIN_ROWS = 10   # すべてのデフォルトエントリをこの行数に揃える
 
+# 1行 = {doc_name, note, copies}。保存済み書類の JSON 行と同じく .get() で読める読み取り専用 dict
+Row = Mapping[str, str]
+_EMPTY_ROW: Row = MappingProxyType({"doc_name": "", "note": "", "copies": ""})
+_EMPTY_ROWS: Tuple[Row, ...] = (_EMPTY_ROW,) * MIN_ROWS
 
-@lru_cache(maxsize=1)
-def _get_parser() -> configparser.ConfigParser:
-    p = configparser.ConfigParser()
-    p.read(CONFIG_FILE, encoding="utf-8")
-    return p
+
+@dataclass(frozen=True)
+class Paragraphs:
+    greeting: str
+    main: str
+    closing: str
+
+
+@dataclass(frozen=True)
+class RequiredDefaults:
+    """送付（mailed）/ 返送（requested）の既定行。どちらも MIN_ROWS 行にパディング済み。"""
+    mailed: Tuple[Row, ...] = _EMPTY_ROWS
+    requested: Tuple[Row, ...] = _EMPTY_ROWS
+
+
+@dataclass(frozen=True)
+class RequiredConfig:
+    paragraphs: Paragraphs
+    defaults: Mapping[ClientType, RequiredDefaults]
 
 
 def _natural_key(k: str) -> Tuple[str, int]:
@@ -25,19 +45,19 @@ def _natural_key(k: str) -> Tuple[str, int]:
     return k, 0
 
 
-def _parse_entry_line(raw: str) -> Dict[str, str]:
+def _parse_entry_line(raw: str) -> Row:
     """
     INIの1行（例: '委任状,署名1箇所,1通'）を doc_name/note/copies に分解。
     空やカンマ不足も許容して空文字で埋める。
     """
     if raw is None:
-        return {"doc_name": "", "note": "", "copies": ""}
+        return _EMPTY_ROW
 
     parts = [p.strip() for p in str(raw).split(",")]
     nonempty = [p for p in parts if p != ""]
 
     if not nonempty:
-        return {"doc_name": "", "note": "", "copies": ""}
+        return _EMPTY_ROW
 
     if len(nonempty) == 1:
         doc_name, note, copies = nonempty[0], "", ""
@@ -46,36 +66,31 @@ def _parse_entry_line(raw: str) -> Dict[str, str]:
     else:
         doc_name, note, copies = nonempty[0], nonempty[1], nonempty[-1]
 
-    return {"doc_name": doc_name, "note": note, "copies": copies}
+    return MappingProxyType({"doc_name": doc_name, "note": note, "copies": copies})
 
 
-def load_paragraphs() -> Dict[str, str]:
-    """
-    [PARAGRAPH] を読み込み、\\n を実際の改行に変換して返す。
-    keys: greeting / main / closing
-    """
-    p = _get_parser()
-    s = p["PARAGRAPH"] if p.has_section("PARAGRAPH") else {}
-    greeting = s.get("GREETING_PARAGRAPH", "").replace("\\n", "\n")
-    main = s.get("MAIN_PARAGRAPH", "").replace("\\n", "\n")
-    closing = (s.get("CLOSING_PARAGRAPH") or s.get("CROSSING_PARAGRAPH", "")).replace("\\n", "\n")
-    return {"greeting": greeting, "main": main, "closing": closing}
+def _load_paragraphs(parser: configparser.ConfigParser) -> Paragraphs:
+    """[PARAGRAPH] を読み込み、\\n を実際の改行に変換する。"""
+    s = parser["PARAGRAPH"] if parser.has_section("PARAGRAPH") else {}
+    return Paragraphs(
+        greeting=ini_text(s.get("GREETING_PARAGRAPH", "")),
+        main=ini_text(s.get("MAIN_PARAGRAPH", "")),
+        closing=ini_text(s.get("CLOSING_PARAGRAPH") or s.get("CROSSING_PARAGRAPH", "")),
+    )
 
 
-def _load_entries(section_name: str) -> List[Dict[str, str]]:
+def _load_entries(parser: configparser.ConfigParser, section_name: str) -> Tuple[Row, ...]:
     """
     指定セクションの entryX を自然順で読み、行数を MIN_ROWS にパディング。
-    戻り値は [{doc_name, note, copies}, ...]
+    戻り値は ({doc_name, note, copies}, ...)
     """
-    p = _get_parser()
-    rows: List[Dict[str, str]] = []
-    if p.has_section(section_name):
-        sec = p[section_name]
+    rows = []
+    if parser.has_section(section_name):
+        sec = parser[section_name]
         for key in sorted(sec.keys(), key=_natural_key):
             rows.append(_parse_entry_line(sec[key]))
-    while len(rows) < MIN_ROWS:
-        rows.append({"doc_name": "", "note": "", "copies": ""})
-    return rows
+    rows.extend([_EMPTY_ROW] * (MIN_ROWS - len(rows)))
+    return tuple(rows)
 
 
 _SECTION_MAP = {
@@ -90,20 +105,29 @@ _SECTION_MAP = {
 }
 
 
-def get_required_doc_defaults(client_type: ClientType) -> Dict[str, List[Dict[str, str]]]:
+def _build(parser: configparser.ConfigParser) -> RequiredConfig:
+    defaults: Dict[ClientType, RequiredDefaults] = {
+        client_type: RequiredDefaults(
+            mailed=_load_entries(parser, sec["mailed"]),
+            requested=_load_entries(parser, sec["requested"]),
+        )
+        for client_type, sec in _SECTION_MAP.items()
+    }
+    return RequiredConfig(paragraphs=_load_paragraphs(parser), defaults=MappingProxyType(defaults))
+
+
+_config = register_config("required", CONFIG_FILE, _build)
+
+
+# ---- 公開 API（戻り値は読み取り専用・全リクエストで共有） ----
+def load_paragraphs() -> Paragraphs:
+    """[PARAGRAPH] の greeting / main / closing。"""
+    return _config.get().paragraphs
+
+
+def get_required_doc_defaults(client_type: ClientType) -> RequiredDefaults:
     """
     クライアント種別に応じ、送付/返送の既定行を返す。
-    戻り値:
-      {
-        "mailed":    [{doc_name, note, copies}, ...],
-        "requested": [{doc_name, note, copies}, ...]
-      }
+    対象外の種別は空行だけ。
     """
-    sec = _SECTION_MAP.get(client_type)
-    if not sec:
-        empty = [{"doc_name": "", "note": "", "copies": ""} for _ in range(MIN_ROWS)]
-        return {"mailed": empty, "requested": empty}
-
-    mailed = _load_entries(sec["mailed"])
-    requested = _load_entries(sec["requested"])
-    return {"mailed": mailed, "requested": requested}
\ No newline at end of file
+    return _config.get().defaults.get(client_type) or RequiredDefaults()
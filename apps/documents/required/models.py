@@ -1,6 +1,9 @@
 ### apps/documents/required/models.py
 from datetime import datetime
 from db import db
+from sqlalchemy import Computed, Index, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from apps.common.fulltext import text_expr, tsv_expr, search_indexes
 from sqlalchemy.dialects.postgresql import JSONB
 from typing import Dict
 
@@ -20,6 +23,22 @@ class RequiredDocument(db.Model):
     # 日付
     sent_date = db.Column(db.Date, nullable=True)  # 送信日
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # 行の版（詳細画面の HTML キャッシュのキー。apps/common/fragment_cache.py）
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow,
+                           onupdate=datetime.utcnow, server_default=func.now())
     # リレーション
     client_id = db.Column(db.Integer, db.ForeignKey("client.id"), nullable=False)
     client = db.relationship("Client", back_populates="required_documents")
+
+    # 検索用の生成列（apps/common/fulltext.py・検索は apps/search）
+    search_text = db.Column(db.Text, Computed(text_expr("entrusted_book_name"), persisted=True))
+    search_tsv  = db.Column(TSVECTOR, Computed(tsv_expr("entrusted_book_name"), persisted=True))
+
+    # 一覧のキーセットページング用（(created_at, id) で並べて続きから読む）
+    # •	全件一覧 → ix_required_document_created_id
+    # •	client_id で絞った一覧 → ix_required_document_client_created_id
+    __table_args__ = (
+        Index("ix_required_document_created_id", "created_at", "id"),
+        Index("ix_required_document_client_created_id", "client_id", "created_at", "id"),
+        *search_indexes("required_document"),
+    )
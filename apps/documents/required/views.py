@@ -5,9 +5,14 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import joinedload
 from datetime import datetime
+from typing import Mapping, Sequence
 from apps.common.forms import CSRFOnlyForm
+from apps.common.pagination import paginate_keyset
 from db import db
 from apps.documents.required.models import RequiredDocument
+from apps.documents.constants import DocumentType
+from apps.documents.detail_cache import render_detail
+from apps.documents.pdf import PdfJob, send_pdf
 from apps.documents.required.forms import RequiredDocumentForm
 from apps.documents.required.config_loader import load_paragraphs, get_required_doc_defaults
 from apps.client.models import Client
@@ -39,7 +44,7 @@ def _commit_with_flash(ok_msg: str, ng_msg: str) -> bool:
 
 from wtforms import FieldList
 
-def _fill_field_list(field_list: FieldList, rows: list[dict[str, str]]):
+def _fill_field_list(field_list: FieldList, rows: Sequence[Mapping[str, str]]):
     """
     rows: [{doc_name, note, copies}] を FieldList<FormField(DocumentItemForm)> に流し込む。
     """
@@ -78,16 +83,20 @@ def _collect_field_list(field_list: FieldList) -> list[dict[str, str]]:
 @required_bp.route("/")
 def index() -> str:
     client_id = request.args.get("client_id", type=int)
-    q = (RequiredDocument.query
-         .options(joinedload(RequiredDocument.client))
-         .order_by(RequiredDocument.created_at.desc(), RequiredDocument.id.desc()))
+    q = RequiredDocument.query.options(joinedload(RequiredDocument.client))
     if client_id:
         q = q.filter(RequiredDocument.client_id == client_id)
 
-    documents = q.all()
+    page = paginate_keyset(
+        q,
+        sortable={"created_at": RequiredDocument.created_at},
+        default_sort="created_at",
+        id_column=RequiredDocument.id,
+    )
     return render_template(
         "required/index.html",
-        documents=documents,
+        documents=page.items,
+        page=page,
         client_id=client_id,
     )
 
@@ -95,12 +104,37 @@ def index() -> str:
 # --------------------------
 # Detail（詳細）
 # --------------------------
+def _render_detail(doc: RequiredDocument) -> str:
+    """詳細画面の HTML。PDF も同じものから作る（書類と設定が変わらない間はキャッシュ：apps/documents/detail_cache.py）。"""
+    return render_detail(DocumentType.REQUIRED, doc, lambda: render_template("required/detail.html", document=doc))
+
+
 @required_bp.route("/<int:document_id>")
 def detail(document_id: int) -> str:
     doc = (RequiredDocument.query
            .options(joinedload(RequiredDocument.client))
            .get_or_404(document_id))
-    return render_template("required/detail.html", document=doc)
+    return _render_detail(doc)
+
+
+# --------------------------
+# PDF
+# --------------------------
+def pdf_job(doc: RequiredDocument) -> PdfJob:
+    """PDF にする内容（詳細画面の HTML）。受託簿の ZIP 出力からも使う。"""
+    return PdfJob(
+        DocumentType.REQUIRED, doc.id,
+        html=_render_detail(doc),
+        filename=f"必要書類のご案内_{doc.client.name}.pdf",
+    )
+
+
+@required_bp.route("/<int:document_id>/pdf")
+def pdf(document_id: int):
+    doc = (RequiredDocument.query
+           .options(joinedload(RequiredDocument.client))
+           .get_or_404(document_id))
+    return send_pdf(pdf_job(doc), fallback_url=url_for("required.detail", document_id=doc.id))
 
 
 # --------------------------
@@ -128,14 +162,14 @@ def create():
     if request.method == "GET":
         # 段落: config_loader から流し込み
         paras = load_paragraphs()
-        form.greeting_paragraph.data = paras.get("greeting", "")
-        form.main_paragraph.data = paras.get("main", "")
-        form.closing_paragraph.data = paras.get("closing", "")
+        form.greeting_paragraph.data = paras.greeting
+        form.main_paragraph.data = paras.main
+        form.closing_paragraph.data = paras.closing
 
         # 明細（送付/返送）: client.client_type に応じて既定行を注入
         defaults = get_required_doc_defaults(client.client_type)
-        _fill_field_list(form.mailed_documents, defaults["mailed"])
-        _fill_field_list(form.requested_return_documents, defaults["requested"])
+        _fill_field_list(form.mailed_documents, defaults.mailed)
+        _fill_field_list(form.requested_return_documents, defaults.requested)
 
         # 受託簿名: クライアントにぶら下がる受託簿名があるなら初期値に
         if client.entrusted_book:
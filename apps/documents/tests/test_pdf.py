@@ -0,0 +1,112 @@
+# apps/documents/tests/test_pdf.py
+"""
+PDF のキャッシュ（apps/documents/pdf.py）の確認。変換そのもの（WeasyPrint）は呼ばず、
+プールなし（PDF_RENDER_WORKERS=0）で変換関数を差し替える（時間切れの確認だけは実際のプールを使う）。
+"""
+import os
+import time
+
+import pytest
+from flask import Flask
+
+import settings
+from apps import create_app
+from apps.documents import pdf
+from apps.documents.constants import DocumentType
+
+
+@pytest.fixture()
+def renders(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PDF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PDF_RENDER_WORKERS", 0)
+    calls = []
+
+    def fake_render(html, base_url, static_dirs):
+        calls.append(html)
+        return b"%PDF " + html.encode()
+
+    monkeypatch.setattr(pdf, "_render_in_worker", fake_render)
+    with Flask(__name__).app_context():
+        yield calls
+
+
+def _job(html="<p>1</p>", doc_id=1, variant="invoice"):
+    return pdf.PdfJob(DocumentType.AMOUNT, doc_id, html, filename="請求書.pdf", variant=variant)
+
+
+def test_second_render_is_a_cache_hit(renders):
+    assert pdf.render_pdf(_job()) == b"%PDF <p>1</p>"
+    assert pdf.render_pdf(_job()) == b"%PDF <p>1</p>"
+    assert len(renders) == 1
+
+
+def test_changed_html_renders_again_and_replaces_old_file(renders):
+    pdf.render_pdf(_job("<p>1</p>"))
+    pdf.render_pdf(_job("<p>2</p>"))
+    pdf.render_pdf(_job("<p>1</p>", variant="receipt"))
+    assert len(renders) == 3
+    names = sorted(os.listdir(settings.PDF_CACHE_DIR))
+    assert len(names) == 2   # 同じ版の古いファイルは消える・別の版は残る
+    assert names[0].startswith("amount-1-invoice-") and names[1].startswith("amount-1-receipt-")
+
+
+def test_invalidate_removes_only_that_document(renders):
+    pdf.render_pdf(_job(doc_id=1))
+    pdf.render_pdf(_job(doc_id=12))
+    pdf.invalidate(DocumentType.AMOUNT, 1)
+    assert [n.split("-")[1] for n in os.listdir(settings.PDF_CACHE_DIR)] == ["12"]
+    pdf.render_pdf(_job(doc_id=1))
+    assert len(renders) == 3
+
+
+def test_render_errors_are_reported(renders, monkeypatch):
+    def broken(html, base_url, static_dirs):
+        raise ImportError("weasyprint")
+
+    monkeypatch.setattr(pdf, "_render_in_worker", broken)
+    with pytest.raises(pdf.PdfRenderError):
+        pdf.render_pdf(_job())
+    assert os.listdir(settings.PDF_CACHE_DIR) == []
+
+
+def _hang(html, base_url, static_dirs):
+    time.sleep(60)
+
+
+def test_timeout_stops_the_running_render(tmp_path, monkeypatch):
+    """時間切れの変換はプロセスごと止め、プールを作り直す（枠を使い続けない）。"""
+    monkeypatch.setattr(settings, "PDF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PDF_RENDER_WORKERS", 1)
+    monkeypatch.setattr(settings, "PDF_RENDER_TIMEOUT", 1)
+    monkeypatch.setattr(pdf, "_render_in_worker", _hang)
+    monkeypatch.setattr(pdf, "_pool", None)
+    processes = []
+    real_submit = pdf._submit
+
+    def submit(job, pool):
+        future = real_submit(job, pool)
+        processes.extend(pool._processes.values())
+        return future
+
+    monkeypatch.setattr(pdf, "_submit", submit)
+    with Flask(__name__).app_context():
+        with pytest.raises(pdf.PdfRenderError, match="1 秒"):
+            pdf.render_pdf(_job())
+    assert pdf._pool is None
+    assert processes
+    for process in processes:
+        process.join(timeout=10)
+        assert not process.is_alive()
+
+
+def test_send_pdf_returns_503_with_the_error(renders, monkeypatch):
+    def broken(html, base_url, static_dirs):
+        raise ValueError("壊れた HTML")
+
+    monkeypatch.setattr(pdf, "_render_in_worker", broken)
+    app = create_app()
+    with app.test_request_context("/"):
+        response = pdf.send_pdf(_job(), fallback_url="/amount/1")
+    assert response.status_code == 503
+    body = response.get_data(as_text=True)
+    assert "壊れた HTML" in body and 'href="/amount/1"' in body
@@ -0,0 +1,164 @@
+# apps/entrusted_book/export.py
+"""
+受託簿の書類一式を ZIP で出力する（案件の完了時の保存用）。
+
+    {クライアントid}_{氏名}/{種類}_{書類id}[_{見積|請求|領収}].pdf  … 各書類の PDF（apps/documents/pdf.py）
+    manifest.json                                               … 受託簿・クライアント・各ファイルの一覧
+
+- ZIP はメモリに溜めずにストリームで返す（1ファイル書くごとに、できた分のバイト列を送る）
+- 書類はサーバーサイドカーソル（yield_per）で BATCH_SIZE 件ずつ読み、その分をまとめて PDF 化する
+  （キャッシュに無いものは render_pdfs がプロセスプールで並行に変換する）。使うメモリは
+  受託簿の大きさによらず BATCH_SIZE 件分で、最初のファイルはすぐに送り始める
+- PDF にできなかった書類は詳細画面の HTML を入れ、manifest の errors に理由を残す
+"""
+from __future__ import annotations
+import hashlib
+import io
+import json
+import re
+import zipfile
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import contains_eager, selectinload
+
+from apps.client.models import Client
+from apps.documents.amount.models import AmountDocument
+from apps.documents.amount import views as amount_views
+from apps.documents.required.models import RequiredDocument
+from apps.documents.required import views as required_views
+from apps.documents.delivery.models import DeliveryDocument
+from apps.documents.delivery import views as delivery_views
+from apps.documents.origin.models import OriginDocument
+from apps.documents.origin import views as origin_views
+from apps.documents.pdf import PdfJob, PdfRenderError, render_pdfs
+from apps.entrusted_book.models import EntrustedBook
+from db import db
+
+BATCH_SIZE = 20  # 1回に読む・PDF 化する書類の数（メモリの上限はほぼこれで決まる）
+MANIFEST_NAME = "manifest.json"
+
+
+def _amount_jobs(doc: AmountDocument) -> List[PdfJob]:
+    return [amount_views.pdf_job(doc, kind) for kind in amount_views.issued_kinds(doc)]
+
+
+# モデル → (読み込み時の追加 options, 書類 → PdfJob の並び)
+_SOURCES: List[Tuple[Any, Tuple[Any, ...], Callable[[Any], List[PdfJob]]]] = [
+    (AmountDocument, (selectinload(AmountDocument.items),), _amount_jobs),
+    (RequiredDocument, (), lambda d: [required_views.pdf_job(d)]),
+    (DeliveryDocument, (), lambda d: [delivery_views.pdf_job(d)]),
+    (OriginDocument, (), lambda d: [origin_views.pdf_job(d)]),
+]
+
+
+# =========================
+# ZIP をストリームで書く
+# =========================
+class _ChunkSink(io.RawIOBase):
+    """ZipFile の書き込み先。seek できない出力として扱われ、書かれたバイト列は take() で取り出す。"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        self._chunks.append(data)
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _safe_name(value: str) -> str:
+    """ZIP 内のパスに使えない文字を _ にする。"""
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", (value or "").strip()) or "_"
+
+
+def _entry_path(doc: Any, job: PdfJob, ext: str) -> str:
+    client = doc.client
+    folder = f"{client.id:04d}_{_safe_name(client.name)}"
+    suffix = "" if job.variant == "default" else f"_{job.variant}"
+    return f"{folder}/{job.document_type.value}_{job.document_id}{suffix}.{ext}"
+
+
+def _write(zf: zipfile.ZipFile, path: str, data: bytes) -> None:
+    info = zipfile.ZipInfo(path, date_time=datetime.now().timetuple()[:6])
+    zf.writestr(info, data, compress_type=zf.compression, compresslevel=zf.compresslevel)
+
+
+def _documents(book: EntrustedBook) -> Iterator[Tuple[Callable[[Any], List[PdfJob]], List[Any]]]:
+    """受託簿の書類を種類ごとに BATCH_SIZE 件ずつ（サーバーサイドカーソル）。"""
+    for model, options, to_jobs in _SOURCES:
+        stmt = (
+            select(model)
+            .join(model.client)
+            .where(Client.entrusted_book_id == book.id)
+            .options(contains_eager(model.client), *options)  # join した client をそのまま使う
+            .order_by(model.client_id, model.id)
+            .execution_options(yield_per=BATCH_SIZE)
+        )
+        for batch in db.session.scalars(stmt).partitions():
+            yield to_jobs, batch
+
+
+def stream_book_zip(book: EntrustedBook) -> Iterator[bytes]:
+    """
+    ZIP のバイト列を少しずつ返すジェネレータ（Flask の Response にそのまま渡す）。
+    テンプレートの描画と DB の読み込みをするので stream_with_context で包むこと。
+    """
+    sink = _ChunkSink()
+    files: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for to_jobs, batch in _documents(book):
+            pairs = [(doc, job) for doc in batch for job in to_jobs(doc)]
+            owner = {id(job): doc for doc, job in pairs}
+            for job, result in render_pdfs([job for _, job in pairs], return_errors=True):
+                doc = owner[id(job)]
+                if isinstance(result, PdfRenderError):
+                    data, path = job.html.encode("utf-8"), _entry_path(doc, job, "html")
+                    errors.append({"path": path, "error": str(result)})
+                else:
+                    data, path = result, _entry_path(doc, job, "pdf")
+                _write(zf, path, data)
+                files.append({
+                    "path": path,
+                    "document_type": job.document_type.value,
+                    "document_id": job.document_id,
+                    "variant": job.variant,
+                    "client_id": doc.client.id,
+                    "client_name": doc.client.name,
+                    "size": len(data),
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                })
+                yield sink.take()
+            for doc in batch:
+                db.session.expunge(doc)  # 読み終えた書類（と明細）を Session から外す（identity map を膨らませない）
+
+        manifest = {
+            "entrusted_book": {
+                "id": book.id,
+                "name": book.name,
+                "contract_date": book.contract_date.isoformat() if book.contract_date else None,
+                "execution_date": book.execution_date.isoformat() if book.execution_date else None,
+            },
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "files": files,
+            "errors": errors,
+        }
+        _write(zf, MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    yield sink.take()  # central directory
@@ -1,5 +1,8 @@
 ### apps/entrusted_book/models.py
 from datetime import datetime
+from sqlalchemy import Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from apps.common.fulltext import text_expr, tsv_expr, search_indexes
 from db import db
 
 
@@ -15,6 +18,10 @@ class EntrustedBook(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
 
+    # 検索用の生成列（apps/common/fulltext.py・検索は apps/search）
+    search_text = db.Column(db.Text, Computed(text_expr("name", "note"), persisted=True))
+    search_tsv  = db.Column(TSVECTOR, Computed(tsv_expr("name", "note"), persisted=True))
+
     # EntrustedBook(1) - Client(多) の関係を表す
     clients = db.relationship(
         'Client',
@@ -22,3 +29,10 @@ class EntrustedBook(db.Model):
         cascade='all, delete-orphan',  # all:子（Client）にも連鎖（cascade）させる delete-orphan:孤児（orphan）になった子を削除する
         lazy='selectin'  #  N+1 を防ぎつつ必要なときにだけロードできるので、EntrustedBook ↔ Client の関係には相性がいい
     )
+
+    # 一覧のキーセットページング用（並び替え列 + id）
+    __table_args__ = (
+        Index("ix_entrusted_book_name_id", "name", "id"),
+        Index("ix_entrusted_book_updated_id", "updated_at", "id"),
+        *search_indexes("entrusted_book"),
+    )
@@ -0,0 +1,303 @@
+# apps/entrusted_book/services.py
+"""
+受託簿の一括処理。
+
+generate_document_set(book):
+    受託簿の全クライアントに標準の書類一式（見積・請求 / 必要書類 / 納品書 / 登記原因証明）を
+    1トランザクションで作る。各書類の create 画面を開いて保存するのと同じ初期値になる。
+    - 初期値（config_loader の既定行・段落、登記原因、当事者）はクライアント種別ごと・受託簿ごとに1回だけ引く
+    - 書類は add_all して flush 1回（INSERT は種類ごとにまとめて送られる）。集計列（amount）と
+      document_index は通常の保存と同じく Session のイベントで揃う
+    - skip_existing=True なら、すでに同じ種類の書類があるクライアントには作らない（やり直し用）
+
+document_summaries(book_id):
+    受託簿の詳細画面用に、クライアントごと・種類ごとの書類の件数と最新の日付（作成日・見積 / 請求 / 領収日・
+    送信日）を返す。4テーブルを UNION ALL して (client_id, 種類) で GROUP BY する1本の SQL で、
+    クライアントの数によらずクエリは1回（クライアントごとに4つのリレーションを読まない）
+"""
+from __future__ import annotations
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Date, cast, func, literal, null, select, union_all
+
+from apps.client.constants import ClientType
+from apps.client.models import Client
+from apps.documents.constants import DocumentType
+from apps.documents.document_index import DocumentIndex
+from apps.documents.amount.config_loader import (
+    get_default_entries_for_client_type,
+    get_note_default_for_client_type,
+)
+from apps.documents.amount.models import AmountDocument
+from apps.documents.required.config_loader import (
+    get_required_doc_defaults,
+    load_paragraphs as load_required_paragraphs,
+)
+from apps.documents.required.models import RequiredDocument
+from apps.documents.delivery.config_loader import (
+    get_default_documents,
+    load_paragraphs as load_delivery_paragraphs,
+)
+from apps.documents.delivery.models import DeliveryDocument
+from apps.documents.origin.config_loader import render_cause_fact
+from apps.documents.origin.constants import CauseType
+from apps.documents.origin.models import OriginDocument
+from apps.documents.origin.views import _party_text_from_book
+from apps.entrusted_book.models import EntrustedBook
+from db import db
+
+# 一括作成する書類（この順で作る）
+DOCUMENT_SET: Tuple[DocumentType, ...] = (
+    DocumentType.AMOUNT,
+    DocumentType.REQUIRED,
+    DocumentType.DELIVERY,
+    DocumentType.ORIGIN,
+)
+
+# 書類の種類 → モデル
+_MODELS = {
+    DocumentType.AMOUNT: AmountDocument,
+    DocumentType.REQUIRED: RequiredDocument,
+    DocumentType.DELIVERY: DeliveryDocument,
+    DocumentType.ORIGIN: OriginDocument,
+}
+_TYPES = {model: doc_type for doc_type, model in _MODELS.items()}
+
+
+@dataclass
+class GenerationResult:
+    created: Dict[DocumentType, int] = field(default_factory=dict)  # 種類ごとの作成件数
+    skipped: int = 0                                                 # 作成済みで飛ばした数
+    clients: int = 0
+    elapsed: float = 0.0                                             # 秒
+
+    @property
+    def total(self) -> int:
+        return sum(self.created.values())
+
+    def summary(self) -> str:
+        counts = ", ".join(f"{t.value} {n}" for t, n in self.created.items())
+        return (f"{self.total} 件（{counts or '-'}）/ クライアント {self.clients} 件 / "
+                f"既存スキップ {self.skipped} 件 / {self.elapsed:.2f} 秒")
+
+
+# =========================
+# 書類ごとの初期値（create 画面の GET と同じ）
+# =========================
+def _rows(rows: Iterable[Any], keys: Sequence[str]) -> List[Dict[str, str]]:
+    """config の既定行 → JSONB に入れる dict（空行は落とす：_collect_* と同じ）。"""
+    out = []
+    for row in rows:
+        values = {k: (row.get(k) or "").strip() for k in keys}
+        if any(values.values()):
+            out.append(values)
+    return out
+
+
+class _Builder:
+    """受託簿1つ分の書類を組み立てる。初期値はクライアント種別ごとに1回だけ作ってキャッシュする。"""
+
+    def __init__(self, book: EntrustedBook):
+        self.book = book
+        self._per_type: Dict[Tuple[DocumentType, ClientType], Dict[str, Any]] = {}
+        # 受託簿単位の初期値（種別によらない）
+        self._required_paras = load_required_paragraphs()
+        self._delivery_paras = load_delivery_paragraphs()
+        right_txt, oblig_txt = _party_text_from_book(book)
+        self._origin = {
+            "right_holders": right_txt,
+            "obligation_holders": oblig_txt,
+            "cause_type_id": CauseType.SALE.value,
+            "cause_fact": render_cause_fact(
+                CauseType.SALE,
+                contract_date=book.contract_date,
+                execution_date=book.execution_date,
+            ),
+        }
+
+    def _defaults(self, doc_type: DocumentType, client_type: ClientType,
+                  load: Callable[[ClientType], Dict[str, Any]]) -> Dict[str, Any]:
+        key = (doc_type, client_type)
+        if key not in self._per_type:
+            self._per_type[key] = load(client_type)
+        return self._per_type[key]
+
+    # ---- 種類ごと ----
+    def amount(self, client) -> AmountDocument:
+        defaults = self._defaults(DocumentType.AMOUNT, client.client_type, lambda ct: {
+            "note": get_note_default_for_client_type(ct),
+            "entries": get_default_entries_for_client_type(ct),
+        })
+        entries = defaults["entries"]
+        doc = AmountDocument(
+            client_id=client.id,
+            entrusted_book_name=self.book.name,
+            note=defaults["note"],
+        )
+        doc.set_items_normalized(
+            item_types_list=list(entries.item_types),
+            reward_list=list(entries.reward_amounts),
+            expense_list=list(entries.expense_amounts),
+        )
+        return doc
+
+    def required(self, client) -> RequiredDocument:
+        def load(ct: ClientType) -> Dict[str, Any]:
+            rows = get_required_doc_defaults(ct)
+            return {
+                "mailed": _rows(rows.mailed, ("doc_name", "note", "copies")),
+                "requested": _rows(rows.requested, ("doc_name", "note", "copies")),
+            }
+        defaults = self._defaults(DocumentType.REQUIRED, client.client_type, load)
+        paras = self._required_paras
+        return RequiredDocument(
+            client_id=client.id,
+            entrusted_book_name=self.book.name,
+            greeting_paragraph=paras.greeting or "",
+            main_paragraph=paras.main or "",
+            closing_paragraph=paras.closing or "",
+            # 行の dict は書類ごとに別にする（JSONB の変更検知が共有されないように）
+            mailed_documents=[dict(r) for r in defaults["mailed"]],
+            requested_return_documents=[dict(r) for r in defaults["requested"]],
+        )
+
+    def delivery(self, client) -> DeliveryDocument:
+        defaults = self._defaults(DocumentType.DELIVERY, client.client_type, lambda ct: {
+            "documents": _rows(get_default_documents(ct), ("doc_name", "copies")),
+        })
+        paras = self._delivery_paras
+        return DeliveryDocument(
+            client_id=client.id,
+            entrusted_book_name=self.book.name,
+            greeting_paragraph=paras.greeting or "",
+            closing_paragraph=paras.closing or "",
+            documents=[dict(r) for r in defaults["documents"]],
+        )
+
+    def origin(self, client) -> OriginDocument:
+        return OriginDocument(client_id=client.id, real_estate_descriptions=[], **self._origin)
+
+    def build(self, doc_type: DocumentType, client):
+        return getattr(self, doc_type.value)(client)
+
+
+def build_document_set(book: EntrustedBook, clients: Iterable[Any] = None, *,
+                       kinds: Sequence[DocumentType] = DOCUMENT_SET,
+                       exclude: Set[Tuple[int, str]] = frozenset()) -> List[Any]:
+    """
+    未保存の書類オブジェクトを返す（Session には入れない）。
+    exclude: 作らない (client_id, document_type) の組。
+    """
+    builder = _Builder(book)
+    documents = []
+    for doc_type in kinds:
+        for client in (book.clients if clients is None else clients):
+            if (client.id, doc_type.value) in exclude:
+                continue
+            documents.append(builder.build(doc_type, client))
+    return documents
+
+
+# =========================
+# 一括作成
+# =========================
+def _existing_pairs(client_ids: List[int], kinds: Sequence[DocumentType]) -> Set[Tuple[int, str]]:
+    """作成済みの (client_id, document_type)。document_index を1回引くだけ。"""
+    if not client_ids:
+        return set()
+    rows = db.session.execute(
+        select(DocumentIndex.client_id, DocumentIndex.document_type)
+        .where(DocumentIndex.client_id.in_(client_ids),
+               DocumentIndex.document_type.in_([t.value for t in kinds]))
+        .distinct()
+    )
+    return {(r.client_id, r.document_type) for r in rows}
+
+
+def generate_document_set(book: EntrustedBook, *,
+                          kinds: Sequence[DocumentType] = DOCUMENT_SET,
+                          skip_existing: bool = True) -> GenerationResult:
+    """
+    受託簿の全クライアントに書類一式を作って commit する（全部作るか、何も作らないか）。
+    失敗時は SQLAlchemyError をそのまま上げる（rollback は呼び出し側）。
+    """
+    start = time.perf_counter()
+    clients = list(book.clients)
+    exclude = _existing_pairs([c.id for c in clients], kinds) if skip_existing else set()
+
+    documents = build_document_set(book, clients, kinds=kinds, exclude=exclude)
+    db.session.add_all(documents)
+    db.session.flush()   # 1回の flush で種類ごとにまとめて INSERT（明細・document_index も同じ flush）
+    db.session.commit()
+
+    created: Dict[DocumentType, int] = {t: 0 for t in kinds}
+    for doc in documents:
+        created[_TYPES[type(doc)]] += 1
+    return GenerationResult(
+        created=created,
+        skipped=len(exclude),
+        clients=len(clients),
+        elapsed=time.perf_counter() - start,
+    )
+
+
+# =========================
+# クライアントごとの書類の件数（詳細画面）
+# =========================
+# 集計する日付列（その列を持たない書類は NULL）
+SUMMARY_DATES: Tuple[str, ...] = ("estimate_date", "invoice_date", "receipt_date", "sent_date")
+
+
+@dataclass
+class DocumentSummary:
+    count: int = 0
+    latest_created: Optional[datetime] = None
+    dated: Dict[str, int] = field(default_factory=dict)     # 日付列 → 日付の入っている件数（請求済みの数など）
+    latest: Dict[str, date] = field(default_factory=dict)   # 日付列 → 最新の日付
+
+
+def _summary_stmt(book_id: int):
+    """受託簿のクライアントの書類を (client_id, 種類) ごとに集計する SELECT（1本）。"""
+    branches = []
+    for doc_type in DOCUMENT_SET:
+        model = _MODELS[doc_type]
+        dates = [
+            (getattr(model, name) if hasattr(model, name) else cast(null(), Date)).label(name)
+            for name in SUMMARY_DATES
+        ]
+        branches.append(
+            select(model.client_id.label("client_id"),
+                   literal(doc_type.value).label("document_type"),
+                   model.created_at.label("created_at"),
+                   *dates)
+            .join(Client, Client.id == model.client_id)
+            .where(Client.entrusted_book_id == book_id)
+        )
+    docs = union_all(*branches).subquery("docs")
+    return (
+        select(docs.c.client_id, docs.c.document_type,
+               func.count().label("count"),
+               func.max(docs.c.created_at).label("latest_created"),
+               *[func.count(docs.c[name]).label(f"{name}_count") for name in SUMMARY_DATES],
+               *[func.max(docs.c[name]).label(f"{name}_latest") for name in SUMMARY_DATES])
+        .group_by(docs.c.client_id, docs.c.document_type)
+    )
+
+
+def document_summaries(book_id: int) -> Dict[int, Dict[DocumentType, DocumentSummary]]:
+    """
+    client_id → 種類 → DocumentSummary。書類の無いクライアント・種類は含まない
+    （テンプレートでは summaries.get(client.id, {}).get(type) のように引く）。
+    """
+    out: Dict[int, Dict[DocumentType, DocumentSummary]] = {}
+    for row in db.session.execute(_summary_stmt(book_id)):
+        summary = DocumentSummary(count=row.count, latest_created=row.latest_created)
+        for name in SUMMARY_DATES:
+            if getattr(row, f"{name}_count"):
+                summary.dated[name] = getattr(row, f"{name}_count")
+                summary.latest[name] = getattr(row, f"{name}_latest")
+        out.setdefault(row.client_id, {})[DocumentType(row.document_type)] = summary
+    return out
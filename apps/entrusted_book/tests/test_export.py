@@ -0,0 +1,80 @@
+# apps/entrusted_book/tests/test_export.py
+"""
+受託簿の ZIP 出力（apps/entrusted_book/export.py）の確認。
+DB は読まず（_documents を差し替え）、PDF はプールなしで変換関数を差し替える。
+"""
+import io
+import json
+import zipfile
+from datetime import date
+
+import pytest
+
+import settings
+from apps import create_app
+from apps.client.models import Client
+from apps.common import fragment_cache
+from apps.documents import pdf
+from apps.documents.amount.models import AmountDocument
+from apps.documents.delivery.models import DeliveryDocument
+from apps.entrusted_book import export
+from apps.entrusted_book.models import EntrustedBook
+
+
+@pytest.fixture()
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PDF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PDF_RENDER_WORKERS", 0)
+    monkeypatch.setattr(pdf, "_render_in_worker", lambda html, base_url, static_dirs: b"%PDF-1.7 fake")
+    monkeypatch.setattr(export.db.session, "expunge", lambda obj: None)
+    monkeypatch.setattr(fragment_cache, "_backend", fragment_cache.NullBackend())
+    return create_app()
+
+
+def _batches():
+    client = Client(id=7, name="甲野 太郎", client_type_id=1)
+    amount = AmountDocument(id=1, client=client, entrusted_book_name="甲野売買",
+                            apply_consumption_tax=True, apply_withholding=False,
+                            estimate_date=date(2026, 4, 1), invoice_date=date(2026, 4, 10))
+    amount.set_items_normalized(["登記"], [10000], [0])
+    delivery = DeliveryDocument(id=2, client=client, entrusted_book_name="甲野売買",
+                                greeting_paragraph="", closing_paragraph="", documents=[])
+    return [(export._amount_jobs, [amount]), (lambda d: [export.delivery_views.pdf_job(d)], [delivery])]
+
+
+def test_streams_a_valid_zip_with_manifest(app, monkeypatch):
+    monkeypatch.setattr(export, "_documents", lambda book: iter(_batches()))
+    book = EntrustedBook(id=3, name="甲野売買")
+    with app.test_request_context("/"):
+        chunks = list(export.stream_book_zip(book))
+
+    assert len(chunks) == 4   # 1ファイルごと（見積・請求・納品書）+ manifest と central directory
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+        names = zf.namelist()
+        assert names == [
+            "0007_甲野_太郎/amount_1_estimate.pdf",
+            "0007_甲野_太郎/amount_1_invoice.pdf",
+            "0007_甲野_太郎/delivery_2.pdf",
+            export.MANIFEST_NAME,
+        ]
+        assert zf.read(names[0]) == b"%PDF-1.7 fake"
+        manifest = json.loads(zf.read(export.MANIFEST_NAME))
+    assert manifest["entrusted_book"]["name"] == "甲野売買"
+    assert [f["path"] for f in manifest["files"]] == names[:3]
+    assert manifest["errors"] == []
+
+
+def test_falls_back_to_html_when_pdf_fails(app, monkeypatch):
+    def broken(html, base_url, static_dirs):
+        raise OSError("no pango")
+
+    monkeypatch.setattr(pdf, "_render_in_worker", broken)
+    monkeypatch.setattr(export, "_documents", lambda book: iter(_batches()[1:]))
+    with app.test_request_context("/"):
+        data = b"".join(export.stream_book_zip(EntrustedBook(id=3, name="甲野売買")))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.namelist() == ["0007_甲野_太郎/delivery_2.html", export.MANIFEST_NAME]
+        assert "納品書" in zf.read("0007_甲野_太郎/delivery_2.html").decode("utf-8")
+        manifest = json.loads(zf.read(export.MANIFEST_NAME))
+    assert manifest["errors"][0]["path"] == "0007_甲野_太郎/delivery_2.html"
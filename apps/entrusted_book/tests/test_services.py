@@ -0,0 +1,97 @@
+# apps/entrusted_book/tests/test_services.py
+"""
+書類一式の組み立て（apps/entrusted_book/services.py の build_document_set）と、
+詳細画面の書類の集計（document_summaries）の確認。
+DB には保存しない（未保存のモデルを組み立てるところ・SQL の形と結果の詰め替えまで）。
+"""
+from collections import namedtuple
+from datetime import date, datetime
+
+from sqlalchemy.dialects import postgresql
+
+from apps.client.constants import ClientType
+from apps.client.models import Client
+from apps.documents.amount.models import AmountDocument
+from apps.documents.constants import DocumentType
+from apps.documents.origin.models import OriginDocument
+from apps.entrusted_book import services
+from apps.entrusted_book.models import EntrustedBook
+
+
+def _book():
+    return EntrustedBook(name="甲野売買", clients=[
+        Client(id=1, name="甲野太郎", address="東京都", client_type_id=ClientType.RIGHT_HOLDER.value),
+        Client(id=2, name="乙野花子", address="大阪府", client_type_id=ClientType.OBLIGATION_HOLDER.value),
+        Client(id=3, name="丙野次郎", address="京都府", client_type_id=ClientType.RIGHT_HOLDER.value),
+    ])
+
+
+def test_builds_one_of_each_type_per_client():
+    docs = services.build_document_set(_book())
+    assert len(docs) == 3 * len(services.DOCUMENT_SET)
+    assert [type(d) for d in docs[:3]] == [AmountDocument] * 3
+    amount = docs[0]
+    assert amount.client_id == 1 and amount.entrusted_book_name == "甲野売買"
+    assert amount.grand_total == amount.compute_totals()["grand_total"]
+    origin = [d for d in docs if isinstance(d, OriginDocument)]
+    assert all("甲野太郎" in d.right_holders and "乙野花子" in d.obligation_holders for d in origin)
+
+
+def test_defaults_are_loaded_once_per_client_type(monkeypatch):
+    calls = []
+    original = services.get_default_entries_for_client_type
+    monkeypatch.setattr(services, "get_default_entries_for_client_type",
+                        lambda ct: calls.append(ct) or original(ct))
+    services.build_document_set(_book(), kinds=(DocumentType.AMOUNT,))
+    assert calls == [ClientType.RIGHT_HOLDER, ClientType.OBLIGATION_HOLDER]
+
+
+def test_excluded_pairs_are_skipped():
+    docs = services.build_document_set(
+        _book(), kinds=(DocumentType.AMOUNT, DocumentType.ORIGIN),
+        exclude={(1, "amount"), (2, "origin")},
+    )
+    assert sorted((d.client_id, type(d).__name__) for d in docs) == [
+        (1, "OriginDocument"), (2, "AmountDocument"),
+        (3, "AmountDocument"), (3, "OriginDocument"),
+    ]
+
+
+def test_summary_is_one_grouped_statement():
+    sql = str(services._summary_stmt(1).compile(dialect=postgresql.dialect()))
+    assert sql.count("UNION ALL") == len(services.DOCUMENT_SET) - 1
+    assert sql.rstrip().endswith("GROUP BY docs.client_id, docs.document_type")
+
+
+def test_summary_rows_are_grouped_by_client_and_type(monkeypatch):
+    names = ["client_id", "document_type", "count", "latest_created"]
+    names += [f"{n}_count" for n in services.SUMMARY_DATES] + [f"{n}_latest" for n in services.SUMMARY_DATES]
+    Row = namedtuple("Row", names)
+    rows = [
+        Row(1, "amount", 2, datetime(2025, 9, 1), 2, 1, 0, 0, date(2025, 9, 1), date(2025, 10, 1), None, None),
+        Row(1, "origin", 1, datetime(2025, 9, 2), 0, 0, 0, 0, None, None, None, None),
+    ]
+    calls = []
+    monkeypatch.setattr(services.db.session, "execute", lambda stmt: calls.append(stmt) or rows)
+
+    summaries = services.document_summaries(5)
+    assert len(calls) == 1
+    amount = summaries[1][DocumentType.AMOUNT]
+    assert amount.count == 2
+    assert amount.dated == {"estimate_date": 2, "invoice_date": 1}
+    assert amount.latest["invoice_date"] == date(2025, 10, 1)
+    assert summaries[1][DocumentType.ORIGIN].latest == {}
+    assert DocumentType.REQUIRED not in summaries[1]
+
+
+def test_generation_result_page_shows_counts_and_time():
+    from flask import render_template
+    from apps import create_app
+
+    result = services.GenerationResult(created={DocumentType.AMOUNT: 3, DocumentType.ORIGIN: 3},
+                                       skipped=2, clients=3, elapsed=1.234)
+    book = EntrustedBook(id=5, name="甲野売買")
+    with create_app().test_request_context("/"):
+        html = render_template("entrusted_book/generated.html", book=book, result=result, error=None)
+    assert result.summary() in html
+    assert "6 件" in html and "1.23 秒" in html
@@ -1,11 +1,16 @@
 # apps/entrusted_book/views.py
 from __future__ import annotations
-from sqlalchemy.orm import selectinload
-from flask import Blueprint, render_template, redirect, url_for, flash
+import click
+from sqlalchemy.orm import lazyload, selectinload
+from urllib.parse import quote
+from flask import Blueprint, Response, render_template, redirect, url_for, flash, stream_with_context
 from sqlalchemy.exc import SQLAlchemyError
 from apps.common.forms import CSRFOnlyForm
+from apps.common.pagination import paginate_keyset
 from apps.entrusted_book.forms import EntrustedBookForm
 from apps.entrusted_book.models import EntrustedBook
+from apps.entrusted_book import export, services
+from apps.client.models import Client
 from db import db
 
 entrusted_book_bp = Blueprint(
@@ -37,8 +42,15 @@ def _commit_with_flash(ok_msg: str, ng_msg: str) -> bool:
 # --------------------------
 @entrusted_book_bp.route("/")
 def index():
-    books = EntrustedBook.query.order_by(EntrustedBook.name).all()
-    return render_template("entrusted_book/index.html", books=books)
+    # 一覧では clients を使わないので、既定の selectin（ページ分のクライアント全件）を止める
+    page = paginate_keyset(
+        EntrustedBook.query.options(lazyload(EntrustedBook.clients)),
+        sortable={"name": EntrustedBook.name, "updated_at": EntrustedBook.updated_at},
+        default_sort="name",
+        default_dir="asc",
+        id_column=EntrustedBook.id,
+    )
+    return render_template("entrusted_book/index.html", books=page.items, page=page)
 
 
 # --------------------------
@@ -47,9 +59,14 @@ def index():
 @entrusted_book_bp.route("/<int:book_id>")
 def detail(book_id: int):
     book = (EntrustedBook.query
-            .options(selectinload(EntrustedBook.clients))
+            # _detail.html がクライアントごとに corporate_profile を見るので一緒に読む
+            .options(selectinload(EntrustedBook.clients).selectinload(Client.corporate_profile))
             .get_or_404(book_id))
-    return render_template("entrusted_book/overview.html", book=book, clients=book.clients)
+    # クライアントごとの書類の件数・最新の日付は1回の集計クエリで（書類のリレーションは読まない）
+    return render_template("entrusted_book/overview.html", book=book, clients=book.clients,
+                           summaries=services.document_summaries(book.id),
+                           document_types=services.DOCUMENT_SET,
+                           form=CSRFOnlyForm())
 
 
 # --------------------------
@@ -137,3 +154,55 @@ def delete(book_id: int):
     if _commit_with_flash("受託簿を削除しました。", "受託簿の削除に失敗しました。"):
         return redirect(url_for("entrusted_book.index"))
     return redirect(url_for("entrusted_book.detail", book_id=book_id))
+
+
+# --------------------------
+# Generate Documents（全クライアントの書類一式を一括作成）
+# --------------------------
+@entrusted_book_bp.route("/<int:book_id>/generate-documents", methods=["POST"])
+def generate_documents(book_id: int):
+    form = CSRFOnlyForm()
+    if not form.validate_on_submit():
+        flash("不正なリクエストです。（CSRF）", "danger")
+        return redirect(url_for("entrusted_book.detail", book_id=book_id))
+
+    book = EntrustedBook.query.get_or_404(book_id)
+    # 作成件数・所要時間は結果ページに出す（受託簿の画面はフラッシュを表示しない）
+    try:
+        result = services.generate_document_set(book)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return render_template("entrusted_book/generated.html", book=book, result=None, error=str(e)), 500
+    return render_template("entrusted_book/generated.html", book=book, result=result, error=None)
+
+
+# --------------------------
+# Export（全書類の ZIP。ストリームで返す）
+# --------------------------
+@entrusted_book_bp.route("/<int:book_id>/export.zip")
+def export_zip(book_id: int):
+    book = EntrustedBook.query.options(lazyload(EntrustedBook.clients)).get_or_404(book_id)
+    filename = f"{book.name}_{book.id}.zip"
+    return Response(
+        stream_with_context(export.stream_book_zip(book)),
+        mimetype="application/zip",
+        headers={
+            "Content-Disposition": (f'attachment; filename="entrusted_book_{book.id}.zip"; '
+                                    f"filename*=UTF-8''{quote(filename)}"),
+            "X-Accel-Buffering": "no",  # nginx でバッファせずに流す
+        },
+    )
+
+# --------------------------
+# CLI: flask entrusted_book generate-documents BOOK_ID
+# --------------------------
+@entrusted_book_bp.cli.command("generate-documents")
+@click.argument("book_id", type=int)
+@click.option("--force", is_flag=True, help="作成済みの書類があっても作る（既定はスキップ）")
+def generate_documents_command(book_id: int, force: bool) -> None:
+    """受託簿の全クライアントに書類一式（見積・請求 / 必要書類 / 納品書 / 登記原因証明）を作る。"""
+    book = db.session.get(EntrustedBook, book_id)
+    if book is None:
+        raise click.ClickException(f"entrusted_book #{book_id} がありません")
+    result = services.generate_document_set(book, skip_existing=not force)
+    click.echo(f"{book.name}: {result.summary()}")
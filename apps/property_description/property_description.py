@@ -1,4 +1,3 @@
-import pdfplumber
 import re
 from enum import Enum
 from typing import Optional, Dict, Any
@@ -51,6 +50,7 @@ def extract_real_estate_display_as_dict(pdf_path: str) -> Dict[str, Any]:
     in_section = False
     real_estate_number: Optional[str] = None  # 不動産番号格納用
 
+    import pdfplumber  # 重いので使うときだけ読み込む
     with pdfplumber.open(pdf_path) as pdf:
         for page in pdf.pages:
             text = page.extract_text()
@@ -142,6 +142,7 @@ def parse_real_estate_type(pdf_path: str) -> Optional[RealEstateType]:
     PDFから不動産種類（RealEstateType）を判別して返す。
     判別できなければ None。
     """
+    import pdfplumber  # 重いので使うときだけ読み込む
     with pdfplumber.open(pdf_path) as pdf:
         for page in pdf.pages:
             text = page.extract_text()
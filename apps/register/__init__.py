@@ -2,6 +2,11 @@
 from flask import Blueprint
 from .commerce import register_commerce_bp
 from .real_estate import register_real_estate_bp
+from .commands import init_commands
+# モデルは画面（解析器は使うビューの中で import）より先に読み込む。
+# create_app() の db.metadata に parsed_registry / officer_term が無いと、
+# flask schema-check や alembic autogenerate がテーブルを「余分」と判定する
+from .commerce import models as commerce_models  # noqa: F401
 
 register_bp = Blueprint(
     "register",
@@ -13,4 +18,7 @@ register_bp = Blueprint(
 
 # サブルート登録
 register_bp.register_blueprint(register_commerce_bp)
-register_bp.register_blueprint(register_real_estate_bp)
\ No newline at end of file
+register_bp.register_blueprint(register_real_estate_bp)
+
+# CLI: flask register reparse など
+init_commands(register_bp)
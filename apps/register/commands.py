@@ -0,0 +1,40 @@
+# apps/register/commands.py
+"""
+登記簿まわりの CLI コマンド（flask register <command>）。
+"""
+import click
+from flask import Blueprint
+
+
+def init_commands(bp: Blueprint) -> None:
+    """register_bp.cli にコマンドを登録する。"""
+
+    @bp.cli.command("reparse")
+    @click.option("--batch-size", default=100, show_default=True, help="commit 単位の件数")
+    def reparse(batch_size: int) -> None:
+        """parser_version が古い parsed_registry を保存済みテキストから再解析する。"""
+        from apps.register.commerce.pdf.services.store import reparse_outdated
+        count = reparse_outdated(batch_size=batch_size)
+        click.echo(f"re-parsed: {count}")
+
+    @bp.cli.command("sync-profiles")
+    @click.option("--dir", "directory", type=click.Path(exists=True, file_okay=False),
+                  default=None, help="PDF のディレクトリ（省略時は解析済みストアの最新分）")
+    @click.option("--dry-run", is_flag=True, help="更新せず差分だけ表示する")
+    @click.option("--batch-size", default=200, show_default=True, help="突き合わせ・commit 単位の件数")
+    def sync_profiles(directory, dry_run: bool, batch_size: int) -> None:
+        """登記簿の現任代表者を CorporateProfile（代表者名・肩書）に一括反映する。"""
+        from apps.register.commerce.pdf.services import profile_sync
+        records = (profile_sync.records_from_directory(directory) if directory
+                   else profile_sync.records_from_store())
+        report = profile_sync.sync_corporate_profiles(records, dry_run=dry_run, batch_size=batch_size)
+        for line in report.lines():
+            click.echo(line)
+
+    @bp.cli.command("rebuild-officer-terms")
+    @click.option("--batch-size", default=200, show_default=True, help="commit 単位の会社数")
+    def rebuild_officer_terms(batch_size: int) -> None:
+        """officer_term（役員任期）を解析済み登記簿から作り直す（任期ルール変更時など）。"""
+        from apps.register.commerce.pdf.services.officer_terms import rebuild_all
+        count = rebuild_all(batch_size=batch_size)
+        click.echo(f"officer terms: {count}")
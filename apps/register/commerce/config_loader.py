@@ -0,0 +1,57 @@
+# apps/register/commerce/config_loader.py
+import os, configparser
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+
+from apps.common.config_service import register_config
+
+CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.ini")
+
+
+@dataclass(frozen=True)
+class TermYearsConfig:
+    term_years: Mapping[str, int]           # {役職: 任期年数}。'default' キーは既定値
+    company_term_years: Mapping[str, int]   # {会社法人等番号: 任期年数}
+
+
+def _int_section(parser: configparser.ConfigParser, name: str) -> Mapping[str, int]:
+    """'キー = 整数' のセクションを dict に。空や数値以外は無視。"""
+    if not parser.has_section(name):
+        return MappingProxyType({})
+    out: Dict[str, int] = {}
+    for key, raw in parser[name].items():
+        try:
+            out[key] = int((raw or "").strip())
+        except ValueError:
+            continue
+    return MappingProxyType(out)
+
+
+def _build(parser: configparser.ConfigParser) -> TermYearsConfig:
+    return TermYearsConfig(
+        term_years=_int_section(parser, "TERM_YEARS"),
+        company_term_years=_int_section(parser, "COMPANY_TERM_YEARS"),
+    )
+
+
+_config = register_config("commerce", CONFIG_FILE, _build)
+
+
+def load_term_years() -> Mapping[str, int]:
+    """{役職: 任期年数}。'default' キーは既定値。"""
+    return _config.get().term_years
+
+
+def load_company_term_years() -> Mapping[str, int]:
+    """{会社法人等番号: 任期年数}（定款で任期を変えている会社）。"""
+    return _config.get().company_term_years
+
+
+def term_years_for(role: str, corporate_number: Optional[str] = None) -> Optional[int]:
+    """役職・会社に適用する任期（年）。任期管理の対象外なら None。"""
+    company = load_company_term_years().get(corporate_number or "")
+    if company is not None:
+        return company
+    rules = load_term_years()
+    return rules.get(role, rules.get("default"))
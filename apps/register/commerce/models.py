@@ -0,0 +1,90 @@
+# apps/register/commerce/models.py
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import Index, text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from db import db
+
+
+# =========================
+# 解析済み登記簿ストア
+# =========================
+class ParsedRegistry(db.Model):
+    """
+    parse_corporation_registry の結果を保存するテーブル。
+    - payload に解析結果 dict をそのまま JSONB で保持
+    - 検索に使う項目（会社法人等番号・商号・現在日時）は列として抽出
+    - source_hash（PDF の SHA-256）で同一ファイルの再解析を避ける
+    - parser_version が現行と異なる行は一括再解析の対象
+    """
+    __tablename__ = "parsed_registry"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    corporate_number = db.Column(db.String(12), nullable=True)   # 会社法人等番号（数字のみ12桁）
+    company_name     = db.Column(db.String(255), nullable=True)  # 商号
+    as_of            = db.Column(db.DateTime, nullable=True)     # 「○○現在の情報です」の日時
+
+    source_hash    = db.Column(db.String(64), nullable=False, unique=True)  # PDF の SHA-256
+    source_name    = db.Column(db.String(255), nullable=True)               # アップロード時のファイル名
+    parser_version = db.Column(db.String(20), nullable=False)
+
+    raw_text = db.Column(db.Text, nullable=False, default="")  # 抽出テキスト（再解析は PDF 不要）
+    payload  = db.Column(JSONB, nullable=False, default=dict, server_default=text("'{}'::jsonb"))
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now, server_default=func.now())
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.now, onupdate=datetime.now,
+                           server_default=func.now())
+
+    # •	会社法人等番号で「最新の証明書」を引く → (corporate_number, as_of) の複合
+    # •	日付だけで絞る一覧用に as_of 単独
+    __table_args__ = (
+        Index("ix_parsed_registry_number_as_of", "corporate_number", "as_of"),
+        Index("ix_parsed_registry_as_of", "as_of"),
+        Index("ix_parsed_registry_parser_version", "parser_version"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ParsedRegistry id={self.id} number={self.corporate_number or '-'} as_of={self.as_of}>"
+
+
+# =========================
+# 役員任期（任期満了の一覧用）
+# =========================
+class OfficerTerm(db.Model):
+    """
+    解析済み登記簿から作る役員任期の事前計算テーブル。
+    - 会社法人等番号ごとに最新の登記簿の現任役員だけを持つ（登記簿の保存時に作り直す）
+    - expires_on（任期満了予定日）のインデックスで「N か月以内に満了」を範囲検索する
+    """
+    __tablename__ = "officer_term"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    parsed_registry_id = db.Column(
+        db.Integer,
+        db.ForeignKey("parsed_registry.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    corporate_number = db.Column(db.String(12), nullable=False)   # 会社法人等番号（数字のみ）
+    company_name     = db.Column(db.String(255), nullable=True)   # 商号
+
+    officer_name = db.Column(db.String(255), nullable=False)  # 氏名
+    role         = db.Column(db.String(50), nullable=False)   # 取締役 / 代表取締役 / 監査役 など
+    appointed_on = db.Column(db.Date, nullable=False)         # 直近の就任・重任日
+    term_years   = db.Column(db.Integer, nullable=False)      # 適用した任期（年）
+    expires_on   = db.Column(db.Date, nullable=False)         # 任期満了予定日
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now, server_default=func.now())
+
+    # •	満了日の範囲検索 → expires_on
+    # •	作り直し時の削除 → corporate_number
+    # •	登記簿の削除（ON DELETE CASCADE） → parsed_registry_id
+    __table_args__ = (
+        Index("ix_officer_term_parsed_registry_id", "parsed_registry_id"),
+        Index("ix_officer_term_expires_on", "expires_on"),
+        Index("ix_officer_term_corporate_number", "corporate_number"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<OfficerTerm {self.corporate_number} {self.role} {self.officer_name} expires={self.expires_on}>"
@@ -28,6 +28,6 @@ def to_registry_sections(
             if label:
                 title_guess = label
 
-        sections.append(RegistrySection(raw_text=sec_text, title=title_guess, registry_item=reg_items))
+        sections.append(RegistrySection(raw_text=sec_text, title=title_guess, items=reg_items))
 
     return sections
\ No newline at end of file
@@ -0,0 +1,144 @@
+# apps/register/commerce/pdf/services/incremental.py
+"""
+セクション単位の差分。
+
+parser.split_sections のセクション（商号・本店・役員に関する事項 …）ごとに、本文 → 項目 → サブアイテム を
+それぞれハッシュ（fingerprint）したスナップショットを作り、前回のスナップショット
+（同じ会社法人等番号の直近の解析結果の payload["sections"]）と比べる。
+解析結果そのものは持たない（payload の company_profile / officers などにある）。
+fingerprint が前回と同じセクションは、parser 側でパーサを呼ばずに前回の結果を写す。
+差分も fingerprint の比較だけで作る（dict 全体の比較はしない）。
+
+スナップショット（JSON でそのまま保存できる形）:
+    {
+      "<セクション名>": {
+        "fingerprint": "...",
+        "items": {
+          "<項目名>": {"fingerprint": "...", "entries": {"<サブアイテムfp>": "<1行に正規化した本文>", ...}},
+        },
+      },
+    }
+"""
+from __future__ import annotations
+import hashlib
+import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .debug_utils import split_block_items
+from .structures import EntryBlock, Line
+
+Snapshot = Dict[str, Dict[str, Any]]
+
+
+def fingerprint(text: str) -> str:
+    """正規化済みテキストの fingerprint（SHA-1 の先頭16桁で十分）。"""
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()[:16]
+
+
+def _label_key(label: Optional[str], fallback: str) -> str:
+    """'商 号' → '商号'。空なら fallback（'#1' など）。"""
+    key = re.sub(r"\s+", "", label or "")
+    return key or fallback
+
+
+def _unique(key: str, used: Dict[str, Any]) -> str:
+    """同名キーが既にあれば '#2', '#3' … を付けて重複を避ける。"""
+    if key not in used:
+        return key
+    n = 2
+    while f"{key}#{n}" in used:
+        n += 1
+    return f"{key}#{n}"
+
+
+def _item_prints(items: List[List[List[str]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    セクション内の各項目を {項目名: {fingerprint, entries}} にする。
+    項目名は先頭行のラベル欄（'┃商号│…' の '商号'）。欄の区切りが無い行は値ごと変わるので位置（'#1'）にする。
+    """
+    result: Dict[str, Dict[str, Any]] = {}
+    for idx, subitems in enumerate(items, start=1):
+        first = subitems[0][0] if subitems and subitems[0] else ""
+        label = Line(first).parse_cells()[0] if "│" in first else None
+        key = _unique(_label_key(label, f"#{idx}"), result)
+        entries: Dict[str, str] = {}
+        for sub_lines in subitems:
+            fp = fingerprint("\n".join(sub_lines))
+            entries[fp] = EntryBlock(lines=[Line(t) for t in sub_lines]).merged_line.text
+        result[key] = {
+            "fingerprint": fingerprint("\n".join(entries.keys())),
+            "entries": entries,
+        }
+    return result
+
+
+# =========================
+# スナップショット作成（前回分の再利用つき）
+# =========================
+def build_snapshot(sections: Mapping[str, str],
+                   previous: Optional[Snapshot] = None) -> Tuple[Snapshot, List[str]]:
+    """
+    split_sections の {セクション名: 本文} からスナップショットを作る。
+    本文の fingerprint が previous と同じセクションは、前回のエントリをそのまま使う（項目は数え直さない）。
+    戻り値: (snapshot, 前回と同じだったセクション名のリスト)
+    """
+    previous = previous or {}
+    snapshot: Snapshot = {}
+    unchanged: List[str] = []
+    for key, text in sections.items():
+        sec_fp = fingerprint(text)
+        prev = previous.get(key)
+        if prev and prev.get("fingerprint") == sec_fp:
+            snapshot[key] = prev
+            unchanged.append(key)
+            continue
+        snapshot[key] = {
+            "fingerprint": sec_fp,
+            "items": _item_prints(split_block_items(text)),
+        }
+    return snapshot, unchanged
+
+
+# =========================
+# 差分（fingerprint の比較のみ）
+# =========================
+def diff_snapshots(old: Optional[Snapshot], new: Snapshot) -> Dict[str, Dict[str, Any]]:
+    """
+    セクションごとの差分を返す。変更のないセクションは含めない。
+        {
+          "<セクション名>": {
+            "status": "added" | "removed" | "changed",
+            "added":   ["<項目名>", ...],
+            "removed": ["<項目名>", ...],
+            "changed": [{"key": "<項目名>", "added": ["本文", ...], "removed": ["本文", ...]}],
+          }
+        }
+    """
+    old = old or {}
+    diff: Dict[str, Dict[str, Any]] = {}
+
+    for key in list(new) + [k for k in old if k not in new]:
+        o, n = old.get(key), new.get(key)
+        if o and n and o.get("fingerprint") == n.get("fingerprint"):
+            continue
+
+        o_items = (o or {}).get("items", {})
+        n_items = (n or {}).get("items", {})
+        changed: List[Dict[str, Any]] = []
+        for item_key in (k for k in n_items if k in o_items):
+            oi, ni = o_items[item_key], n_items[item_key]
+            if oi["fingerprint"] == ni["fingerprint"]:
+                continue
+            changed.append({
+                "key": item_key,
+                "added": [t for fp, t in ni["entries"].items() if fp not in oi["entries"]],
+                "removed": [t for fp, t in oi["entries"].items() if fp not in ni["entries"]],
+            })
+
+        diff[key] = {
+            "status": "added" if o is None else "removed" if n is None else "changed",
+            "added": [k for k in n_items if k not in o_items],
+            "removed": [k for k in o_items if k not in n_items],
+            "changed": changed,
+        }
+    return diff
@@ -2,6 +2,8 @@
 
 import re
 
+from apps.shared.limits import MAX_LINE_LENGTH
+
 # =========================
 # 2) 正規化（ノイズ除去・空白折り畳み）
 # =========================
@@ -47,6 +49,7 @@ def normalize_text(t: str) -> str:
       - 罫線は同じ文字の連続だけ圧縮（例: ━━━ → ━）
       - 連続空白の圧縮
       - 行頭/行末の空白トリム
+      - 1行を MAX_LINE_LENGTH 文字で打ち切り
     """
     t = extract_table_block(t)
     t = t.replace("\u3000", " ")      # 全角空白→半角
@@ -61,5 +64,5 @@ def normalize_text(t: str) -> str:
 
     # 空白を整理
     t = re.sub(r"[ \t]+", " ", t)
-    t = "\n".join(ln.strip() for ln in t.splitlines())
+    t = "\n".join(ln.strip()[:MAX_LINE_LENGTH] for ln in t.splitlines())
     return t
\ No newline at end of file
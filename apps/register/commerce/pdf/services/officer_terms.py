@@ -0,0 +1,119 @@
+# apps/register/commerce/pdf/services/officer_terms.py
+"""
+役員任期テーブル（officer_term）の作成と検索。
+
+- 会社法人等番号ごとに、最新の登記簿の現任役員から任期満了予定日を計算して保存
+- 任期は config.ini の [TERM_YEARS] / [COMPANY_TERM_YEARS]
+- 満了予定日は「直近の就任・重任日 + 任期年数」の簡易計算
+  （実際の満了は定時株主総会の終結時。事業年度は登記簿から分からないため）
+"""
+from __future__ import annotations
+import calendar
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import insert
+
+from db import db
+from apps.register.commerce.config_loader import term_years_for
+from apps.register.commerce.models import OfficerTerm, ParsedRegistry
+from apps.register.commerce.pdf.services.officers import current_officers
+
+
+# =========================
+# 日付ユーティリティ
+# =========================
+def add_months(d: date, months: int) -> date:
+    """月を加算（月末を超える日は月末に丸める。2/29 + 12か月 → 2/28）。"""
+    y, m = divmod(d.month - 1 + months, 12)
+    year, month = d.year + y, m + 1
+    return date(year, month, min(d.day, calendar.monthrange(year, month)[1]))
+
+
+# =========================
+# 作成
+# =========================
+def _term_rows(row: ParsedRegistry) -> List[Dict[str, Any]]:
+    """登記簿1件 → officer_term の行（任期管理の対象外・就任日不明は除く）。"""
+    rows: List[Dict[str, Any]] = []
+    for o in current_officers(row.payload or {}):
+        years = term_years_for(o["role"], row.corporate_number)
+        if not years or not o["term_start"]:
+            continue
+        appointed = date.fromisoformat(o["term_start"])
+        rows.append({
+            "parsed_registry_id": row.id,
+            "corporate_number": row.corporate_number,
+            "company_name": row.company_name,
+            "officer_name": o["name"][:255],
+            "role": o["role"],
+            "appointed_on": appointed,
+            "term_years": years,
+            "expires_on": add_months(appointed, years * 12),
+        })
+    return rows
+
+
+def rebuild_for(row: ParsedRegistry) -> int:
+    """
+    row が会社の最新の登記簿なら、その会社の任期行を作り直す（古い登記簿なら何もしない）。
+    戻り値は作成した行数。commit は呼び出し側で行う。
+    """
+    if not row.corporate_number:
+        return 0
+    from apps.register.commerce.pdf.services.store import latest_for  # 循環 import 回避
+    latest = latest_for(row.corporate_number)
+    if latest is None or latest.id != row.id:
+        return 0
+
+    OfficerTerm.query.filter_by(corporate_number=row.corporate_number).delete(synchronize_session=False)
+    rows = _term_rows(row)
+    if rows:
+        db.session.execute(insert(OfficerTerm), rows)
+    return len(rows)
+
+
+def _latest_registries(batch_size: int) -> Iterator[List[ParsedRegistry]]:
+    """会社法人等番号ごとの最新の登記簿を batch_size 件ずつ（番号順のキーセット）。"""
+    last_number = ""
+    while True:
+        rows = (ParsedRegistry.query
+                .filter(ParsedRegistry.corporate_number.isnot(None),
+                        ParsedRegistry.corporate_number > last_number)
+                .distinct(ParsedRegistry.corporate_number)
+                .order_by(ParsedRegistry.corporate_number,
+                          ParsedRegistry.as_of.desc().nullslast(),
+                          ParsedRegistry.id.desc())
+                .limit(batch_size)
+                .all())
+        if not rows:
+            return
+        yield rows
+        last_number = rows[-1].corporate_number
+
+
+def rebuild_all(batch_size: int = 200) -> int:
+    """officer_term を全件作り直す。batch_size 社ごとに commit。戻り値は作成行数。"""
+    OfficerTerm.query.delete(synchronize_session=False)
+    total = 0
+    for registries in _latest_registries(batch_size):
+        rows = [r for reg in registries for r in _term_rows(reg)]
+        if rows:
+            db.session.execute(insert(OfficerTerm), rows)
+        db.session.commit()
+        total += len(rows)
+    db.session.commit()
+    return total
+
+
+# =========================
+# 検索
+# =========================
+def expiring_within(months: int, today: Optional[date] = None) -> List[OfficerTerm]:
+    """今日から months か月以内に満了する任期（ix_officer_term_expires_on の範囲検索）。"""
+    today = today or date.today()
+    until = add_months(today, months)
+    return (OfficerTerm.query
+            .filter(OfficerTerm.expires_on >= today, OfficerTerm.expires_on < until)
+            .order_by(OfficerTerm.expires_on.asc(), OfficerTerm.corporate_number.asc())
+            .all())
@@ -0,0 +1,41 @@
+# apps/register/commerce/pdf/services/officers.py
+"""
+解析結果の役員（payload["officers"] = parser.parse_officers の出力）から現任者を求める。
+
+役職行ごとの記録（{role, name, address, events: [{event, date}]}）を (役職, 氏名) でまとめ、
+就任・重任と退任・辞任などを記載順にたどる。役員欄は読み直さない。
+"""
+from __future__ import annotations
+import re
+from typing import Any, Dict, List, Optional
+
+START_EVENTS = ("就任", "重任")
+END_EVENTS = ("退任", "辞任", "解任", "死亡", "資格喪失")
+
+
+def current_officers(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    (役職, 氏名) ごとに記録をまとめ、退任等していない現任者を返す。
+    term_start は直近の就任・重任日（任期計算用）。氏名は空白を詰める（'鵜 飼 太 一' → '鵜飼太一'）。
+    """
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for rec in (payload or {}).get("officers") or []:
+        name = re.sub(r"\s+", "", rec.get("name") or "")
+        key = (rec["role"], name)
+        g = groups.setdefault(key, {"role": rec["role"], "name": name,
+                                    "address": None, "term_start": None, "ended": False})
+        if rec.get("address"):
+            g["address"] = rec["address"]
+        for ev in rec.get("events") or []:
+            if ev["event"] in START_EVENTS:
+                g["term_start"] = max(filter(None, [g["term_start"], ev["date"]]), default=None)
+                g["ended"] = False
+            elif ev["event"] in END_EVENTS:
+                g["ended"] = True
+    return [g for g in groups.values() if not g["ended"]]
+
+
+def current_representative(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """現任の代表者（代表取締役・代表社員など）。複数いれば最後の記載を返す。"""
+    reps = [o for o in current_officers(payload) if o["role"].startswith("代表")]
+    return reps[-1] if reps else None
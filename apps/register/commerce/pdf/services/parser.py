@@ -1,12 +1,63 @@
 # apps/commerce/services/commerce/services.py
+import copy
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 from apps.shared.wareki import wareki_str_to_iso  # 保存は ISO に統一
 from apps.shared.jp_amount import jp_amount_to_int
 from apps.register.shared.pdf_reader import extract_text_from_pdf
+from apps.common.metrics import REGISTRY_PARSE, cache_result, time_histogram
 from apps.register.commerce.pdf.services.normalize import normalize_text, ZEN2HAN
+from apps.register.commerce.pdf.services.incremental import build_snapshot, diff_snapshots
+
+# 解析ロジックを変えたら上げる（parsed_registry の一括再解析の判定に使う）
+PARSER_VERSION = "3"
+
+# =========================
+# 正規表現（長い行でもバックトラックが爆発しない形にしてある）
+# =========================
+# 「.+」「.*」で離れた語を順に探す書き方は、候補の開始位置ごとに行末まで走査するので
+# 行長の2乗になる。語ごとに search して位置を進める（_looks_like_address）。
+_AS_OF_MARK = "現在の情報です"
+_AS_OF_RE   = re.compile(r"(\d{4})[／/](\d{2})[／/](\d{2})\s+(\d{2})：?(\d{2})")
+_PREF_RE    = re.compile(r"[都道府県]")
+_CITY_RE    = re.compile(r"[市区郡町村]")
+_LOT_RE     = re.compile(r"番|号|丁目|F|階")
+_REG_DATE_RE = re.compile(
+    r"(令和|平成|昭和|大正|明治)\s*[\d０-９]{1,2}\s*年\s*[\d０-９]{1,2}\s*月\s*[\d０-９]{1,2}\s*日\s*登記"
+)
+_MOVE_FROM_MARK = "から本店移転"
+
+
+def _looks_like_address(ln: str, with_lot: bool = False) -> bool:
+    """
+    「都道府県 … 市区郡町村 (… 番/号/丁目/F/階)」の順に並んでいるか。
+    旧: re.search(r"(都|道|府|県).+(市|区|郡|町|村).*(番|号|丁目|F|階)", ln) と同じ判定。
+    """
+    m = _PREF_RE.search(ln)
+    if not m:
+        return False
+    c = _CITY_RE.search(ln, m.end() + 1)  # 「.+」なので1文字以上あける
+    if not c:
+        return False
+    return not with_lot or _LOT_RE.search(ln, c.end()) is not None
+
+
+def _token_before(text: str, mark: str) -> Optional[str]:
+    """
+    mark の直前に空白なしで続く語（旧: re.search(r"(\\S+?)から本店移転", ...)）。
+    mark を str.find で探し、手前へ空白まで戻るだけなので線形。
+    """
+    idx = text.find(mark)
+    while idx != -1:
+        start = idx
+        while start > 0 and not text[start - 1].isspace():
+            start -= 1
+        if start < idx:
+            return text[start:idx]
+        idx = text.find(mark, idx + 1)
+    return None
 
 # =========================
 # 4) メタ情報：as_of・法人番号・会社名など
@@ -14,9 +65,15 @@ from apps.register.commerce.pdf.services.normalize import normalize_text, ZEN2HA
 def parse_metadata(norm: str) -> Dict[str, Any]:
     meta: Dict[str, Any] = {}
 
-    m = re.search(r"(\d{4})[／/](\d{2})[／/](\d{2})\s+(\d{2})：?(\d{2}).*現在の情報です", norm)
-    if m:
-        meta["as_of"] = f"{m.group(1)}-{m.group(2)}-{m.group(3)} {m.group(4)}:{m.group(5)}"
+    # 「現在の情報です」を含む行の、その手前にある日時
+    for ln in norm.splitlines():
+        pos = ln.find(_AS_OF_MARK)
+        if pos == -1:
+            continue
+        m = _AS_OF_RE.search(ln, 0, pos)
+        if m:
+            meta["as_of"] = f"{m.group(1)}-{m.group(2)}-{m.group(3)} {m.group(4)}:{m.group(5)}"
+            break
 
     m = re.search(r"会社法人等番号\s*([0-9０-９\-－]+)", norm)
     if m:
@@ -104,7 +161,7 @@ def parse_head_office(sec: str) -> Dict[str, Any]:
     pending_addr = None
 
     for ln in lines[1:]:
-        if re.search(r"(都|道|府|県).+(市|区|郡|町|村)", ln) and not re.search(r"(就任|辞任|更正|登記|移転)", ln):
+        if _looks_like_address(ln) and not re.search(r"(就任|辞任|更正|登記|移転)", ln):
             pending_addr = re.sub(r"\s+", " ", ln).strip()
             continue
 
@@ -141,15 +198,26 @@ def parse_head_office(sec: str) -> Dict[str, Any]:
     current = moves_sorted[-1]["new"] if moves_sorted else ""
     return {"current_address": current, "history": history}
 
+# 役職（長いものを先に: 「代表取締役」を「取締役」と読まない）と、役員欄の原因
+OFFICER_ROLES = (
+    "代表取締役", "取締役", "監査役", "会計参与", "会計監査人", "代表清算人", "清算人",
+    "代表執行役", "執行役", "代表社員", "業務執行社員", "代表理事", "理事", "監事",
+)
+OFFICER_EVENTS = ("就任", "重任", "退任", "辞任", "解任", "死亡", "資格喪失", "更正", "住所移転", "氏変更", "登記")
+
+_OFFICER_EVENT_RE = re.compile("|".join(OFFICER_EVENTS))
+
+
 def parse_officers(sec: str) -> List[Dict[str, Any]]:
+    """役職行ごとの記録 {role, name, address, events: [{event, date}]}（現任の判定は officers.py）。"""
     lines = [ln for ln in sec.splitlines() if ln.strip()]
     officers: List[Dict[str, Any]] = []
     current_officer: Optional[Dict[str, Any]] = None
     last_address: Optional[str] = None
 
-    ROLE_PAT = r"(代表取締役|取締役|監査役|会計参与|清算人)"
+    ROLE_PAT = "(" + "|".join(OFFICER_ROLES) + ")"
     for ln in lines[1:]:
-        if re.search(r"(都|道|府|県).+(市|区|郡|町|村).*(番|号|丁目|F|階)", ln) and not re.search(ROLE_PAT, ln):
+        if _looks_like_address(ln, with_lot=True) and not re.search(ROLE_PAT, ln):
             last_address = re.sub(r"\s+", " ", ln).strip()
             continue
 
@@ -163,9 +231,9 @@ def parse_officers(sec: str) -> List[Dict[str, Any]]:
             last_address = None
             continue
 
-        if re.search(r"(就任|退任|辞任|更正|住所移転|登記)", ln):
+        if _OFFICER_EVENT_RE.search(ln):
             date = wareki_str_to_iso(ln)
-            event = next((k for k in ["就任", "退任", "辞任", "更正", "住所移転", "登記"] if k in ln), None)
+            event = next((k for k in OFFICER_EVENTS if k in ln), None)
             if current_officer and event and date:
                 current_officer["events"].append({"event": event, "date": date})
             continue
@@ -184,13 +252,12 @@ def parse_registration_notes(sec: str) -> List[Dict[str, Any]]:
         if "本店移転" in para or "移転" in para:
             eff = wareki_str_to_iso(para)
             reg = None
-            mreg = re.search(r"(令和|平成|昭和|大正|明治)\s*[\d０-９]+\s*年\s*[\d０-９]+\s*月\s*[\d０-９]+\s*日\s*登記", para)
+            mreg = _REG_DATE_RE.search(para)
             if mreg:
                 reg = wareki_str_to_iso(mreg.group(0))
-            m_from = re.search(r"(\S+?)から本店移転", para)
             notes.append({
                 "note": "本店移転",
-                "from": m_from.group(1) if m_from else None,
+                "from": _token_before(para, _MOVE_FROM_MARK),
                 "effective_date": eff,
                 "registration_date": reg
             })
@@ -201,52 +268,120 @@ def parse_registration_notes(sec: str) -> List[Dict[str, Any]]:
 # =========================
 def parse_corporation_registry(pdf_path: Path) -> Dict[str, Any]:
     raw = extract_text_from_pdf(pdf_path)
-    norm = normalize_text(raw)
-
+    return parse_corporation_text(raw, source=str(pdf_path))
+
+def parse_corporation_text(raw: str, source: str = "",
+                           previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    抽出済みテキストから解析する（PDF 読み込みなし）。
+    保存済みテキストの再解析もこちらを使う。
+    """
+    return parse_normalized(normalize_text(raw), source, previous)
+
+def parse_normalized(norm: str, source: str = "",
+                     previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    正規化済みテキストから解析する。
+    previous（同じ会社の前回の解析結果 = parsed_registry.payload）を渡すと、
+    入力が前回と同じセクションはパーサを呼ばずに前回の結果を写し、差分（diff）も返す。
+    """
+    with time_histogram(REGISTRY_PARSE, parser="commerce"):
+        result = _parse_normalized(norm, source, previous)
+    if previous is not None:
+        reused = len(result["reused_sections"])
+        cache_result("registry_sections", True, reused)
+        cache_result("registry_sections", False, len(result["sections"]) - reused)
+    return result
+
+
+class _SectionReuse:
+    """
+    スナップショット（incremental.build_snapshot）で本文が前回と同じだったセクションは、
+    前回の結果（payload の company_profile / officers / registration_notes の該当項目）を写す。
+    違えばそのセクションのパーサだけを呼ぶ。
+    """
+
+    def __init__(self, sections: Dict[str, str], unchanged: List[str],
+                 previous: Optional[Dict[str, Any]]):
+        self.sections = sections
+        self.unchanged = set(unchanged)
+        self.previous = previous or {}
+        self.reused: List[str] = []   # パーサを呼ばなかったセクション
+        self.parsed: List[str] = []   # パーサを呼んだセクション
+
+    def __call__(self, key: str, parse, path: Tuple[str, ...]) -> Any:
+        """path: 前回の payload 内の位置（("company_profile", "trade_name") / ("officers",) など）。"""
+        if key in self.unchanged:
+            found, value = True, self.previous
+            for name in path:
+                if not isinstance(value, dict) or name not in value:
+                    found = False
+                    break
+                value = value[name]
+            if found:
+                self.reused.append(key)
+                return copy.deepcopy(value)
+        self.parsed.append(key)
+        return parse(self.sections[key])
+
+
+def _parse_normalized(norm: str, source: str,
+                      previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     meta = parse_metadata(norm)
     sections = split_sections(norm)
+    previous_sections = previous.get("sections") if previous is not None else None
+    snapshot, unchanged = build_snapshot(sections, previous_sections)
+    section = _SectionReuse(sections, unchanged, previous)
 
     profile: Dict[str, Any] = {}
 
     if "商号" in sections:
-        profile["trade_name"] = parse_trade_name(sections["商号"])
+        profile["trade_name"] = section("商号", parse_trade_name, ("company_profile", "trade_name"))
         if not meta.get("company_name"):
             meta["company_name"] = profile["trade_name"]["current"]
 
     if "本店" in sections:
-        profile["head_office"] = parse_head_office(sections["本店"])
+        profile["head_office"] = section("本店", parse_head_office, ("company_profile", "head_office"))
 
     if "公告をする方法" in sections:
-        profile["public_notice_method"] = parse_public_notice(sections["公告をする方法"])
+        profile["public_notice_method"] = section(
+            "公告をする方法", parse_public_notice, ("company_profile", "public_notice_method"))
 
     if "会社成立の年月日" in sections:
-        profile["date_of_incorporation"] = parse_incorporation_date(sections["会社成立の年月日"])
+        profile["date_of_incorporation"] = section(
+            "会社成立の年月日", parse_incorporation_date, ("company_profile", "date_of_incorporation"))
 
     if "目的" in sections:
-        profile["purposes"] = parse_purposes(sections["目的"])
+        profile["purposes"] = section("目的", parse_purposes, ("company_profile", "purposes"))
 
     if "発行可能株式総数" in sections:
-        profile["authorized_shares"] = parse_authorized_shares(sections["発行可能株式総数"])
+        profile["authorized_shares"] = section(
+            "発行可能株式総数", parse_authorized_shares, ("company_profile", "authorized_shares"))
     if "発行済株式の総数" in sections:
-        profile["issued_shares"] = parse_issued_shares(sections["発行済株式の総数"])
+        profile["issued_shares"] = section(
+            "発行済株式の総数", parse_issued_shares, ("company_profile", "issued_shares"))
     if "資本金の額" in sections:
-        profile["capital"] = parse_capital(sections["資本金の額"])
+        profile["capital"] = section("資本金の額", parse_capital, ("company_profile", "capital"))
 
     if "株式の譲渡制限に関する規定" in sections:
-        profile["transfer_restrictions"] = parse_transfer_restrictions(sections["株式の譲渡制限に関する規定"])
+        profile["transfer_restrictions"] = section(
+            "株式の譲渡制限に関する規定", parse_transfer_restrictions, ("company_profile", "transfer_restrictions"))
 
     officers = []
     if "役員に関する事項" in sections:
-        officers = parse_officers(sections["役員に関する事項"])
+        officers = section("役員に関する事項", parse_officers, ("officers",))
 
     reg_notes = []
     if "登記記録に関する事項" in sections:
-        reg_notes = parse_registration_notes(sections["登記記録に関する事項"])
+        reg_notes = section("登記記録に関する事項", parse_registration_notes, ("registration_notes",))
 
     return {
-        "source": str(pdf_path),
+        "source": source,
         "metadata": meta,
         "company_profile": profile,
         "officers": officers,
-        "registration_notes": reg_notes
-    }
\ No newline at end of file
+        "registration_notes": reg_notes,
+        "sections": snapshot,
+        "reused_sections": section.reused,
+        "diff": diff_snapshots(previous_sections, snapshot) if previous is not None else None,
+    }
@@ -0,0 +1,177 @@
+# apps/register/commerce/pdf/services/profile_sync.py
+"""
+解析済み登記簿 → CorporateProfile（代表者名・代表者肩書）の一括同期。
+
+- 登記簿の会社法人等番号と corporate_profile.company_number（インデックスあり）で突き合わせ
+- 同じ番号の登記簿が複数あれば as_of が最新のものだけを使う（バッチに分ける前に番号でまとめる）
+- 突き合わせ・更新はバッチ単位（1バッチ = SELECT 1回 + INSERT ... ON CONFLICT 1回）
+- dry_run=True なら更新せず差分だけ返す
+"""
+from __future__ import annotations
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from db import db
+from apps.client.models import Client, CorporateProfile
+from apps.register.commerce.models import ParsedRegistry
+from apps.register.commerce.pdf.services import store
+from apps.register.commerce.pdf.services.officers import current_representative
+
+# (会社法人等番号(数字のみ), as_of, payload)
+RegistryRecord = Tuple[str, Optional[datetime], Dict[str, Any]]
+
+SYNC_FIELDS = ("representative_name", "representative_title")
+
+
+@dataclass
+class SyncReport:
+    dry_run: bool
+    registries: int = 0                                        # 対象の登記簿（番号で重複排除後）
+    matched: int = 0                                           # 突き合わせできたクライアント
+    updated: int = 0                                           # 更新した（dry_run なら更新予定の）件数
+    unmatched: List[str] = field(default_factory=list)         # クライアントが見つからない番号
+    changes: List[Dict[str, Any]] = field(default_factory=list)  # 項目単位の差分
+
+    def lines(self) -> List[str]:
+        """CLI 表示用の差分レポート。"""
+        head = "[dry-run] " if self.dry_run else ""
+        out = [f"{head}registries={self.registries} matched={self.matched} "
+               f"updated={self.updated} unmatched={len(self.unmatched)}"]
+        for c in self.changes:
+            out.append(f"  client #{c['client_id']} {c['client_name']} ({c['company_number']}) "
+                       f"{c['field']}: {c['old'] or '-'} -> {c['new'] or '-'}")
+        for number in self.unmatched:
+            out.append(f"  unmatched: {number}")
+        return out
+
+
+# =========================
+# 入力元
+# =========================
+def records_from_store() -> Iterator[RegistryRecord]:
+    """parsed_registry から会社法人等番号ごとの最新1件（DISTINCT ON）を流す。"""
+    q = (db.session.query(ParsedRegistry.corporate_number, ParsedRegistry.as_of, ParsedRegistry.payload)
+         .filter(ParsedRegistry.corporate_number.isnot(None))
+         .distinct(ParsedRegistry.corporate_number)
+         .order_by(ParsedRegistry.corporate_number,
+                   ParsedRegistry.as_of.desc().nullslast(),
+                   ParsedRegistry.id.desc())
+         .yield_per(500))
+    for number, as_of, payload in q:
+        yield number, as_of, payload
+
+
+def records_from_directory(path: str) -> Iterator[RegistryRecord]:
+    """ディレクトリ内の PDF を（ストア経由で）解析して流す。解析済みなら再解析しない。"""
+    for name in sorted(os.listdir(path)):
+        if not name.lower().endswith(".pdf"):
+            continue
+        with open(os.path.join(path, name), "rb") as fp:
+            row = store.get_or_parse(fp.read(), source_name=name)
+        if row.corporate_number:
+            yield row.corporate_number, row.as_of, row.payload
+
+
+# =========================
+# 同期本体
+# =========================
+def _number_variants(number: str) -> List[str]:
+    """手入力の揺れ（ハイフン有無）も拾えるよう、数字のみ・4-2-6 区切りの両方で探す。"""
+    variants = [number]
+    if len(number) == 12:
+        variants.append(f"{number[0:4]}-{number[4:6]}-{number[6:12]}")
+    return variants
+
+
+def _sync_batch(batch: Dict[str, Dict[str, Any]], report: SyncReport) -> None:
+    """1バッチ分を突き合わせ・更新する（SELECT 1回 + upsert 1回）。"""
+    variants = [v for number in batch for v in _number_variants(number)]
+    rows = (db.session.query(CorporateProfile.client_id,
+                             CorporateProfile.company_number,
+                             CorporateProfile.representative_name,
+                             CorporateProfile.representative_title,
+                             Client.name)
+            .join(Client, Client.id == CorporateProfile.client_id)
+            .filter(CorporateProfile.company_number.in_(variants))
+            .all())
+
+    found = set()
+    upserts: List[Dict[str, Any]] = []
+    for client_id, company_number, rep_name, rep_title, client_name in rows:
+        number = store.normalize_corporate_number(company_number)
+        new = batch.get(number)
+        if new is None:
+            continue
+        found.add(number)
+        report.matched += 1
+
+        old = {"representative_name": rep_name, "representative_title": rep_title}
+        diffs = [f for f in SYNC_FIELDS if (old[f] or "") != (new[f] or "")]
+        if not diffs:
+            continue
+        for f in diffs:
+            report.changes.append({
+                "client_id": client_id, "client_name": client_name,
+                "company_number": company_number,
+                "field": f, "old": old[f], "new": new[f],
+            })
+        upserts.append({"client_id": client_id, "company_number": company_number,
+                        "representative_name": new["representative_name"],
+                        "representative_title": new["representative_title"]})
+
+    report.unmatched.extend(sorted(set(batch) - found))
+    report.updated += len(upserts)
+    if upserts and not report.dry_run:
+        stmt = pg_insert(CorporateProfile).values(upserts)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CorporateProfile.client_id],
+            set_={f: stmt.excluded[f] for f in SYNC_FIELDS},
+        )
+        db.session.execute(stmt)
+
+
+def _latest_per_number(records: Iterable[RegistryRecord]) -> Dict[str, Tuple[Optional[datetime], Dict[str, Any]]]:
+    """
+    番号ごとに as_of が最新の代表者だけを残す（入力全体で。as_of なしは最も古い扱い）。
+    バッチに分ける前にまとめるので、後のバッチに来た古い登記簿が新しい内容を上書きすることはない。
+    持つのは番号・as_of・代表者名と肩書だけ（payload は持たない）。
+    """
+    latest: Dict[str, Tuple[Optional[datetime], Dict[str, Any]]] = {}
+    for number, as_of, payload in records:
+        rep = current_representative(payload)
+        if not number or rep is None:
+            continue
+        prev = latest.get(number)
+        if prev is not None and (as_of is None or (prev[0] is not None and prev[0] >= as_of)):
+            continue
+        latest[number] = (as_of, {"representative_name": rep["name"], "representative_title": rep["role"]})
+    return latest
+
+
+def sync_corporate_profiles(records: Iterable[RegistryRecord], *,
+                            dry_run: bool = False, batch_size: int = 200) -> SyncReport:
+    """
+    登記簿の現任代表者を CorporateProfile に反映する。
+    同じ番号が複数あれば as_of が新しいものを採用（バッチをまたいでも）。バッチごとに commit。
+    """
+    report = SyncReport(dry_run=dry_run)
+    latest = _latest_per_number(records)
+    report.registries = len(latest)
+
+    batch: Dict[str, Dict[str, Any]] = {}
+    for number, (_, values) in latest.items():
+        batch[number] = values
+        if len(batch) >= batch_size:
+            _sync_batch(batch, report)
+            if not dry_run:
+                db.session.commit()
+            batch = {}
+    if batch:
+        _sync_batch(batch, report)
+        if not dry_run:
+            db.session.commit()
+    return report
@@ -0,0 +1,186 @@
+# apps/register/commerce/pdf/services/store.py
+"""
+解析済み登記簿（parsed_registry）の保存・参照。
+
+- 同じ PDF（SHA-256 が同じ）は再解析せずストアから返す
+- 保存は source_hash をキーに upsert（INSERT ... ON CONFLICT DO UPDATE）
+- 抽出テキストも保存しているので、パーサ更新時は PDF なしで一括再解析できる
+- 同じ会社の前回スナップショットがあれば、変わっていないセクションは解析結果を再利用する
+- 保存のたびに、その会社の役員任期（officer_term）を作り直す
+"""
+from __future__ import annotations
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from db import db
+from apps.common.metrics import cache_result
+from apps.register.commerce.models import ParsedRegistry
+from apps.register.shared.pdf_reader import pdf_bytes_to_text
+from apps.register.commerce.pdf.services.normalize import normalize_text
+from apps.register.commerce.pdf.services.officer_terms import rebuild_for as rebuild_officer_terms
+from apps.register.commerce.pdf.services.parser import (
+    PARSER_VERSION, parse_corporation_text, parse_metadata, parse_normalized,
+)
+
+
+# =========================
+# 正規化ユーティリティ
+# =========================
+def source_hash(data: bytes) -> str:
+    """PDF の内容ハッシュ（SHA-256 の16進文字列）。"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_corporate_number(value: Optional[str]) -> Optional[str]:
+    """'0105-01-020460' → '010501020460'（数字以外を落とす）。空なら None。"""
+    digits = "".join(ch for ch in (value or "") if ch.isdigit())
+    return digits or None
+
+
+def _parse_as_of(value: Optional[str]) -> Optional[datetime]:
+    """parse_metadata の as_of（'YYYY-MM-DD HH:MM'）を datetime に。失敗時 None。"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M")
+    except ValueError:
+        return None
+
+
+def _columns_from_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """解析結果 dict から抽出列（検索用）を取り出す。"""
+    meta = result.get("metadata") or {}
+    name = meta.get("company_name")
+    return {
+        "corporate_number": normalize_corporate_number(meta.get("corporate_number")),
+        "company_name": (name or "")[:255] or None,
+        "as_of": _parse_as_of(meta.get("as_of")),
+    }
+
+
+# =========================
+# 参照
+# =========================
+def find_by_hash(digest: str) -> Optional[ParsedRegistry]:
+    return ParsedRegistry.query.filter_by(source_hash=digest).one_or_none()
+
+
+def latest_for(corporate_number: str, as_of: Optional[datetime] = None) -> Optional[ParsedRegistry]:
+    """
+    会社法人等番号ごとの最新の解析結果。
+    as_of を渡すと「その時点以前で最新」を返す（ix_parsed_registry_number_as_of を使う）。
+    """
+    number = normalize_corporate_number(corporate_number)
+    if not number:
+        return None
+    q = ParsedRegistry.query.filter(ParsedRegistry.corporate_number == number)
+    if as_of is not None:
+        q = q.filter(ParsedRegistry.as_of <= as_of)
+    return (q.order_by(ParsedRegistry.as_of.desc().nullslast(), ParsedRegistry.id.desc())
+            .first())
+
+
+# =========================
+# 保存（upsert）
+# =========================
+def save_result(result: Dict[str, Any], raw_text: str, digest: str,
+                source_name: Optional[str] = None) -> ParsedRegistry:
+    """
+    解析結果を source_hash をキーに upsert して、その行を返す。
+    commit は呼び出し側で行う。
+    """
+    values = {
+        **_columns_from_result(result),
+        "source_hash": digest,
+        "source_name": source_name,
+        "parser_version": PARSER_VERSION,
+        "raw_text": raw_text or "",
+        "payload": result,
+    }
+    now = datetime.now()
+    stmt = pg_insert(ParsedRegistry).values(**values, created_at=now, updated_at=now)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ParsedRegistry.source_hash],
+        set_={
+            "corporate_number": stmt.excluded.corporate_number,
+            "company_name": stmt.excluded.company_name,
+            "as_of": stmt.excluded.as_of,
+            "parser_version": stmt.excluded.parser_version,
+            "raw_text": stmt.excluded.raw_text,
+            "payload": stmt.excluded.payload,
+            "updated_at": stmt.excluded.updated_at,
+            # source_name は初回アップロード時の名前を残す
+        },
+    ).returning(ParsedRegistry.id)
+    row_id = db.session.execute(stmt).scalar_one()
+    # upsert は ORM を経由しないので、セッション上の古い値を捨てて取り直す
+    row = db.session.get(ParsedRegistry, row_id, populate_existing=True)
+    return row
+
+
+def get_or_parse(data: bytes, source_name: Optional[str] = None) -> ParsedRegistry:
+    """
+    PDF の bytes を受け取り、ストアにあればそれを、無ければ（またはパーサが古ければ）
+    解析して保存した行を返す。commit は呼び出し側で行う。
+    """
+    digest = source_hash(data)
+    row = find_by_hash(digest)
+    if row is not None and row.parser_version == PARSER_VERSION:
+        cache_result("parsed_registry", True)
+        return row
+    cache_result("parsed_registry", False)
+
+    # テキストが保存済みなら PDF の再抽出は不要
+    raw = row.raw_text if row is not None and row.raw_text else pdf_bytes_to_text(data)
+    norm = normalize_text(raw)
+    previous = _previous_result(parse_metadata(norm).get("corporate_number"), digest)
+    result = parse_normalized(norm, source=source_name or "", previous=previous)
+    row = save_result(result, raw, digest, source_name)
+    rebuild_officer_terms(row)
+    return row
+
+
+def _previous_result(corporate_number: Optional[str], digest: str) -> Optional[Dict[str, Any]]:
+    """
+    同じ会社法人等番号の直近の解析結果（payload。セクションの fingerprint とスナップショットを含む）。
+    パーサのバージョンが違うものは形式が変わっている可能性があるので使わない。
+    """
+    prev = latest_for(corporate_number or "")
+    if prev is None or prev.source_hash == digest or prev.parser_version != PARSER_VERSION:
+        return None
+    return prev.payload or None
+
+
+# =========================
+# 一括再解析
+# =========================
+def reparse_outdated(batch_size: int = 100) -> int:
+    """
+    parser_version が現行と異なる行を、保存済みテキストから再解析して更新する。
+    batch_size 件ごとに commit。戻り値は更新件数。
+    """
+    total = 0
+    last_id = 0
+    while True:
+        rows = (ParsedRegistry.query
+                .filter(ParsedRegistry.parser_version != PARSER_VERSION,
+                        ParsedRegistry.id > last_id)
+                .order_by(ParsedRegistry.id.asc())
+                .limit(batch_size)
+                .all())
+        if not rows:
+            break
+        for row in rows:
+            result = parse_corporation_text(row.raw_text or "", source=row.source_name or "")
+            for key, value in _columns_from_result(result).items():
+                setattr(row, key, value)
+            row.payload = result
+            row.parser_version = PARSER_VERSION
+            rebuild_officer_terms(row)
+            last_id = row.id
+        db.session.commit()
+        total += len(rows)
+    return total
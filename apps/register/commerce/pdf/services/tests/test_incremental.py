@@ -0,0 +1,80 @@
+# apps/register/commerce/pdf/services/tests/test_incremental.py
+"""
+セクションのスナップショットと差分（incremental.build_snapshot / diff_snapshots）の確認。
+"""
+from apps.register.commerce.pdf.services import parser
+from apps.register.commerce.pdf.services.incremental import build_snapshot, diff_snapshots
+
+NORM = """東京都千代田区 会社法人等番号 0100-01-000001
+┣
+商号 株式会社甲野商事
+┣
+本店 東京都千代田区丸の内一丁目1番1号
+┣
+役員に関する事項
+取締役 甲野太郎
+令和3年4月1日就任
+┣
+登記記録に関する事項
+設立
+"""
+HEAD_OFFICE = "┣\n本店 東京都千代田区丸の内一丁目1番1号\n"
+
+
+def test_repeat_upload_has_no_diff_and_reuses_every_section():
+    first = parser.parse_normalized(NORM)
+    second = parser.parse_normalized(NORM, previous=first)
+    assert second["diff"] == {}
+    assert second["sections"] == first["sections"]
+    assert set(second["reused_sections"]) == set(first["sections"])
+
+
+def test_first_upload_has_no_diff():
+    assert parser.parse_normalized(NORM)["diff"] is None
+
+
+def test_changed_section():
+    first = parser.parse_normalized(NORM)
+    second = parser.parse_normalized(NORM.replace("甲野太郎", "乙野次郎"), previous=first)
+    assert list(second["diff"]) == ["役員に関する事項"]
+    d = second["diff"]["役員に関する事項"]
+    assert d["status"] == "changed"
+    assert d["added"] == d["removed"] == []
+    [change] = d["changed"]
+    assert any("乙野次郎" in t for t in change["added"])
+    assert any("甲野太郎" in t for t in change["removed"])
+
+
+def test_added_and_removed_sections():
+    without_office = NORM.replace(HEAD_OFFICE, "")
+    first = parser.parse_normalized(without_office)
+    second = parser.parse_normalized(NORM, previous=first)
+    assert second["diff"]["本店"]["status"] == "added"
+    assert second["diff"]["本店"]["added"] == ["#1"]
+    assert list(second["diff"]) == ["本店"]
+
+    third = parser.parse_normalized(without_office, previous=second)
+    assert third["diff"]["本店"] == {"status": "removed", "added": [], "removed": ["#1"], "changed": []}
+
+
+def test_item_level_diff_uses_labels():
+    old, _ = build_snapshot({"株式": "┃発行済株式の総数│100株│┃\n┠\n┃資本金の額│金100万円│┃"})
+    new, unchanged = build_snapshot(
+        {"株式": "┃発行済株式の総数│200株│令和5年1月1日変更┃\n┠\n┃新株予約権│第1回│┃"}, old)
+    assert unchanged == []
+    d = diff_snapshots(old, new)["株式"]
+    assert d["status"] == "changed"
+    assert d["added"] == ["新株予約権"]
+    assert d["removed"] == ["資本金の額"]
+    [change] = d["changed"]
+    assert change["key"] == "発行済株式の総数"
+    assert ["200株" in t for t in change["added"]] == [True]
+    assert ["100株" in t for t in change["removed"]] == [True]
+
+
+def test_unchanged_section_keeps_previous_entry():
+    old, _ = build_snapshot({"資本金の額": "┃資本金の額│金100万円│┃"})
+    new, unchanged = build_snapshot({"資本金の額": "┃資本金の額│金100万円│┃"}, old)
+    assert unchanged == ["資本金の額"]
+    assert new["資本金の額"] is old["資本金の額"]
+    assert diff_snapshots(old, new) == {}
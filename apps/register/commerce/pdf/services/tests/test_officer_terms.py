@@ -0,0 +1,114 @@
+# apps/register/commerce/pdf/services/tests/test_officer_terms.py
+"""
+役員任期（officer_terms の add_months / _term_rows / expiring_within）の確認。
+DB には投げない（行の計算と、満了日の範囲検索の SQL の形まで）。
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from apps import create_app
+from apps.register.commerce.models import ParsedRegistry
+from apps.register.commerce.pdf.services import officer_terms
+from apps.register.commerce.pdf.services.officer_terms import add_months
+
+TERM_YEARS = {"取締役": 2, "監査役": 4}   # 代表社員などは任期管理の対象外（None）
+
+
+@pytest.fixture(scope="module")
+def app():
+    return create_app()
+
+
+def _officer(role, name, *events):
+    return {"role": role, "name": name, "address": None,
+            "events": [{"event": e, "date": d} for e, d in events]}
+
+
+def _registry(officers):
+    return ParsedRegistry(id=5, corporate_number="010001000001", company_name="株式会社甲野商事",
+                          payload={"officers": officers})
+
+
+# =========================
+# add_months
+# =========================
+def test_add_months_clamps_to_month_end():
+    assert add_months(date(2024, 2, 29), 12) == date(2025, 2, 28)
+    assert add_months(date(2024, 2, 29), 48) == date(2028, 2, 29)
+    assert add_months(date(2024, 1, 31), 1) == date(2024, 2, 29)
+    assert add_months(date(2023, 1, 31), 1) == date(2023, 2, 28)
+    assert add_months(date(2024, 3, 31), 1) == date(2024, 4, 30)
+
+
+def test_add_months_rolls_over_years():
+    assert add_months(date(2024, 11, 15), 3) == date(2025, 2, 15)
+    assert add_months(date(2024, 12, 1), 12) == date(2025, 12, 1)
+    assert add_months(date(2024, 1, 15), -1) == date(2023, 12, 15)
+    assert add_months(date(2024, 6, 1), 0) == date(2024, 6, 1)
+
+
+# =========================
+# _term_rows
+# =========================
+def test_term_rows(monkeypatch):
+    monkeypatch.setattr(officer_terms, "term_years_for", lambda role, number: TERM_YEARS.get(role))
+    row = _registry([
+        _officer("取締役", "甲野 太郎", ("就任", "2020-06-01"), ("重任", "2022-06-01")),
+        _officer("監査役", "丙野花子", ("就任", "2024-02-29")),
+        _officer("代表社員", "丁野四郎", ("就任", "2021-04-01")),   # 任期なし
+        _officer("取締役", "乙野次郎", ("就任", "2020-06-01"), ("辞任", "2021-03-31")),   # 退任済み
+    ])
+    rows = officer_terms._term_rows(row)
+
+    assert [(r["role"], r["officer_name"]) for r in rows] == [("取締役", "甲野太郎"), ("監査役", "丙野花子")]
+    director, auditor = rows
+    assert director == {
+        "parsed_registry_id": 5,
+        "corporate_number": "010001000001",
+        "company_name": "株式会社甲野商事",
+        "officer_name": "甲野太郎",
+        "role": "取締役",
+        "appointed_on": date(2022, 6, 1),   # 重任で更新
+        "term_years": 2,
+        "expires_on": date(2024, 6, 1),
+    }
+    assert (auditor["term_years"], auditor["expires_on"]) == (4, date(2028, 2, 29))
+
+
+def test_term_rows_skips_officers_without_term_start(monkeypatch):
+    monkeypatch.setattr(officer_terms, "term_years_for", lambda role, number: 2)
+    row = _registry([_officer("取締役", "甲野太郎")])   # 就任日が読めなかった
+    assert officer_terms._term_rows(row) == []
+    assert officer_terms._term_rows(ParsedRegistry(id=6, corporate_number="010001000002", payload=None)) == []
+
+
+# =========================
+# expiring_within
+# =========================
+class _Executed(Exception):
+    pass
+
+
+def _expiring_sql(monkeypatch, app, months, today):
+    calls = []
+
+    def execute(stmt, *args, **kwargs):
+        calls.append(stmt)
+        raise _Executed
+
+    with app.app_context():
+        # Query は scoped_session ではなく中身の Session の execute を呼ぶ
+        monkeypatch.setattr(officer_terms.db.session(), "execute", execute)
+        with pytest.raises(_Executed):
+            officer_terms.expiring_within(months, today=today)
+    [stmt] = calls
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_expiring_within_is_a_half_open_window(monkeypatch, app):
+    sql = _expiring_sql(monkeypatch, app, 3, date(2025, 11, 30))
+    assert "officer_term.expires_on >= '2025-11-30'" in sql
+    assert "officer_term.expires_on < '2026-02-28'" in sql   # 月末に丸める
+    assert sql.rstrip().endswith("ORDER BY officer_term.expires_on ASC, officer_term.corporate_number ASC")
@@ -0,0 +1,44 @@
+# apps/register/commerce/pdf/services/tests/test_officers.py
+"""
+現任役員の判定（officers.current_officers / current_representative）の確認。
+入力は parser.parse_officers の出力（payload["officers"]）そのもの。
+"""
+from apps.register.commerce.pdf.services.officers import current_officers, current_representative
+from apps.register.commerce.pdf.services.parser import parse_officers
+
+SECTION = """役員に関する事項
+取締役 甲野 太郎
+令和2年6月1日就任
+取締役 甲野 太郎
+令和4年6月1日重任
+代表取締役 甲野 太郎
+令和4年6月1日重任
+取締役 乙野次郎
+令和2年6月1日就任
+取締役 乙野次郎
+令和3年3月31日辞任
+東京都千代田区丸の内一丁目1番1号
+監査役 丙野花子
+令和2年6月1日就任
+"""
+
+
+def _payload():
+    return {"officers": parse_officers(SECTION)}
+
+
+def test_current_officers_follow_the_parsed_events():
+    officers = {(o["role"], o["name"]): o for o in current_officers(_payload())}
+    assert set(officers) == {("取締役", "甲野太郎"), ("代表取締役", "甲野太郎"), ("監査役", "丙野花子")}
+    assert officers[("取締役", "甲野太郎")]["term_start"] == "2022-06-01"   # 重任で更新
+    assert officers[("監査役", "丙野花子")]["address"] == "東京都千代田区丸の内一丁目1番1号"
+
+
+def test_current_representative():
+    rep = current_representative(_payload())
+    assert (rep["role"], rep["name"], rep["term_start"]) == ("代表取締役", "甲野太郎", "2022-06-01")
+
+
+def test_payload_without_officers():
+    assert current_officers({}) == []
+    assert current_representative({"officers": []}) is None
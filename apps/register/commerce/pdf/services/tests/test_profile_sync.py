@@ -0,0 +1,45 @@
+# apps/register/commerce/pdf/services/tests/test_profile_sync.py
+"""
+代表者の一括同期（profile_sync.sync_corporate_profiles）の確認。
+DB は読まず、バッチの突き合わせ（_sync_batch）を差し替えて渡された内容を見る。
+payload は代表者名だけを持つ dict にし、current_representative もそれを読むものに差し替える。
+"""
+from datetime import datetime
+
+from apps.register.commerce.pdf.services import profile_sync
+
+
+def _payload(name):
+    return {"representative": name}
+
+
+def _run(monkeypatch, records, batch_size):
+    batches = []
+    monkeypatch.setattr(profile_sync, "current_representative",
+                        lambda payload: {"role": "代表取締役", "name": payload["representative"]})
+    monkeypatch.setattr(profile_sync, "_sync_batch", lambda batch, report: batches.append(dict(batch)))
+    report = profile_sync.sync_corporate_profiles(records, dry_run=True, batch_size=batch_size)
+    return report, batches
+
+
+def test_newest_as_of_wins_across_batches(monkeypatch):
+    records = [
+        ("010501000001", datetime(2025, 5, 1), _payload("甲野新")),
+        ("010501000002", datetime(2025, 1, 1), _payload("乙野")),
+        ("010501000001", datetime(2024, 1, 1), _payload("甲野旧")),   # 次のバッチに来る古い登記簿
+        ("010501000003", None, _payload("丙野")),
+    ]
+    report, batches = _run(monkeypatch, records, batch_size=1)
+
+    assert report.registries == 3
+    merged = [(number, values["representative_name"]) for b in batches for number, values in b.items()]
+    assert merged == [("010501000001", "甲野新"), ("010501000002", "乙野"), ("010501000003", "丙野")]
+
+
+def test_dated_record_beats_undated_one(monkeypatch):
+    records = [
+        ("010501000001", datetime(2025, 5, 1), _payload("甲野新")),
+        ("010501000001", None, _payload("甲野不明")),
+    ]
+    _, batches = _run(monkeypatch, records, batch_size=200)
+    assert batches == [{"010501000001": {"representative_name": "甲野新", "representative_title": "代表取締役"}}]
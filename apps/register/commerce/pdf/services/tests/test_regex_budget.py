@@ -0,0 +1,108 @@
+# apps/register/commerce/pdf/services/tests/test_regex_budget.py
+"""
+登記簿パーサの正規表現が長い行で爆発しないことの確認（ファズ＋時間予算）。
+
+崩れた PDF から出る「同じ文字の長い連続」「ラベルの後ろに延々と空白」などを
+各関数に直接渡し、1回あたり TIME_BUDGET 秒以内に終わることを見る。
+（以前の (都|道|府|県).+(市|区|郡|町|村).*(番|号|丁目|F|階) などは N=20,000 で数十秒〜）
+"""
+import random
+import time
+
+import pytest
+
+from apps.shared.jp_amount import jp_amount_to_int
+from apps.shared.wareki import wareki_str_to_iso
+from apps.register.commerce.pdf.services import parser
+from apps.register.commerce.pdf.services.normalize import MAX_LINE_LENGTH, normalize_text
+from apps.______register.parser.commerce import patterns
+
+N = 20_000          # 敵対的入力の長さ
+TIME_BUDGET = 0.5   # 1呼び出しあたりの上限（秒）。線形なら数ミリ秒で終わる
+
+
+def _assert_fast(fn, arg):
+    start = time.perf_counter()
+    fn(arg)
+    elapsed = time.perf_counter() - start
+    assert elapsed < TIME_BUDGET, f"{getattr(fn, '__name__', fn)}: {elapsed:.2f}s (len={len(arg)})"
+
+
+# =========================
+# 敵対的入力（関数ごと）
+# =========================
+ADVERSARIAL = [
+    (parser.parse_metadata,           "\n" + "2025/01/01 10:00 " * (N // 16)),
+    (parser.parse_head_office,        "本店\n" + "県" * N),
+    (parser.parse_head_office,        "本店\n" + "東京都" + "区" * N),
+    (parser.parse_officers,           "役員\n" + "県市" * (N // 2)),
+    (parser.parse_officers,           "役員\n取締役 " + "県" * N),
+    (parser.parse_registration_notes, "登記\n移転" + "あ" * N),
+    (parser.parse_registration_notes, "登記\n移転" + "令和1" * (N // 3)),
+    (parser.parse_purposes,           "目的\n" + "1" * N),
+    (parser.parse_authorized_shares,  "発行可能株式総数 " + "1" * N),
+    (parser.parse_capital,            "資本金の額 金" + "1" * N),
+    (jp_amount_to_int,                "1" * N),
+    (jp_amount_to_int,                "金" + "1" * N + "円"),
+    (jp_amount_to_int,                ("1" + " " * 50) * (N // 51)),
+    (wareki_str_to_iso,               "令和" + "1" * N),
+    (wareki_str_to_iso,               "令和 " * (N // 3)),
+    (normalize_text,                  "┏" + "━" * N + "┓\n┃" + "あ " * N + "┃\n┗┛"),
+]
+
+
+@pytest.mark.parametrize("fn, arg", ADVERSARIAL,
+                         ids=[f"{fn.__name__}-{i}" for i, (fn, _) in enumerate(ADVERSARIAL)])
+def test_adversarial_inputs_within_budget(fn, arg):
+    _assert_fast(fn, arg)
+
+
+PATTERN_INPUTS = [
+    ("RE_COMPANY_NAME",         "商号 a" + " " * N + "b\nx"),
+    ("RE_HEAD_OFFICE",          "|本店" + " " * N + "x"),
+    ("RE_CORPORATE_NUMBER",     "会社法人等番号" + " " * N),
+    ("RE_PURPOSE_HEAD",         "目的" + " " * N + "x"),
+    ("RE_PURPOSE_LINE",         " " * N),
+    ("RE_PUBLIC_NOTICE",        "|公告をする方法 " + "a " * (N // 2) + "\n"),
+    ("RE_CAPITAL",              "資本金の額" + " " * N + "1" * N),
+    ("RE_AUTHORIZED_SHARES",    "発行可能株式総数 " + "1," * (N // 2)),
+    ("RE_TRANSFER_RESTRICTION", "|株式の譲渡制限に関する規定" + " |" * (N // 2)),
+    ("RE_OFFICER_LINE",         "|取締役" + " " * N),
+    ("RE_RECEIPT",              "受付" + " " * N + "x"),
+    ("RE_RECEIPT",              "受付 令和5年1月1日" + "第" * N),
+    ("RE_RECEIPT_DATE",         "令" + "1" * N),
+    ("RE_RECEIPT_NUMBER",       "第" + "1" * N),
+]
+
+
+@pytest.mark.parametrize("name, arg", PATTERN_INPUTS,
+                         ids=[f"{name}-{i}" for i, (name, _) in enumerate(PATTERN_INPUTS)])
+def test_legacy_patterns_within_budget(name, arg):
+    _assert_fast(getattr(patterns, name).search, arg)
+
+
+# =========================
+# ランダム（登記簿に出る文字だけで組み立てる）
+# =========================
+ALPHABET = list("都道府県市区郡町村番号丁目F階金億万円株令和平成年月日第受付移転登記から本店") + \
+           list("0123456789０１２３４５６７８９ 　:：|┃│├─━┏┓┗┛\n")
+FUNCS = [
+    parser.parse_metadata, parser.parse_head_office, parser.parse_officers,
+    parser.parse_registration_notes, parser.parse_purposes, parser.parse_issued_shares,
+    jp_amount_to_int, wareki_str_to_iso, normalize_text,
+]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_inputs_within_budget(seed):
+    rnd = random.Random(seed)
+    text = "".join(rnd.choice(ALPHABET) for _ in range(N))
+    for fn in FUNCS:
+        _assert_fast(fn, text)
+    for name in (n for n in dir(patterns) if n.startswith("RE_")):
+        _assert_fast(getattr(patterns, name).search, text)
+
+
+def test_normalize_caps_line_length():
+    norm = normalize_text("┏━┓\n┃" + "あ" * (MAX_LINE_LENGTH * 3) + "┃\n┗━┛")
+    assert max(len(ln) for ln in norm.splitlines()) <= MAX_LINE_LENGTH
@@ -0,0 +1,57 @@
+# apps/register/commerce/pdf/services/tests/test_section_reuse.py
+"""
+前回の解析結果の再利用（parser._SectionReuse）の確認。
+入力が前回と同じセクションはパーサを呼ばず、変わったセクションだけを解析し直す。
+"""
+from apps.register.commerce.pdf.services import parser
+
+NORM = """東京都千代田区 会社法人等番号 0100-01-000001
+┣
+商号 株式会社甲野商事
+┣
+本店 東京都千代田区丸の内一丁目1番1号
+┣
+役員に関する事項
+取締役 甲野太郎
+令和3年4月1日就任
+┣
+登記記録に関する事項
+設立
+"""
+
+
+def _fail(sec):
+    raise AssertionError("unchanged section was parsed again")
+
+
+def test_unchanged_sections_are_not_parsed_again(monkeypatch):
+    first = parser.parse_normalized(NORM)
+    assert first["officers"][0]["name"] == "甲野太郎"
+
+    monkeypatch.setattr(parser, "parse_officers", _fail)
+    monkeypatch.setattr(parser, "parse_head_office", _fail)
+    monkeypatch.setattr(parser, "parse_registration_notes", _fail)
+    second = parser.parse_normalized(NORM.replace("甲野商事", "乙野商事"), previous=first)
+
+    assert second["company_profile"]["trade_name"]["current"] == "株式会社乙野商事"
+    assert second["officers"] == first["officers"]
+    assert second["company_profile"]["head_office"] == first["company_profile"]["head_office"]
+    assert set(second["reused_sections"]) == {"本店", "役員に関する事項", "登記記録に関する事項"}
+
+
+def test_changed_section_is_parsed_again(monkeypatch):
+    first = parser.parse_normalized(NORM)
+    monkeypatch.setattr(parser, "parse_trade_name", _fail)
+    second = parser.parse_normalized(NORM.replace("甲野太郎", "乙野次郎"), previous=first)
+
+    assert second["officers"][0]["name"] == "乙野次郎"
+    assert "役員に関する事項" not in second["reused_sections"]
+    assert second["officers"] is not first["officers"]
+
+
+def test_previous_without_fingerprints_parses_everything():
+    first = parser.parse_normalized(NORM)
+    del first["sections"]
+    second = parser.parse_normalized(NORM, previous=first)
+    assert second["reused_sections"] == []
+    assert second["officers"] == first["officers"]
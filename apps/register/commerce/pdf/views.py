@@ -1,12 +1,15 @@
 # apps/register/commerce/pdf/views.py
 import json
+from datetime import datetime
 from typing import List
-from flask import Blueprint, render_template, redirect, url_for, flash
+from flask import Blueprint, render_template, redirect, url_for, flash, request, abort
+from sqlalchemy.exc import SQLAlchemyError
 from werkzeug.utils import secure_filename
 from pprint import pprint
+from db import db
 from ...shared.pdf_reader import pdf_file_to_text
 from .forms import PDFUploadForm
-from .services.parser import parse_corporation_registry
+# store / officer_terms は解析器（正規表現の多いモジュール）を引き込むので、使うビューの中で import する
 from .services.normalize import extract_table_block, normalize_text
 from .services.debug_utils import split_section_blocks, Section  # ← 追加
 from .services.adapters import to_registry_sections             # ← 追加
@@ -34,22 +37,53 @@ def upload():
             flash("PDFを選んでください。", "warning")
             return redirect(url_for(".upload"))
 
-        text = pdf_file_to_text(f)
+        from .services import store
 
-        # parse_corporation_registry は Path 前提なので一時保存して渡す
-        import tempfile, os, pathlib
-        f.seek(0)
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-            tmp.write(f.read())
-            tmp_path = pathlib.Path(tmp.name)
+        # 同じ PDF は parsed_registry から返す（未解析なら解析して保存）
+        row = store.get_or_parse(f.read(), source_name=fn)
         try:
-            result = parse_corporation_registry(tmp_path)
-        finally:
-            os.unlink(tmp_path)
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            flash("解析結果の保存に失敗しました。", "danger")
+            return redirect(url_for(".upload"))
 
-        return render_template("result.html", filename=fn, text=text, result=result)
+        return render_template("result.html", filename=fn, text=row.raw_text, result=row.payload)
     return render_template("upload.html", form=form)
 
+@bp.route("/registry/<corporate_number>")
+def lookup(corporate_number: str):
+    """
+    会社法人等番号で保存済みの最新解析結果を表示（再解析しない）。
+    ?as_of=YYYY-MM-DD でその日以前の最新を返す。
+    """
+    from .services import store
+
+    as_of = request.args.get("as_of")
+    as_of_dt = None
+    if as_of:
+        try:
+            as_of_dt = datetime.strptime(as_of, "%Y-%m-%d").replace(hour=23, minute=59)
+        except ValueError:
+            flash("as_of は YYYY-MM-DD で指定してください。", "warning")
+    row = store.latest_for(corporate_number, as_of=as_of_dt)
+    if row is None:
+        abort(404)
+    return render_template("result.html",
+                           filename=row.source_name or row.company_name,
+                           text=row.raw_text,
+                           result=row.payload)
+
+@bp.route("/officer-terms")
+def expiring_terms():
+    """任期満了が近い役員の一覧。?months=N（既定3か月）。"""
+    months = request.args.get("months", 3, type=int)
+    months = min(max(months or 1, 1), 60)
+    from .services import officer_terms
+
+    terms = officer_terms.expiring_within(months)
+    return render_template("officer_terms.html", terms=terms, months=months)
+
 @bp.route("/debug_norm", methods=["GET", "POST"])
 def debug_norm():
     form = PDFUploadForm()
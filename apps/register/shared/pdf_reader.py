@@ -1,51 +1,66 @@
 # apps/register/shared/pdf_reader.py
 from pathlib import Path
-import tempfile, os
+import tempfile, os, time
+
+from apps.common.metrics import PDF_EXTRACT
 
 # =========================
 # 1) PDFテキスト抽出（3段フォールバック）
 # =========================
-def extract_text_from_pdf(pdf_path: Path) -> str:
-    """
-    PDF→テキストの抽出。
-    - まず PyPDF2（軽量・速い）を試し、ダメなら pdfminer（強力）、最後に pdfplumber（表に強い）を試す。
-    - いずれでも失敗したら空文字を返す（呼び出し側で判定）。
-    """
-    text = ""
-    # (a) PyPDF2
+def _run_backend(name: str, fn, pdf_path: Path) -> str:
+    """1つの抽出方法を試す（失敗は空文字）。処理時間と結果を backend ごとに記録する。"""
+    start = time.perf_counter()
+    result = "error"
     try:
-        from PyPDF2 import PdfReader
-        reader = PdfReader(str(pdf_path))
-        pages = []
-        for p in reader.pages:
-            try:
-                pages.append(p.extract_text() or "")
-            except Exception:
-                pages.append("")
-        text = "\n".join(pages)
+        text = fn(pdf_path) or ""
+        result = "ok" if text.strip() else "empty"
+        return text
     except Exception:
-        pass
+        return ""
+    finally:
+        PDF_EXTRACT.labels(backend=name, result=result).observe(time.perf_counter() - start)
 
-    # (b) pdfminer
-    if not text.strip():
-        try:
-            from pdfminer.high_level import extract_text
-            text = extract_text(str(pdf_path))
-        except Exception:
-            pass
 
-    # (c) pdfplumber
-    if not text.strip():
+def _extract_pypdf2(pdf_path: Path) -> str:
+    from PyPDF2 import PdfReader
+    reader = PdfReader(str(pdf_path))
+    pages = []
+    for p in reader.pages:
         try:
-            import pdfplumber
-            with pdfplumber.open(str(pdf_path)) as pdf:
-                pages = []
-                for page in pdf.pages:
-                    pages.append(page.extract_text() or "")
-                text = "\n".join(pages)
+            pages.append(p.extract_text() or "")
         except Exception:
-            pass
-    return text or ""
+            pages.append("")
+    return "\n".join(pages)
+
+
+def _extract_pdfminer(pdf_path: Path) -> str:
+    from pdfminer.high_level import extract_text
+    return extract_text(str(pdf_path))
+
+
+def _extract_pdfplumber(pdf_path: Path) -> str:
+    import pdfplumber
+    with pdfplumber.open(str(pdf_path)) as pdf:
+        pages = []
+        for page in pdf.pages:
+            pages.append(page.extract_text() or "")
+        return "\n".join(pages)
+
+
+_BACKENDS = (("pypdf2", _extract_pypdf2), ("pdfminer", _extract_pdfminer), ("pdfplumber", _extract_pdfplumber))
+
+
+def extract_text_from_pdf(pdf_path: Path) -> str:
+    """
+    PDF→テキストの抽出。
+    - まず PyPDF2（軽量・速い）を試し、ダメなら pdfminer（強力）、最後に pdfplumber（表に強い）を試す。
+    - いずれでも失敗したら空文字を返す（呼び出し側で判定）。
+    """
+    for name, fn in _BACKENDS:
+        text = _run_backend(name, fn, pdf_path)
+        if text.strip():
+            return text
+    return ""
 
 
 # =========================
@@ -58,7 +73,14 @@ def pdf_file_to_text(file_storage) -> str:
     """
     data = file_storage.read()
     file_storage.seek(0)  # 呼び出し側で再利用できるように戻す
+    return pdf_bytes_to_text(data)
 
+
+# =========================
+# 3) bytes → テキスト抽出
+# =========================
+def pdf_bytes_to_text(data: bytes) -> str:
+    """PDF の bytes を一時ファイルに書き出してテキストを抽出する。"""
     with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
         tmp.write(data)
         tmp_path = Path(tmp.name)
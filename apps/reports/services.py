@@ -0,0 +1,158 @@
+# apps/reports/services.py
+"""
+売上・件数の集計（金額書類）。
+
+集計は Postgres のマテリアライズドビュー amount_report_monthly に持たせる:
+    (基準日の種類, 月, 受託簿, クライアント種別) ごとの 件数 / 報酬 / 実費 / 消費税 / 源泉徴収 / 合計
+- 金額は AmountDocument の保存済み集計列（reward_total ...）の合計。明細や Python 側の計算は使わない
+- 基準日は 見積日 / 請求日 / 入金日 の3種類（日付の無い書類はその基準では数えない）
+- 画面・CSV はこのビューをさらに「月 × 受託簿」「月 × クライアント種別」「月」で合計するだけなので、
+  書類が増えても数ミリ秒で返る
+- 中身はリフレッシュした時点のもの。flask reports refresh（cron）か画面の Refresh で
+  REFRESH MATERIALIZED VIEW CONCURRENTLY（読み取りを止めない）
+
+ビューの作成は migrations 0007、または db.create_all で作った DB なら flask reports init（SQL は apps/reports/sql.py）。
+"""
+from __future__ import annotations
+import csv
+import io
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import Date, Integer, String, BigInteger, column, func, select, table, text
+
+from apps.client.constants import ClientType
+from apps.entrusted_book.models import EntrustedBook
+from apps.reports.sql import CREATE_INDEX_SQL, CREATE_VIEW_SQL, VIEW_NAME
+from db import db
+
+# 基準日 → 書類の列
+BASES: Dict[str, str] = {
+    "invoice": "請求日",
+    "receipt": "入金日",
+    "estimate": "見積日",
+}
+DEFAULT_BASIS = "invoice"
+
+# 月ごとの内訳
+GROUPS: Dict[str, str] = {
+    "book": "受託簿",
+    "client_type": "クライアント種別",
+    "month": "月計",
+}
+DEFAULT_GROUP = "book"
+
+AMOUNT_FIELDS = ("documents", "reward", "expense", "tax", "withholding", "grand_total")
+
+# ビューは db.metadata に入れない（create_all・schema-check の対象外）
+report_view = table(
+    VIEW_NAME,
+    column("basis", String),
+    column("month", Date),
+    column("entrusted_book_id", Integer),
+    column("client_type_id", Integer),
+    *[column(name, BigInteger) for name in AMOUNT_FIELDS],
+)
+
+
+@dataclass
+class ReportRow:
+    month: date
+    key: Optional[int]   # 受託簿 id / クライアント種別 id（月計は None）
+    label: str
+    documents: int
+    reward: int
+    expense: int
+    tax: int
+    withholding: int
+    grand_total: int
+
+
+# =========================
+# 作成・リフレッシュ
+# =========================
+def create_report_view() -> None:
+    db.session.execute(text(CREATE_VIEW_SQL))
+    db.session.execute(text(CREATE_INDEX_SQL))
+    db.session.commit()
+
+
+def refresh_report(*, concurrently: bool = True) -> None:
+    """集計を作り直す。CONCURRENTLY なら集計中も画面・CSV は前回の内容を返し続ける。"""
+    mode = " CONCURRENTLY" if concurrently else ""
+    db.session.execute(text(f"REFRESH MATERIALIZED VIEW{mode} {VIEW_NAME}"))
+    db.session.commit()
+
+
+# =========================
+# 集計
+# =========================
+def _client_type_label(type_id: Optional[int]) -> str:
+    try:
+        return ClientType(type_id).label
+    except ValueError:
+        return str(type_id)
+
+
+def monthly_report(basis: str = DEFAULT_BASIS, group: str = DEFAULT_GROUP, *,
+                   date_from: Optional[date] = None, date_to: Optional[date] = None) -> List[ReportRow]:
+    """
+    月ごとの集計（新しい月が先）。group で月の中の内訳を選ぶ。
+    date_from / date_to は月の範囲（その日を含む月から・その日を含む月まで）。
+    """
+    basis = basis if basis in BASES else DEFAULT_BASIS
+    group = group if group in GROUPS else DEFAULT_GROUP
+    v = report_view.c
+
+    sums = [func.sum(getattr(v, name)).label(name) for name in AMOUNT_FIELDS]
+    if group == "book":
+        key = v.entrusted_book_id
+        stmt = (select(v.month, key.label("key"), EntrustedBook.name.label("label"), *sums)
+                .select_from(report_view)
+                .outerjoin(EntrustedBook, EntrustedBook.id == v.entrusted_book_id)
+                .group_by(v.month, key, EntrustedBook.name))
+    elif group == "client_type":
+        key = v.client_type_id
+        stmt = select(v.month, key.label("key"), *sums).group_by(v.month, key)
+    else:
+        key = None
+        stmt = select(v.month, *sums).group_by(v.month)
+
+    stmt = stmt.where(v.basis == basis)
+    if date_from:
+        stmt = stmt.where(v.month >= date_from.replace(day=1))
+    if date_to:
+        stmt = stmt.where(v.month <= date_to)
+    stmt = stmt.order_by(v.month.desc(), *([] if key is None else [key]))
+
+    rows = []
+    for r in db.session.execute(stmt):
+        if group == "book":
+            row_key, label = r.key, r.label or f"#{r.key}"
+        elif group == "client_type":
+            row_key, label = r.key, _client_type_label(r.key)
+        else:
+            row_key, label = None, GROUPS["month"]
+        rows.append(ReportRow(month=r.month, key=row_key, label=label,
+                              **{name: int(getattr(r, name) or 0) for name in AMOUNT_FIELDS}))
+    return rows
+
+
+def totals(rows: List[ReportRow]) -> Dict[str, int]:
+    return {name: sum(getattr(r, name) for r in rows) for name in AMOUNT_FIELDS}
+
+
+# =========================
+# CSV
+# =========================
+def report_csv(rows: List[ReportRow], group: str = DEFAULT_GROUP) -> str:
+    """Excel でそのまま開けるよう BOM 付き UTF-8 で返す（ヘッダーは日本語）。"""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\r\n")
+    writer.writerow(["月", GROUPS.get(group, GROUPS[DEFAULT_GROUP]),
+                     "件数", "報酬", "実費", "消費税", "源泉徴収", "合計"])
+    for r in rows:
+        writer.writerow([r.month.strftime("%Y-%m"), r.label,
+                         r.documents, r.reward, r.expense, r.tax, r.withholding, r.grand_total])
+    return "\ufeff" + buf.getvalue()
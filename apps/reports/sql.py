@@ -0,0 +1,42 @@
+# apps/reports/sql.py
+"""
+売上集計のマテリアライズドビュー amount_report_monthly の現在の定義（flask reports init・services が使う）。
+
+migrations 0007 は作成時点の SQL を写して持つ（リビジョンはその時点の固定の内容にするため、ここを import しない）。
+定義を変えるときは、ここを直したうえで、新しい SQL を書き写した DROP → CREATE → CREATE INDEX の
+リビジョンを足すこと（既存の DB は IF NOT EXISTS で作り直されない）。
+"""
+
+VIEW_NAME = "amount_report_monthly"
+
+CREATE_VIEW_SQL = f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS {VIEW_NAME} AS
+SELECT b.basis,
+       date_trunc('month', b.day)::date AS month,
+       c.entrusted_book_id,
+       c.client_type_id,
+       count(*)                         AS documents,
+       sum(d.reward_total)::bigint      AS reward,
+       sum(d.expense_total)::bigint     AS expense,
+       sum(d.tax_total)::bigint         AS tax,
+       sum(d.withholding_total)::bigint AS withholding,
+       sum(d.grand_total)::bigint       AS grand_total
+FROM amount_document d
+JOIN client c ON c.id = d.client_id
+CROSS JOIN LATERAL (VALUES
+    ('estimate', d.estimate_date),
+    ('invoice',  d.invoice_date),
+    ('receipt',  d.receipt_date)
+) AS b(basis, day)
+WHERE b.day IS NOT NULL
+GROUP BY 1, 2, 3, 4
+WITH DATA
+"""
+
+# CONCURRENTLY でリフレッシュするには一意インデックスが要る
+CREATE_INDEX_SQL = (
+    f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{VIEW_NAME} "
+    f"ON {VIEW_NAME} (basis, month, entrusted_book_id, client_type_id)"
+)
+
+DROP_VIEW_SQL = f"DROP MATERIALIZED VIEW IF EXISTS {VIEW_NAME}"
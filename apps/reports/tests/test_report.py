@@ -0,0 +1,70 @@
+# apps/reports/tests/test_report.py
+"""
+売上集計（apps/reports/services.py の monthly_report / report_csv）の確認。
+DB には投げない（ビューへの SQL の形と、結果の詰め替え・CSV まで）。
+"""
+from collections import namedtuple
+from datetime import date
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from apps import create_app
+from apps.reports import services
+
+SUMS = dict(documents=2, reward=100000, expense=5000, tax=10000, withholding=10210, grand_total=104790)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def models():
+    create_app()   # 受託簿の名前を join するので、リレーション先のモデルまで読み込んでおく
+
+
+def _run(monkeypatch, rows, **kwargs):
+    calls = []
+    monkeypatch.setattr(services.db.session, "execute", lambda stmt: calls.append(stmt) or rows)
+    result = services.monthly_report(**kwargs)
+    assert len(calls) == 1
+    sql = str(calls[0].compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    return result, sql
+
+
+def test_groups_by_month_and_book(monkeypatch):
+    Row = namedtuple("Row", ["month", "key", "label", *services.AMOUNT_FIELDS])
+    rows = [Row(date(2026, 4, 1), 7, "甲野売買", **SUMS), Row(date(2026, 4, 1), 8, None, **SUMS)]
+    result, sql = _run(monkeypatch, rows, basis="receipt", group="book",
+                       date_from=date(2026, 1, 15), date_to=date(2026, 6, 30))
+
+    assert "amount_report_monthly.basis = 'receipt'" in sql
+    assert "amount_report_monthly.month >= '2026-01-01'" in sql
+    assert sql.rstrip().endswith("ORDER BY amount_report_monthly.month DESC, amount_report_monthly.entrusted_book_id")
+    assert "GROUP BY amount_report_monthly.month, amount_report_monthly.entrusted_book_id, entrusted_book.name" in sql
+    assert [(r.key, r.label) for r in result] == [(7, "甲野売買"), (8, "#8")]   # 削除済みの受託簿は id
+    assert result[0].grand_total == 104790
+
+
+def test_client_type_labels_and_unknown_basis(monkeypatch):
+    Row = namedtuple("Row", ["month", "key", *services.AMOUNT_FIELDS])
+    rows = [Row(date(2026, 4, 1), 1, **SUMS), Row(date(2026, 4, 1), 99, **{**SUMS, "tax": None})]
+    result, sql = _run(monkeypatch, rows, basis="nope", group="client_type")
+
+    assert "amount_report_monthly.basis = 'invoice'" in sql       # 不明な基準日は請求日
+    assert "GROUP BY amount_report_monthly.month, amount_report_monthly.client_type_id" in sql
+    assert [r.label for r in result] == ["権利者", "99"]
+    assert result[1].tax == 0
+
+
+def test_month_totals(monkeypatch):
+    Row = namedtuple("Row", ["month", *services.AMOUNT_FIELDS])
+    result, sql = _run(monkeypatch, [Row(date(2026, 4, 1), **SUMS)], group="month")
+    assert "GROUP BY amount_report_monthly.month" in sql
+    assert (result[0].key, result[0].label) == (None, "月計")
+    assert services.totals(result + result)["documents"] == 4
+
+
+def test_csv_has_bom_and_japanese_headers():
+    rows = [services.ReportRow(month=date(2026, 4, 1), key=7, label="甲野売買", **SUMS)]
+    text = services.report_csv(rows, group="book")
+    assert text.startswith("﻿月,受託簿,件数,報酬,実費,消費税,源泉徴収,合計\r\n")
+    assert text.endswith("2026-04,甲野売買,2,100000,5000,10000,10210,104790\r\n")
+    assert services.report_csv([], group="nope").splitlines()[0].endswith("月,受託簿,件数,報酬,実費,消費税,源泉徴収,合計")
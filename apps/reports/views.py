@@ -0,0 +1,112 @@
+# apps/reports/views.py
+from __future__ import annotations
+from datetime import date
+from typing import Optional
+
+import click
+from flask import Blueprint, Response, flash, redirect, render_template, request, url_for
+from sqlalchemy.exc import SQLAlchemyError
+
+from apps.common.forms import CSRFOnlyForm
+from apps.reports import services
+from db import db
+
+reports_bp = Blueprint(
+    "reports",
+    __name__,
+    url_prefix="/reports",
+    template_folder="templates",
+)
+
+
+# --------------------------
+# 内部ユーティリティ
+# --------------------------
+def _month_arg(name: str) -> Optional[date]:
+    """?from=2026-04 のような YYYY-MM（不正な値は無視）。"""
+    raw = (request.args.get(name) or "").strip()
+    try:
+        year, month = raw.split("-")[:2]
+        return date(int(year), int(month), 1)
+    except ValueError:
+        return None
+
+
+def _report_args() -> dict:
+    return {
+        "basis": request.args.get("basis", services.DEFAULT_BASIS),
+        "group": request.args.get("group", services.DEFAULT_GROUP),
+        "date_from": _month_arg("from"),
+        "date_to": _month_arg("to"),
+    }
+
+
+# --------------------------
+# 集計ページ
+# --------------------------
+@reports_bp.route("/")
+def index() -> str:
+    """月別の売上（?basis=invoice|receipt|estimate&group=book|client_type|month&from=YYYY-MM&to=YYYY-MM）。"""
+    args = _report_args()
+    rows = services.monthly_report(**args)
+    return render_template(
+        "reports/index.html",
+        rows=rows,
+        totals=services.totals(rows),
+        bases=services.BASES,
+        groups=services.GROUPS,
+        args=args,
+        form=CSRFOnlyForm(),
+    )
+
+
+# --------------------------
+# CSV
+# --------------------------
+@reports_bp.route("/amount.csv")
+def export_csv() -> Response:
+    args = _report_args()
+    rows = services.monthly_report(**args)
+    filename = f"amount_report_{args['basis']}_{args['group']}.csv"
+    return Response(
+        services.report_csv(rows, args["group"]),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# --------------------------
+# リフレッシュ
+# --------------------------
+@reports_bp.route("/refresh", methods=["POST"])
+def refresh():
+    form = CSRFOnlyForm()
+    back = url_for("reports.index", **request.args)
+    if not form.validate_on_submit():
+        flash("不正なリクエストです。（CSRF）", "danger")
+        return redirect(back)
+    try:
+        services.refresh_report()
+        flash("集計を更新しました。", "success")
+    except SQLAlchemyError:
+        db.session.rollback()
+        flash("集計の更新に失敗しました。", "error")
+    return redirect(back)
+
+
+# --------------------------
+# CLI: flask reports init / refresh
+# --------------------------
+@reports_bp.cli.command("init")
+def init_report() -> None:
+    """集計用のマテリアライズドビューを作成する（migrations 0007 を使わない DB 向け）。"""
+    services.create_report_view()
+    click.echo(f"{services.VIEW_NAME}: ok")
+
+
+@reports_bp.cli.command("refresh")
+@click.option("--blocking", is_flag=True, help="CONCURRENTLY を使わない（初回・一意インデックスが無いとき）")
+def refresh_report_command(blocking: bool) -> None:
+    """集計を作り直す（cron 向け）。"""
+    services.refresh_report(concurrently=not blocking)
+    click.echo(f"{services.VIEW_NAME}: refreshed")
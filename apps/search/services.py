@@ -0,0 +1,164 @@
+# apps/search/services.py
+"""
+受託簿・クライアント・各書類の横断検索。
+
+各テーブルの生成列 search_text（pg_trgm GIN）/ search_tsv（tsvector GIN）に対して
+    search_text ILIKE '%q%'        … 部分一致（trigram インデックスで引ける）
+    search_text %> q               … あいまい一致（word_similarity。表記ゆれ・誤字）
+    search_tsv @@ plainto_tsquery  … 語単位の一致
+のいずれかに当たる行をテーブルごとにスコア上位だけ取り、UNION ALL して並べ直す。
+深いページは見ない前提で page は MAX_PAGE までに制限している。
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import Float, case, cast, func, literal, literal_column, or_, select, union_all
+
+from db import db
+from apps.client.models import Client
+from apps.entrusted_book.models import EntrustedBook
+from apps.documents.amount.models import AmountDocument
+from apps.documents.required.models import RequiredDocument
+from apps.documents.delivery.models import DeliveryDocument
+from apps.documents.origin.models import OriginDocument
+
+# pg_trgm の GIN は 3 文字（トライグラム1つ）未満の ILIKE / %> を引けず、全ソースを seq scan になる
+MIN_QUERY_LENGTH = 3
+MAX_QUERY_LENGTH = 100
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 50
+MAX_PAGE = 10
+SUGGEST_LIMIT = 8
+
+
+@dataclass(frozen=True)
+class Source:
+    """検索対象1種類（テーブル）。"""
+    type: str
+    label: str
+    model: Any
+    title: Any       # 結果に出す見出し（列または式）
+    endpoint: str    # 詳細ページ
+    id_param: str
+
+
+SOURCES: Sequence[Source] = (
+    Source("entrusted_book", "受託簿",       EntrustedBook,    EntrustedBook.name,
+           "entrusted_book.detail", "book_id"),
+    Source("client",         "クライアント", Client,           Client.name,
+           "client.edit", "client_id"),
+    Source("amount",         "見積・請求",   AmountDocument,   AmountDocument.entrusted_book_name,
+           "amount.detail", "document_id"),
+    Source("required",       "必要書類",     RequiredDocument, RequiredDocument.entrusted_book_name,
+           "required.detail", "document_id"),
+    Source("delivery",       "納品書",       DeliveryDocument, DeliveryDocument.entrusted_book_name,
+           "delivery.detail", "document_id"),
+    # 不動産の表示は JSONB 配列。見出しは1件目
+    Source("origin",         "登記原因証明", OriginDocument,   OriginDocument.real_estate_descriptions.op("->>")(0),
+           "origin.detail", "document_id"),
+)
+SOURCE_BY_TYPE: Dict[str, Source] = {s.type: s for s in SOURCES}
+
+
+@dataclass
+class Hit:
+    type: str
+    label: str
+    id: int
+    title: str
+    score: float
+    endpoint: str
+    id_param: str
+
+
+@dataclass
+class SearchResult:
+    query: str
+    hits: List[Hit]
+    page: int
+    per_page: int
+    has_next: bool
+
+
+# =========================
+# 内部ユーティリティ
+# =========================
+def normalize_query(q: Optional[str]) -> str:
+    """前後・連続の空白を詰め、長すぎる入力は切る。"""
+    return " ".join((q or "").split())[:MAX_QUERY_LENGTH]
+
+
+def _escape_like(q: str) -> str:
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _source_query(src: Source, q: str, limit: int):
+    """1テーブル分の候補（スコア上位 limit 件）。"""
+    m = src.model
+    tsq = func.plainto_tsquery(literal_column("'simple'::regconfig"), q)
+    escaped = _escape_like(q)
+    score = (
+        func.word_similarity(q, m.search_text)
+        + func.ts_rank(m.search_tsv, tsq)
+        + case((src.title.ilike(f"{escaped}%", escape="\\"), 1.0), else_=0.0)  # 見出しの前方一致を優先
+    )
+    return (
+        select(
+            literal(src.type).label("type"),
+            m.id.label("id"),
+            cast(src.title, db.Text).label("title"),
+            cast(score, Float).label("score"),
+        )
+        .where(or_(
+            m.search_text.ilike(f"%{escaped}%", escape="\\"),
+            m.search_text.op("%>")(q),
+            m.search_tsv.op("@@")(tsq),
+        ))
+        .order_by(score.desc(), m.id.desc())
+        .limit(limit)
+    )
+
+
+# =========================
+# 検索
+# =========================
+def search(q: Optional[str], *, types: Optional[Iterable[str]] = None,
+           page: int = 1, per_page: int = DEFAULT_PER_PAGE) -> SearchResult:
+    """
+    横断検索。スコア（word_similarity + ts_rank + 見出し前方一致）の高い順。
+    types で対象を絞れる（SOURCE_BY_TYPE のキー）。
+    """
+    q = normalize_query(q)
+    page = max(1, min(page, MAX_PAGE))
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    if len(q) < MIN_QUERY_LENGTH:
+        return SearchResult(query=q, hits=[], page=page, per_page=per_page, has_next=False)
+
+    sources = [SOURCE_BY_TYPE[t] for t in (types or []) if t in SOURCE_BY_TYPE] or list(SOURCES)
+    # 各テーブルから「このページまでに必要な件数 + 1」だけ取れば、全体の順位は正しく出る
+    per_source = page * per_page + 1
+    # LIMIT 付きの SELECT を UNION するので、それぞれサブクエリに包む
+    union_q = union_all(*[
+        select(_source_query(s, q, per_source).subquery()) for s in sources
+    ]).subquery()
+
+    rows = db.session.execute(
+        select(union_q)
+        .order_by(union_q.c.score.desc(), union_q.c.type, union_q.c.id.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page + 1)
+    ).all()
+
+    hits = [
+        Hit(type=r.type, label=SOURCE_BY_TYPE[r.type].label, id=r.id, title=r.title or "",
+            score=r.score, endpoint=SOURCE_BY_TYPE[r.type].endpoint,
+            id_param=SOURCE_BY_TYPE[r.type].id_param)
+        for r in rows[:per_page]
+    ]
+    return SearchResult(query=q, hits=hits, page=page, per_page=per_page, has_next=len(rows) > per_page)
+
+
+def suggest(q: Optional[str], limit: int = SUGGEST_LIMIT) -> List[Hit]:
+    """入力補完用（1ページ目の上位だけ）。"""
+    return search(q, page=1, per_page=limit).hits
@@ -0,0 +1,66 @@
+# apps/search/views.py
+from __future__ import annotations
+import click
+from flask import Blueprint, jsonify, render_template, request, url_for
+from sqlalchemy import text
+
+from apps.search import services
+from db import db
+
+search_bp = Blueprint(
+    "search",
+    __name__,
+    url_prefix="/search",
+    template_folder="templates",
+)
+
+
+# --------------------------
+# 内部ユーティリティ
+# --------------------------
+def _hit_url(hit: services.Hit) -> str:
+    return url_for(hit.endpoint, **{hit.id_param: hit.id})
+
+
+# --------------------------
+# 検索ページ
+# --------------------------
+@search_bp.route("/")
+def index() -> str:
+    """横断検索（?q=...&type=client&type=amount&page=N）。"""
+    q = request.args.get("q", "")
+    types = [t for t in request.args.getlist("type") if t in services.SOURCE_BY_TYPE]
+    page = request.args.get("page", 1, type=int)
+    result = services.search(q, types=types, page=page)
+    return render_template(
+        "search/index.html",
+        result=result,
+        sources=services.SOURCES,
+        selected_types=types,
+        hit_url=_hit_url,
+        min_length=services.MIN_QUERY_LENGTH,
+    )
+
+
+# --------------------------
+# 入力補完（JSON）
+# --------------------------
+@search_bp.route("/suggest")
+def suggest():
+    """検索ボックスの候補: [{type, label, id, title, url}, ...]"""
+    hits = services.suggest(request.args.get("q", ""))
+    return jsonify([
+        {"type": h.type, "label": h.label, "id": h.id, "title": h.title, "url": _hit_url(h)}
+        for h in hits
+    ])
+
+
+# --------------------------
+# CLI: flask search init
+# --------------------------
+@search_bp.cli.command("init")
+def init_search() -> None:
+    """pg_trgm 拡張を作成する（search_text の trigram インデックスに必要。db.create_all より前に1回）。"""
+    db.session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    db.session.commit()
+    click.echo("pg_trgm: ok")
@@ -5,6 +5,15 @@ from typing import Optional
 
 from apps.register.commerce.pdf.services.normalize import ZEN2HAN
 
+# 数字列は「直前が数字でない位置」からだけ始める（(?<!\d)）。
+# これが無いと長い数字列で開始位置ごとに再走査して2乗時間になる。
+# 桁数も15桁までに抑える（崩れたテキストの巨大な数字列で int() が失敗しないように）
+_OKU_RE        = re.compile(r"(?<!\d)(\d{1,15})\s*億")
+_MAN_RE        = re.compile(r"(?<!\d)(\d{1,15})\s*万")
+_SHARES_RE     = re.compile(r"(?<!\d)(\d{1,15})\s*株")
+_SIMPLE_MAN_RE = re.compile(r"金\s*(\d{1,15})\s*万円")
+_SIMPLE_YEN_RE = re.compile(r"金\s*(\d{1,15})\s*円")
+
 def jp_amount_to_int(s: str) -> Optional[int]:
     """
     日本語の額面・株数を整数へ正規化。
@@ -17,29 +26,29 @@ def jp_amount_to_int(s: str) -> Optional[int]:
     if "金" in s2 and ("円" in s2 or "万円" in s2 or "億円" in s2):
         total = 0
         matched = False
-        m_oku = re.search(r"(\d+)\s*億", s2)
+        m_oku = _OKU_RE.search(s2)
         if m_oku:
             total += int(m_oku.group(1)) * 100_000_000
             matched = True
-        m_man = re.search(r"(\d+)\s*万", s2)
+        m_man = _MAN_RE.search(s2)
         if m_man:
             total += int(m_man.group(1)) * 10_000
             matched = True
         # 「金800万円」「金800円」などの簡易
-        m_simple_man = re.search(r"金\s*(\d+)\s*万円", s2)
+        m_simple_man = _SIMPLE_MAN_RE.search(s2)
         if m_simple_man:
             return int(m_simple_man.group(1)) * 10_000
-        m_simple_yen = re.search(r"金\s*(\d+)\s*円", s2)
+        m_simple_yen = _SIMPLE_YEN_RE.search(s2)
         if m_simple_yen:
             return int(m_simple_yen.group(1))
         return total if matched else None
 
     # --- 株数 ---
     base = 0
-    m_man = re.search(r"(\d+)\s*万", s2)   # 「１万株」の「万」
+    m_man = _MAN_RE.search(s2)   # 「１万株」の「万」
     if m_man:
         base += int(m_man.group(1)) * 10_000
-    m_num = re.search(r"(\d+)\s*株", s2)   # 数字＋株
+    m_num = _SHARES_RE.search(s2)   # 数字＋株
     if m_num:
         return base or int(m_num.group(1))
     return None
\ No newline at end of file
@@ -0,0 +1,28 @@
+# apps/shared/kana.py
+"""
+フリガナの照合キー。
+
+スタッフ入力のフリガナは「ひらがな / カタカナ / 半角ｶﾅ」「長音の有無」「空白の有無」が混在するので、
+    NFKC（半角ｶﾅ → 全角、全角英数 → 半角）→ ひらがな → カタカナ → 長音・空白を除去
+した文字列を照合キーにする。
+    kana_key("やまだ たろう")  == kana_key("ﾔﾏﾀﾞ ﾀﾛｳ") == "ヤマダタロウ"
+    kana_key("スーパー")       == "スパ"
+"""
+from __future__ import annotations
+import re
+import unicodedata
+from typing import Optional
+
+# ぁ(U+3041)〜ゖ(U+3096)・ゝゞ → 対応するカタカナ（+0x60）
+_HIRA_TO_KATA = {cp: cp + 0x60 for cp in (*range(0x3041, 0x3097), 0x309D, 0x309E)}
+# 長音（半角ｰ は NFKC で ー になる）と空白類（全角空白を含む）
+_DROP_RE = re.compile(r"[ー\s]")
+
+
+def kana_key(value: Optional[str]) -> Optional[str]:
+    """フリガナの照合キー。空（空白だけを含む）なら None。"""
+    if not value:
+        return None
+    s = unicodedata.normalize("NFKC", value).translate(_HIRA_TO_KATA)
+    s = _DROP_RE.sub("", s)
+    return s or None
@@ -0,0 +1,8 @@
+# apps/shared/limits.py
+"""
+解析の前処理で使う上限値（依存なし。正規表現だけのモジュールからも import できる）。
+"""
+
+# 1行の最大文字数。崩れた PDF で極端に長い行が出ても、以降の正規表現の処理量を抑える
+# （登記簿の表は1行せいぜい数十文字）。新しいパーサ（normalize_text）と旧パーサで共通
+MAX_LINE_LENGTH = 1000
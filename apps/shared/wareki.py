@@ -2,12 +2,15 @@
 import re
 from datetime import date
 
+# 年・月・日の桁数を抑えて、長い数字列でも走査が線形で終わるようにする
+_WAREKI_RE = re.compile(r"(令和|平成|昭和|大正|明治)\s*(\d{1,2})\s*年\s*(\d{1,2})\s*月\s*(\d{1,2})\s*日")
+
 # === 和暦文字列 → ISO文字列 ===
 def wareki_str_to_iso(s: str) -> str | None:
     """和暦文字列 (例: 令和5年10月16日) を ISO (YYYY-MM-DD) に変換。抽出失敗時 None。"""
     ZEN2HAN = str.maketrans("０１２３４５６７８９－，/", "0123456789-,/")
     s2 = (s or "").translate(ZEN2HAN)
-    m = re.search(r"(令和|平成|昭和|大正|明治)\s*(\d+)\s*年\s*(\d+)\s*月\s*(\d+)\s*日", s2)
+    m = _WAREKI_RE.search(s2)
     if not m:
         return None
     era, y, mo, d = m.group(1), int(m.group(2)), int(m.group(3)), int(m.group(4))
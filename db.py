@@ -1,2 +1,66 @@
+# db.py
+"""
+SQLAlchemy の共有インスタンス。
+
+読み取り専用レプリカ（settings.SQLALCHEMY_BINDS["replica"]）が設定されているときは、
+GET の一覧・詳細（エンドポイント名が READ_ENDPOINTS のもの）の SELECT を自動でレプリカへ送る。
+- flush（INSERT / UPDATE / DELETE）と SELECT 以外は常にプライマリ
+- 同じブラウザで書き込んだ直後 REPLICA_STICKY_SECONDS 秒はプライマリから読む（レプリカ遅延で古い値を見せない）
+- レプリカ未設定なら従来どおりすべてプライマリ
+"""
+import time
+
+from flask import current_app, has_request_context, request, session as http_session
 from flask_sqlalchemy import SQLAlchemy
-db = SQLAlchemy()
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select
+
+REPLICA_BIND = "replica"
+# レプリカへ流すビュー関数名（Blueprint 名は問わない: client.index / amount.detail / ...）
+READ_ENDPOINTS = frozenset({"index", "detail", "documents_index"})
+_STICKY_KEY = "_db_primary_until"
+
+
+def _reads_from_replica(sess: "RoutingSession", clause) -> bool:
+    if sess._flushing or not isinstance(clause, Select):
+        return False
+    if not has_request_context() or request.method not in ("GET", "HEAD") or not request.endpoint:
+        return False
+    if request.endpoint.rsplit(".", 1)[-1] not in READ_ENDPOINTS:
+        return False
+    if http_session.get(_STICKY_KEY, 0) > time.time():
+        return False
+    return REPLICA_BIND in sess._db.engines
+
+
+class RoutingSession(Session):
+    """読み取り専用ビューの SELECT をレプリカへ振り分ける Session。"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _reads_from_replica(self, clause):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_written(sess, flush_context) -> None:
+    sess.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_to_primary(sess) -> None:
+    """書き込みを commit したら、しばらく同じブラウザの読み取りをプライマリに固定する。"""
+    if not sess.info.pop("wrote", False) or not has_request_context():
+        return
+    seconds = current_app.config.get("DB_REPLICA_STICKY_SECONDS", 0)
+    if seconds and REPLICA_BIND in sess._db.engines:
+        http_session[_STICKY_KEY] = time.time() + seconds
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _clear_written(sess) -> None:
+    sess.info.pop("wrote", None)
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
@@ -0,0 +1,88 @@
+# gunicorn.conf.py
+"""
+gunicorn の設定（gunicorn -c gunicorn.conf.py wsgi:app）。値は環境変数で上書きできる。
+
+- preload_app: マスターで create_app() してから fork する。import・正規表現のコンパイル・ini の読み込みが
+  一度で済み、ワーカー間でメモリを copy-on-write で共有する。代わりにコードの更新は HUP ではなく
+  再起動（または USR2 → 旧マスターに QUIT）で反映する
+- fork 前に DB 接続を持っていたら post_fork で捨てる（ソケットを親子で共有しない）
+- max_requests (+ jitter): 一定件数でワーカーを入れ替え、メモリの増加（PDF 解析など）を溜めない
+- timeout: 応答しないワーカーを殺すまでの秒数。graceful_timeout: 再起動時に処理中のリクエストを待つ秒数
+- DB 接続数の上限は workers × (DB_POOL_SIZE + DB_MAX_OVERFLOW)（settings.py）。max_connections に収める
+- PROMETHEUS_MULTIPROC_DIR を設定するとワーカーをまたいだ /metrics になる（apps/common/metrics.py）
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+# --- 待ち受け ---
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5100")
+backlog = _env_int("GUNICORN_BACKLOG", 2048)
+
+# --- ワーカー ---
+# 既定は CPU 数 × 2 + 1。PDF 解析は CPU を使い、一覧・詳細は DB 待ちが多いので、
+# プロセスで CPU を、スレッド（gthread）で I/O 待ちを埋める
+workers = _env_int("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+threads = _env_int("GUNICORN_THREADS", 4)
+worker_class = "gthread" if threads > 1 else "sync"
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") not in ("0", "false", "no")
+
+# --- タイムアウト・入れ替え ---
+timeout = _env_int("GUNICORN_TIMEOUT", 60)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+# --- ログ ---
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None  # 空文字で無効
+errorlog = os.environ.get("GUNICORN_ERROR_LOG", "-")
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+# =========================
+# フック
+# =========================
+def on_starting(server):
+    """マルチプロセスのメトリクスは前回起動分のファイルを消してから始める。"""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.endswith(".db"):
+                os.remove(os.path.join(path, name))
+
+
+def when_ready(server):
+    """preload 時、マスターのプールは db_pool_size などに数えない（リクエストを受けるのはワーカーだけ）。"""
+    if preload_app:
+        from apps.common.metrics import set_pool_reporting
+        set_pool_reporting(False)
+
+
+def post_fork(server, worker):
+    """preload 時にマスターで開いた DB 接続を子に持ち込まない（プールを作り直す）。"""
+    if not preload_app:
+        return
+    from wsgi import app
+    from db import db
+    from apps.common.metrics import set_pool_reporting
+    set_pool_reporting(True)  # when_ready で止めたのを子では戻す（作り直したプールから数える）
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        try:
+            from prometheus_client import multiprocess
+        except ImportError:
+            return
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,54 @@
+# migrations/env.py
+"""
+Alembic の実行環境。
+- 接続先は settings.SQLALCHEMY_DATABASE_URI（環境変数 DB_USER など）
+- target_metadata は db.metadata。create_app() で全モデル（各 Blueprint の models）を読み込ませてから使う
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+import settings
+from apps import create_app
+from db import db
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+create_app()  # モデルの import（db.metadata へのテーブル登録）のため
+target_metadata = db.metadata
+
+
+def _configure_kwargs() -> dict:
+    return {
+        "target_metadata": target_metadata,
+        "compare_type": True,
+    }
+
+
+def run_migrations_offline() -> None:
+    """SQL を出力するだけ（alembic upgrade --sql）。"""
+    context.configure(
+        url=settings.SQLALCHEMY_DATABASE_URI,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        **_configure_kwargs(),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        context.configure(connection=connection, **_configure_kwargs())
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,22 @@
+"""baseline: 初期スキーマ（受託簿・クライアント・書類4種）
+
+db.create_all() で作った既存 DB を取り込むための起点。何もしない。
+    alembic stamp 0001 && alembic upgrade head
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    pass
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,65 @@
+"""performance indexes: 外部キー・並び替え用インデックスと部分インデックス
+
+- 書類4種: (client_id, created_at, id) … client_id の外部キー兼「クライアントの書類を新しい順」
+           (created_at, id)            … 全件一覧のキーセットページング
+- client / entrusted_book: 一覧の並び替え列 + id
+- client_book_profile.entrusted_book_id: 外部キー（受託簿の削除で全件走査しない）
+- 部分インデックス: 未請求・未入金の見積請求、意思確認未了のクライアント、住所変更が必要な案件
+
+運用中のテーブルをロックしないよう CREATE INDEX CONCURRENTLY（トランザクション外）で作る。
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (名前, テーブル, 列, 部分インデックスの条件)
+INDEXES = [
+    ("ix_amount_document_client_created_id",   "amount_document",   ["client_id", "created_at", "id"], None),
+    ("ix_amount_document_created_id",          "amount_document",   ["created_at", "id"], None),
+    ("ix_required_document_client_created_id", "required_document", ["client_id", "created_at", "id"], None),
+    ("ix_required_document_created_id",        "required_document", ["created_at", "id"], None),
+    ("ix_delivery_document_client_created_id", "delivery_document", ["client_id", "created_at", "id"], None),
+    ("ix_delivery_document_created_id",        "delivery_document", ["created_at", "id"], None),
+    ("ix_origin_document_client_created_id",   "origin_document",   ["client_id", "created_at", "id"], None),
+    ("ix_origin_document_created_id",          "origin_document",   ["created_at", "id"], None),
+    ("ix_client_updated_id",                   "client",            ["updated_at", "id"], None),
+    ("ix_client_created_id",                   "client",            ["created_at", "id"], None),
+    ("ix_client_name_id",                      "client",            ["name", "id"], None),
+    ("ix_entrusted_book_name_id",              "entrusted_book",    ["name", "id"], None),
+    ("ix_entrusted_book_updated_id",           "entrusted_book",    ["updated_at", "id"], None),
+    ("ix_client_book_profile_entrusted_book_id", "client_book_profile", ["entrusted_book_id"], None),
+    # 部分インデックス
+    ("ix_amount_document_uninvoiced",          "amount_document",   ["client_id", "created_at"],
+     "invoice_date IS NULL"),
+    ("ix_amount_document_unreceived",          "amount_document",   ["invoice_date"],
+     "invoice_date IS NOT NULL AND receipt_date IS NULL"),
+    ("ix_client_intention_unconfirmed",        "client",            ["entrusted_book_id"],
+     "intention_confirmed_at IS NULL"),
+    ("ix_client_book_profile_address_change",  "client_book_profile", ["entrusted_book_id"],
+     "needs_address_change"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _where in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,65 @@
+"""registry tables: 解析済み登記簿（parsed_registry）と役員任期（officer_term）
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    insp = sa.inspect(op.get_bind())
+
+    if not insp.has_table("parsed_registry"):
+        op.create_table(
+            "parsed_registry",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("corporate_number", sa.String(12)),
+            sa.Column("company_name", sa.String(255)),
+            sa.Column("as_of", sa.DateTime),
+            sa.Column("source_hash", sa.String(64), nullable=False, unique=True),
+            sa.Column("source_name", sa.String(255)),
+            sa.Column("parser_version", sa.String(20), nullable=False),
+            sa.Column("raw_text", sa.Text, nullable=False),
+            sa.Column("payload", postgresql.JSONB, nullable=False, server_default=sa.text("'{}'::jsonb")),
+            sa.Column("created_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+        )
+    op.create_index("ix_parsed_registry_number_as_of", "parsed_registry",
+                    ["corporate_number", "as_of"], if_not_exists=True)
+    op.create_index("ix_parsed_registry_as_of", "parsed_registry", ["as_of"], if_not_exists=True)
+    op.create_index("ix_parsed_registry_parser_version", "parsed_registry",
+                    ["parser_version"], if_not_exists=True)
+
+    if not insp.has_table("officer_term"):
+        op.create_table(
+            "officer_term",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("parsed_registry_id", sa.Integer,
+                      sa.ForeignKey("parsed_registry.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("corporate_number", sa.String(12), nullable=False),
+            sa.Column("company_name", sa.String(255)),
+            sa.Column("officer_name", sa.String(255), nullable=False),
+            sa.Column("role", sa.String(50), nullable=False),
+            sa.Column("appointed_on", sa.Date, nullable=False),
+            sa.Column("term_years", sa.Integer, nullable=False),
+            sa.Column("expires_on", sa.Date, nullable=False),
+            sa.Column("created_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+        )
+    op.create_index("ix_officer_term_parsed_registry_id", "officer_term",
+                    ["parsed_registry_id"], if_not_exists=True)
+    op.create_index("ix_officer_term_expires_on", "officer_term", ["expires_on"], if_not_exists=True)
+    op.create_index("ix_officer_term_corporate_number", "officer_term",
+                    ["corporate_number"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_table("officer_term", if_exists=True)
+    op.drop_table("parsed_registry", if_exists=True)
@@ -0,0 +1,107 @@
+"""search and document index: 横断検索の生成列・フリガナ照合キー・書類の統合インデックス
+
+- pg_trgm 拡張
+- 受託簿・クライアント・書類4種に search_text / search_tsv（生成列）と GIN インデックス
+  （生成列の追加はテーブルの書き換えになるので、件数が多い場合は保守時間に流す）
+- client.name_kana_key と text_pattern_ops インデックス
+  → 値は Python 側の正規化なので、upgrade 後に flask client rebuild-kana-keys を実行する
+- document_index テーブル（既存の書類から INSERT ... SELECT で初期投入）
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# テーブル → 検索対象の列（apps/common/fulltext.py の text_expr と同じ連結。この時点の定義で固定）
+SEARCH_COLUMNS = {
+    "entrusted_book":    ("name", "note"),
+    "client":            ("name", "name_kana", "address"),
+    "amount_document":   ("entrusted_book_name",),
+    "required_document": ("entrusted_book_name",),
+    "delivery_document": ("entrusted_book_name",),
+    "origin_document":   ("real_estate_descriptions::text", "right_holders", "obligation_holders"),
+}
+
+DOCUMENT_SOURCES = [
+    ("amount",   "amount_document",   "entrusted_book_name"),
+    ("required", "required_document", "entrusted_book_name"),
+    ("delivery", "delivery_document", "entrusted_book_name"),
+    ("origin",   "origin_document",   "real_estate_descriptions ->> 0"),
+]
+
+
+def _text_expr(columns) -> str:
+    return " || ' ' || ".join(f"coalesce({c}, '')" for c in columns)
+
+
+def _column_names(insp, table: str) -> set:
+    return {c["name"] for c in insp.get_columns(table)}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    insp = sa.inspect(op.get_bind())
+
+    # --- 横断検索（生成列 + GIN） ---
+    for table, columns in SEARCH_COLUMNS.items():
+        existing = _column_names(insp, table)
+        expr = _text_expr(columns)
+        if "search_text" not in existing:
+            op.add_column(table, sa.Column("search_text", sa.Text, sa.Computed(expr, persisted=True)))
+        if "search_tsv" not in existing:
+            op.add_column(table, sa.Column(
+                "search_tsv", postgresql.TSVECTOR,
+                sa.Computed(f"to_tsvector('simple'::regconfig, {expr})", persisted=True),
+            ))
+        op.create_index(f"ix_{table}_search_trgm", table, ["search_text"], if_not_exists=True,
+                        postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"})
+        op.create_index(f"ix_{table}_search_tsv", table, ["search_tsv"], if_not_exists=True,
+                        postgresql_using="gin")
+
+    # --- フリガナ照合キー ---
+    if "name_kana_key" not in _column_names(insp, "client"):
+        op.add_column("client", sa.Column("name_kana_key", sa.String(255)))
+    op.create_index("ix_client_name_kana_key", "client", ["name_kana_key"], if_not_exists=True,
+                    postgresql_ops={"name_kana_key": "text_pattern_ops"})
+
+    # --- 書類の統合インデックス ---
+    if not insp.has_table("document_index"):
+        op.create_table(
+            "document_index",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("document_type", sa.String(20), nullable=False),
+            sa.Column("document_id", sa.Integer, nullable=False),
+            sa.Column("client_id", sa.Integer, sa.ForeignKey("client.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("title", sa.String(255), nullable=False),
+            sa.Column("created_at", sa.DateTime, nullable=False),
+            sa.UniqueConstraint("document_type", "document_id", name="uq_document_index_document"),
+        )
+        for doc_type, table, title in DOCUMENT_SOURCES:
+            op.execute(
+                "INSERT INTO document_index (document_type, document_id, client_id, title, created_at) "
+                f"SELECT '{doc_type}', id, client_id, left(coalesce({title}, ''), 255), created_at "
+                f"FROM {table} ON CONFLICT DO NOTHING"
+            )
+    op.create_index("ix_document_index_client_created", "document_index",
+                    ["client_id", sa.text("created_at DESC"), sa.text("id DESC")], if_not_exists=True)
+    op.create_index("ix_document_index_type_created", "document_index",
+                    ["document_type", "created_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_table("document_index", if_exists=True)
+    op.drop_index("ix_client_name_kana_key", table_name="client", if_exists=True)
+    op.drop_column("client", "name_kana_key")
+    for table in SEARCH_COLUMNS:
+        op.drop_index(f"ix_{table}_search_tsv", table_name=table, if_exists=True)
+        op.drop_index(f"ix_{table}_search_trgm", table_name=table, if_exists=True)
+        op.drop_column(table, "search_tsv")
+        op.drop_column(table, "search_text")
@@ -0,0 +1,33 @@
+"""amount totals: AmountDocument の集計列（報酬・実費・消費税・源泉徴収・合計）
+
+- reward_total / expense_total / tax_total / withholding_total / grand_total（既定 0）
+- grand_total での並び替え用インデックス
+  → 値は税率（config/tax.ini）を使った Python 側の計算なので、upgrade 後に flask amount recalc-totals を実行する
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+TOTAL_COLUMNS = ("reward_total", "expense_total", "tax_total", "withholding_total", "grand_total")
+
+
+def upgrade() -> None:
+    existing = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("amount_document")}
+    for name in TOTAL_COLUMNS:
+        if name not in existing:
+            op.add_column("amount_document", sa.Column(name, sa.Integer, nullable=False, server_default=sa.text("0")))
+    op.create_index("ix_amount_document_grand_total_id", "amount_document", ["grand_total", "id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_amount_document_grand_total_id", table_name="amount_document", if_exists=True)
+    for name in TOTAL_COLUMNS:
+        op.drop_column("amount_document", name)
@@ -0,0 +1,89 @@
+"""amount document items: 金額書類の明細を子テーブル amount_document_item に移す
+
+- amount_document_item（空行は持たない。position はフォーム上の行番号）と項目名のインデックス
+- 既存の3つの JSONB 配列（item_types / reward_amounts / expense_amounts）から INSERT ... SELECT で移し、
+  配列の列は削除する（downgrade で明細から作り直す）
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+ARRAY_COLUMNS = ("item_types", "reward_amounts", "expense_amounts")
+
+
+def upgrade() -> None:
+    insp = sa.inspect(op.get_bind())
+    if not insp.has_table("amount_document_item"):
+        op.create_table(
+            "amount_document_item",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("amount_document_id", sa.Integer,
+                      sa.ForeignKey("amount_document.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("position", sa.Integer, nullable=False),
+            sa.Column("item_type", sa.String(255), nullable=False, server_default=sa.text("''")),
+            sa.Column("reward_amount", sa.Integer, nullable=False, server_default=sa.text("0")),
+            sa.Column("expense_amount", sa.Integer, nullable=False, server_default=sa.text("0")),
+            sa.UniqueConstraint("amount_document_id", "position", name="uq_amount_document_item_position"),
+        )
+    op.create_index("ix_amount_document_item_item_type", "amount_document_item",
+                    ["item_type", "amount_document_id"], if_not_exists=True)
+
+    existing = {c["name"] for c in insp.get_columns("amount_document")}
+    if set(ARRAY_COLUMNS) <= existing:
+        # ROWS FROM は長さの違う配列を NULL で揃えて並べる。ordinality - 1 = 行番号
+        op.execute("""
+            INSERT INTO amount_document_item
+                (amount_document_id, position, item_type, reward_amount, expense_amount)
+            SELECT d.id, t.ord - 1,
+                   left(coalesce(t.item_type, ''), 255),
+                   coalesce(nullif(t.reward, '')::numeric, 0)::integer,
+                   coalesce(nullif(t.expense, '')::numeric, 0)::integer
+            FROM amount_document d
+            CROSS JOIN LATERAL ROWS FROM (
+                jsonb_array_elements_text(d.item_types),
+                jsonb_array_elements_text(d.reward_amounts),
+                jsonb_array_elements_text(d.expense_amounts)
+            ) WITH ORDINALITY AS t(item_type, reward, expense, ord)
+            WHERE coalesce(t.item_type, '') <> ''
+               OR coalesce(nullif(t.reward, '')::numeric, 0) <> 0
+               OR coalesce(nullif(t.expense, '')::numeric, 0) <> 0
+            ON CONFLICT DO NOTHING
+        """)
+        for name in ARRAY_COLUMNS:
+            op.drop_column("amount_document", name)
+
+
+def downgrade() -> None:
+    for name in ARRAY_COLUMNS:
+        op.add_column("amount_document", sa.Column(
+            name, postgresql.JSONB, nullable=False, server_default=sa.text("'[]'::jsonb")))
+    # 行番号 0..最大 の配列に戻す（明細の無い行は ""/0）
+    op.execute("""
+        UPDATE amount_document d SET
+            item_types      = a.item_types,
+            reward_amounts  = a.reward_amounts,
+            expense_amounts = a.expense_amounts
+        FROM (
+            SELECT m.amount_document_id,
+                   jsonb_agg(coalesce(i.item_type, '') ORDER BY p.pos) AS item_types,
+                   jsonb_agg(coalesce(i.reward_amount, 0) ORDER BY p.pos) AS reward_amounts,
+                   jsonb_agg(coalesce(i.expense_amount, 0) ORDER BY p.pos) AS expense_amounts
+            FROM (SELECT amount_document_id, max(position) AS max_pos
+                  FROM amount_document_item GROUP BY amount_document_id) m
+            CROSS JOIN LATERAL generate_series(0, m.max_pos) AS p(pos)
+            LEFT JOIN amount_document_item i
+                   ON i.amount_document_id = m.amount_document_id AND i.position = p.pos
+            GROUP BY m.amount_document_id
+        ) a
+        WHERE a.amount_document_id = d.id
+    """)
+    op.drop_table("amount_document_item", if_exists=True)
@@ -0,0 +1,56 @@
+"""amount report view: 月別売上のマテリアライズドビュー amount_report_monthly
+
+(基準日の種類, 月, 受託簿, クライアント種別) ごとの件数と金額（AmountDocument の集計列の合計）。
+REFRESH MATERIALIZED VIEW CONCURRENTLY 用の一意インデックス付き。リフレッシュは flask reports refresh。
+SQL はこのリビジョン時点の写し（apps/reports/sql.py を後で変えても、このリビジョンで作るものは変わらない）。
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+CREATE_VIEW_SQL = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS amount_report_monthly AS
+SELECT b.basis,
+       date_trunc('month', b.day)::date AS month,
+       c.entrusted_book_id,
+       c.client_type_id,
+       count(*)                         AS documents,
+       sum(d.reward_total)::bigint      AS reward,
+       sum(d.expense_total)::bigint     AS expense,
+       sum(d.tax_total)::bigint         AS tax,
+       sum(d.withholding_total)::bigint AS withholding,
+       sum(d.grand_total)::bigint       AS grand_total
+FROM amount_document d
+JOIN client c ON c.id = d.client_id
+CROSS JOIN LATERAL (VALUES
+    ('estimate', d.estimate_date),
+    ('invoice',  d.invoice_date),
+    ('receipt',  d.receipt_date)
+) AS b(basis, day)
+WHERE b.day IS NOT NULL
+GROUP BY 1, 2, 3, 4
+WITH DATA
+"""
+
+CREATE_INDEX_SQL = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_amount_report_monthly "
+    "ON amount_report_monthly (basis, month, entrusted_book_id, client_type_id)"
+)
+
+DROP_VIEW_SQL = "DROP MATERIALIZED VIEW IF EXISTS amount_report_monthly"
+
+
+def upgrade() -> None:
+    op.execute(CREATE_VIEW_SQL)
+    op.execute(CREATE_INDEX_SQL)
+
+
+def downgrade() -> None:
+    op.execute(DROP_VIEW_SQL)
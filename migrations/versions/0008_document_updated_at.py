@@ -0,0 +1,33 @@
+"""document updated_at: 書類4種（amount / required / delivery / origin）の更新日時
+
+- updated_at（既存行は created_at で埋める。以後は ORM の onupdate で更新）
+  → 詳細画面の HTML キャッシュ（apps/common/fragment_cache.py）の版に使う
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+TABLES = ("amount_document", "required_document", "delivery_document", "origin_document")
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table in TABLES:
+        if "updated_at" in {c["name"] for c in inspector.get_columns(table)}:
+            continue
+        op.add_column(table, sa.Column("updated_at", sa.DateTime, nullable=True))
+        op.execute(f"UPDATE {table} SET updated_at = created_at")
+        op.alter_column(table, "updated_at", nullable=False, server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, "updated_at")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+起動時の import 時間の内訳（python -X importtime の集計）。
+
+    python scripts/import_profile.py              # create_app() までの import
+    python scripts/import_profile.py --warmup     # WARMUP=1（ウォームアップ込み）
+    python scripts/import_profile.py --top 40 --target "from apps import create_app"
+
+累積時間（そのモジュールが引き込んだ import を含む）と自身の時間、それぞれ上位を表示する。
+"""
+from __future__ import annotations
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+ROOT: Path = Path(__file__).resolve().parents[1]   # scripts/ の1つ上 = プロジェクト直下
+DEFAULT_TARGET = "from apps import create_app; create_app()"
+
+# import time:       123 |       4567 |   some.module
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile(target: str, warmup: bool = False) -> List[Tuple[int, int, int, str]]:
+    """(self_us, cumulative_us, depth, module) のリスト。"""
+    env = {**os.environ, "WARMUP": "1" if warmup else "0"}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", target],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-2000:])
+        raise SystemExit(proc.returncode)
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            rows.append((int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2, m.group(4)))
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="起動時の import 時間の内訳")
+    ap.add_argument("--target", default=DEFAULT_TARGET, help="計測する Python コード")
+    ap.add_argument("--top", type=int, default=25, help="表示する件数")
+    ap.add_argument("--warmup", action="store_true", help="WARMUP=1 で計測する")
+    args = ap.parse_args(argv)
+
+    rows = profile(args.target, warmup=args.warmup)
+    total = sum(r[0] for r in rows)
+    print(f"modules: {len(rows)}  total: {total / 1000:.1f} ms\n")
+
+    print("cumulative")
+    for self_us, cum_us, depth, name in sorted(rows, key=lambda r: -r[1])[:args.top]:
+        print(f"  {cum_us / 1000:9.1f} ms  {name}")
+
+    print("\nself")
+    for self_us, cum_us, depth, name in sorted(rows, key=lambda r: -r[0])[:args.top]:
+        print(f"  {self_us / 1000:9.1f} ms  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
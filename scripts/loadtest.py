@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+簡易負荷試験（標準ライブラリのみ）。
+
+1) 起動済みのサーバーに対して:
+    python scripts/loadtest.py --url http://localhost:5100/entrusted-book/ --concurrency 16 --duration 20
+
+2) ワーカー数を変えながら gunicorn を起動して、スループットの伸びを比べる:
+    python scripts/loadtest.py --url http://127.0.0.1:5199/entrusted-book/ \
+        --workers 1,2,4,8 --threads 4 --concurrency 32 --duration 20
+
+   各ワーカー数で「gunicorn -c gunicorn.conf.py wsgi:app」を GUNICORN_BIND / WEB_CONCURRENCY /
+   GUNICORN_THREADS を付けて起動し、応答が返るようになってから計測、終わったら止める。
+
+出力は 1 行 1 条件で、req/s・エラー数・レイテンシ（p50 / p95 / p99、ミリ秒）。
+"""
+from __future__ import annotations
+import argparse
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+ROOT: Path = Path(__file__).resolve().parents[1]   # scripts/ の1つ上 = プロジェクト直下
+
+
+@dataclass
+class Result:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + self.errors
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies:
+            return 0.0
+        data = sorted(self.latencies)
+        return data[min(len(data) - 1, int(len(data) * p / 100))] * 1000
+
+    def line(self, label: str) -> str:
+        rps = len(self.latencies) / self.elapsed if self.elapsed else 0.0
+        return (f"{label:<14} {rps:9.1f} req/s  ok={len(self.latencies):<7} err={self.errors:<5} "
+                f"p50={self.percentile(50):7.1f}ms  p95={self.percentile(95):7.1f}ms  "
+                f"p99={self.percentile(99):7.1f}ms")
+
+
+# =========================
+# 負荷をかける
+# =========================
+def _worker(url: str, deadline: float, result: Result, lock: threading.Lock) -> None:
+    """1本の keep-alive 接続で deadline まで GET を繰り返す。"""
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    conn = conn_cls(parts.netloc, timeout=30)
+    latencies: List[float] = []
+    errors = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status >= 400:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = conn_cls(parts.netloc, timeout=30)
+    conn.close()
+    with lock:
+        result.latencies.extend(latencies)
+        result.errors += errors
+
+
+def run_load(url: str, concurrency: int, duration: float, warmup: float = 2.0) -> Result:
+    if warmup > 0:
+        run_load(url, concurrency, warmup, warmup=0)  # 接続・キャッシュを温める（結果は捨てる）
+    result = Result()
+    lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + duration
+    threads = [threading.Thread(target=_worker, args=(url, deadline, result, lock), daemon=True)
+               for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+# =========================
+# gunicorn の起動・停止
+# =========================
+def _wait_ready(url: str, timeout: float = 30.0) -> bool:
+    parts = urlsplit(url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parts.netloc, timeout=2)
+            conn.request("GET", parts.path or "/")
+            conn.getresponse().read()
+            conn.close()
+            return True
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.3)
+    return False
+
+
+def spawn_gunicorn(url: str, workers: int, threads: int) -> subprocess.Popen:
+    parts = urlsplit(url)
+    env = {
+        **os.environ,
+        "GUNICORN_BIND": parts.netloc,
+        "WEB_CONCURRENCY": str(workers),
+        "GUNICORN_THREADS": str(threads),
+        "GUNICORN_ACCESS_LOG": "",  # アクセスログの出力自体が計測を歪めるので切る
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def stop(proc: subprocess.Popen) -> None:
+    proc.send_signal(signal.SIGTERM)
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+# =========================
+# main
+# =========================
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="簡易負荷試験（ワーカー数ごとのスループット比較）")
+    ap.add_argument("--url", required=True, help="GET する URL")
+    ap.add_argument("--concurrency", type=int, default=16, help="同時接続数")
+    ap.add_argument("--duration", type=float, default=20.0, help="1条件あたりの計測秒数")
+    ap.add_argument("--warmup", type=float, default=2.0, help="計測前のウォームアップ秒数")
+    ap.add_argument("--workers", default="", help="例: 1,2,4,8（指定すると gunicorn を起動して比較）")
+    ap.add_argument("--threads", type=int, default=4, help="gunicorn のワーカーあたりスレッド数")
+    args = ap.parse_args(argv)
+
+    if not args.workers:
+        print(run_load(args.url, args.concurrency, args.duration, args.warmup).line("server"))
+        return 0
+
+    for n in (int(x) for x in args.workers.split(",") if x.strip()):
+        proc = spawn_gunicorn(args.url, n, args.threads)
+        try:
+            if not _wait_ready(args.url):
+                print(f"workers={n}: server did not start", file=sys.stderr)
+                return 1
+            result = run_load(args.url, args.concurrency, args.duration, args.warmup)
+            print(result.line(f"workers={n}x{args.threads}"), flush=True)
+        finally:
+            stop(proc)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,5 +10,100 @@ DB_INFO = {
 
 SQLALCHEMY_DATABASE_URI = f"postgresql+psycopg://{DB_INFO['user']}:{DB_INFO['password']}@{DB_INFO['host']}/{DB_INFO['name']}"
 
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# --- 接続プール ---
+# 1プロセスあたり最大 DB_POOL_SIZE + DB_MAX_OVERFLOW 本。
+# ワーカー数 × (POOL_SIZE + MAX_OVERFLOW) が Postgres の max_connections を超えないように決める。
+DB_POOL_SIZE = _env_int('DB_POOL_SIZE', 5)
+DB_MAX_OVERFLOW = _env_int('DB_MAX_OVERFLOW', 5)
+DB_POOL_TIMEOUT = _env_int('DB_POOL_TIMEOUT', 10)           # プールが空いたときの待ち時間（秒）
+DB_POOL_RECYCLE = _env_int('DB_POOL_RECYCLE', 1800)         # これより古い接続は張り直す（秒）
+DB_POOL_PRE_PING = _env_bool('DB_POOL_PRE_PING', True)      # 切れた接続をチェックアウト時に検出
+DB_STATEMENT_TIMEOUT_MS = _env_int('DB_STATEMENT_TIMEOUT_MS', 30000)  # 0 で無制限
+# psycopg のサーバーサイド prepared statement（同じ SQL を N 回実行したら prepare）。
+# PgBouncer（transaction モード）経由のときは -1 で無効化する
+DB_PREPARE_THRESHOLD = _env_int('DB_PREPARE_THRESHOLD', 5)
+
+
+def _connect_args(read_only=False):
+    options = []
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        options.append(f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}")
+    if read_only:
+        options.append("-c default_transaction_read_only=on")
+    args = {
+        "application_name": os.environ.get('DB_APPLICATION_NAME', 'touki-net'),
+        "prepare_threshold": None if DB_PREPARE_THRESHOLD < 0 else DB_PREPARE_THRESHOLD,
+    }
+    if options:
+        args["options"] = " ".join(options)
+    return args
+
+
+def _engine_options(read_only=False):
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "connect_args": _connect_args(read_only=read_only),
+    }
+
+
+SQLALCHEMY_ENGINE_OPTIONS = _engine_options()
+
+# --- 読み取り専用レプリカ（任意） ---
+# DB_REPLICA_HOST を設定すると bind "replica" を作り、GET の一覧・詳細（db.READ_ENDPOINTS）を自動でそちらへ流す。
+# ユーザー・パスワード・DB 名は省略時プライマリと同じ。
+DB_REPLICA_HOST = os.environ.get('DB_REPLICA_HOST', '')
+# 書き込みの直後はレプリカの遅延で古い値が見えるので、この秒数だけ同じブラウザの読み取りもプライマリへ
+DB_REPLICA_STICKY_SECONDS = _env_int('DB_REPLICA_STICKY_SECONDS', 5)
+
+SQLALCHEMY_BINDS = {}
+if DB_REPLICA_HOST:
+    _replica_user = os.environ.get('DB_REPLICA_USER', DB_INFO['user'])
+    _replica_pass = os.environ.get('DB_REPLICA_PASS', DB_INFO['password'])
+    _replica_name = os.environ.get('DB_REPLICA_NAME', DB_INFO['name'])
+    SQLALCHEMY_BINDS["replica"] = {
+        "url": f"postgresql+psycopg://{_replica_user}:{_replica_pass}@{DB_REPLICA_HOST}/{_replica_name}",
+        **_engine_options(read_only=True),
+    }
+
+# 起動時のウォームアップ（解析器の正規表現・config.ini・PDF ライブラリを最初のリクエスト前に読む）
+# gunicorn の preload_app と併用するとマスターで1回だけ行い、ワーカーは copy-on-write で共有する
+WARMUP = _env_bool('WARMUP', False)
+
+# config.ini / config/*.ini の更新確認の間隔（秒）。0 なら毎回 mtime を見る（apps/common/config_service.py）
+CONFIG_RELOAD_INTERVAL = _env_int('CONFIG_RELOAD_INTERVAL', 2)
+
+# 書類の PDF 化（apps/documents/pdf.py）
+# PDF_RENDER_WORKERS: 変換用のプロセス数（gunicorn のワーカーごと）。0 ならプロセスを分けずにその場で変換
+PDF_RENDER_WORKERS = _env_int('PDF_RENDER_WORKERS', 2)
+PDF_RENDER_TIMEOUT = _env_int('PDF_RENDER_TIMEOUT', 60)     # 1件あたりの待ち時間（秒）
+PDF_CACHE_DIR = os.environ.get(
+    'PDF_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'pdf'))
+
+# 書類の詳細画面の HTML キャッシュ（apps/common/fragment_cache.py）
+# FRAGMENT_CACHE_BACKEND: memory（プロセス内 LRU）/ filesystem / redis / none
+FRAGMENT_CACHE_BACKEND = os.environ.get('FRAGMENT_CACHE_BACKEND', 'memory')
+FRAGMENT_CACHE_MAX_ENTRIES = _env_int('FRAGMENT_CACHE_MAX_ENTRIES', 512)   # memory の件数上限
+FRAGMENT_CACHE_DIR = os.environ.get(
+    'FRAGMENT_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'fragments'))
+FRAGMENT_CACHE_REDIS_URL = os.environ.get('FRAGMENT_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+FRAGMENT_CACHE_TTL = _env_int('FRAGMENT_CACHE_TTL', 86400)   # redis の有効期限（秒）。0 なら無期限
+
 SECRET_KEY = os.environ.get('SECRET_KEY', 'dev_secret_key')
 SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
@@ -0,0 +1,11 @@
+# wsgi.py
+"""
+本番用の WSGI エントリポイント（開発用の app.py とは別）。
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+設定（ワーカー数・スレッド数・タイムアウト・ワーカーの入れ替え）は gunicorn.conf.py と環境変数で。
+"""
+from apps import create_app
+
+app = create_app()